@@ -0,0 +1,233 @@
+"""
+학습 가이드 일괄 생성 스크립트
+
+CSV 또는 JSONL 파일에서 학습 주제와 시작 날짜를 읽어 여러 가이드를 동시에 생성합니다.
+가이드가 완성될 때마다 결과 파일(기본 Word)과 manifest(JSONL) 한 줄을 기록하며,
+개별 실패가 있어도 나머지 주제는 계속 처리합니다.
+
+사용법:
+    python batch.py topics.csv --workers 4 --output-dir batch_output
+    python batch.py topics.csv --workers 8 --export-workers 4   # Word 렌더링을 별도 프로세스에서
+    python batch.py topics.csv --format html                     # docx 대신 HTML/Markdown/JSONL
+
+입력 형식:
+    CSV   - 헤더에 topic (필수), start_date (선택) 컬럼
+    JSONL - 한 줄에 {"topic": "...", "start_date": "YYYY-MM-DD"}
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from main import create_learning_guide, load_env
+from utils.exporters import EXPORT_FORMATS, build_guide_filename, save_learning_guide
+from utils.word_export import submit_export
+
+
+def load_topics(path: str) -> List[Dict[str, Any]]:
+    """
+    CSV/JSONL 입력 파일에서 (topic, start_date) 목록 읽기
+
+    Args:
+        path: 입력 파일 경로 (.csv 또는 .jsonl)
+
+    Returns:
+        topic, start_date 를 담은 딕셔너리 목록
+
+    Raises:
+        ValueError: JSON 이 아니거나 객체가 아닌 줄, 문자열이 아닌 topic/start_date (파일 경로와 줄 번호 포함)
+    """
+    rows: List[Dict[str, Any]] = []
+    with open(path, encoding="utf-8-sig") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            records = [(reader.line_num, record) for record in reader]
+        else:
+            records = []
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append((line_num, json.loads(line)))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_num}: JSON 형식이 아닙니다 ({e.msg})") from None
+
+    for line_num, record in records:
+        if not isinstance(record, dict):
+            raise ValueError(f"{path}:{line_num}: 한 줄에 JSON 객체 하나가 있어야 합니다 (받은 값: {type(record).__name__})")
+        for field in ("topic", "start_date"):
+            value = record.get(field)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{path}:{line_num}: {field} 는 문자열이어야 합니다 (받은 값: {value!r})")
+
+        topic = (record.get("topic") or "").strip()
+        if not topic:
+            continue
+        start_date = (record.get("start_date") or "").strip() or None
+        rows.append({"topic": topic, "start_date": start_date})
+    return rows
+
+
+def generate_guide(index: int, row: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """주제 하나에 대해 가이드만 생성 (Word 저장 제외)"""
+    started = time.time()
+    record: Dict[str, Any] = {"index": index, "topic": row["topic"], "start_date": row["start_date"]}
+    guide = None
+    try:
+        guide = create_learning_guide(row["topic"], row["start_date"])
+        if guide.get("token_usage"):
+            record["token_usage"] = guide["token_usage"]
+        if "error" in guide:
+            record.update(status="error", error=guide.get("error"))
+            guide = None
+        else:
+            record.update(
+                status="ok",
+                category=guide.get("category"),
+                start_date=guide.get("start_date"),
+                end_date=guide.get("end_date"),
+            )
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["elapsed_sec"] = round(time.time() - started, 2)
+    return record, guide
+
+
+def _file_key(fmt: str) -> str:
+    # 기존 manifest 와의 호환을 위해 Word 파일은 word_file 키 유지
+    return "word_file" if fmt == "docx" else "output_file"
+
+
+def generate_one(index: int, row: Dict[str, Any], output_dir: Path, fmt: str = "docx") -> Dict[str, Any]:
+    """주제 하나에 대해 가이드를 생성하고 파일로 저장"""
+    started = time.time()
+    record, guide = generate_guide(index, row)
+    if guide is not None:
+        try:
+            filename = output_dir / f"{index:04d}_{build_guide_filename(guide, fmt)}"
+            record[_file_key(fmt)] = save_learning_guide(guide, str(filename), fmt=fmt)
+        except Exception as e:
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+        record["elapsed_sec"] = round(time.time() - started, 2)
+    return record
+
+
+def _write_record(manifest, results: List[Dict[str, Any]], record: Dict[str, Any], total: int) -> None:
+    manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+    manifest.flush()
+    results.append(record)
+    mark = "✅" if record["status"] == "ok" else "❌"
+    print(f"{mark} [{len(results)}/{total}] {record['topic']} ({record['elapsed_sec']}초)")
+
+
+def run_batch(
+    rows: List[Dict[str, Any]],
+    output_dir: Path,
+    manifest_path: Path,
+    workers: int = 4,
+    export_workers: int = 0,
+    fmt: str = "docx",
+) -> List[Dict[str, Any]]:
+    """
+    여러 주제를 동시에 처리하고 완료되는 순서대로 manifest에 기록
+
+    Args:
+        rows: load_topics() 결과
+        output_dir: 결과 파일 저장 폴더
+        manifest_path: 결과 manifest(JSONL) 경로
+        workers: 동시에 생성할 가이드 수
+        export_workers: 파일 렌더링 프로세스 수 (0이면 생성 스레드에서 바로 저장)
+        fmt: 출력 형식 ("docx", "markdown", "html", "jsonl")
+
+    Returns:
+        manifest 에 기록된 결과 목록
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    results: List[Dict[str, Any]] = []
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest, ThreadPoolExecutor(max_workers=workers) as pool:
+        if export_workers <= 0:
+            futures = [pool.submit(generate_one, i, row, output_dir, fmt) for i, row in enumerate(rows)]
+            for future in as_completed(futures):
+                _write_record(manifest, results, future.result(), len(rows))
+            return results
+
+        # 생성이 끝난 가이드부터 프로세스 풀로 넘겨 렌더링
+        # 생성과 렌더링 중 먼저 끝나는 쪽을 기다려, 렌더링이 끝난 가이드는 다음 생성을 기다리지 않고 바로 기록
+        generating = {pool.submit(generate_guide, i, row) for i, row in enumerate(rows)}
+        exporting: Dict[Any, Dict[str, Any]] = {}
+
+        with ProcessPoolExecutor(max_workers=export_workers) as export_pool:
+            while generating or exporting:
+                done, _ = wait(generating | exporting.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in exporting:
+                        record = exporting.pop(future)
+                        try:
+                            record[_file_key(fmt)] = future.result()
+                        except Exception as e:
+                            record.update(status="error", error=f"{type(e).__name__}: {e}")
+                        _write_record(manifest, results, record, len(rows))
+                        continue
+
+                    generating.discard(future)
+                    record, guide = future.result()
+                    if guide is None:
+                        _write_record(manifest, results, record, len(rows))
+                        continue
+                    filename = output_dir / f"{record['index']:04d}_{build_guide_filename(guide, fmt)}"
+                    try:
+                        exporting[submit_export(export_pool, filename, guide, fmt=fmt)] = record
+                    except Exception as e:
+                        record.update(status="error", error=f"{type(e).__name__}: {e}")
+                        _write_record(manifest, results, record, len(rows))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 가이드 일괄 생성")
+    parser.add_argument("input", help="주제 목록 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--workers", type=int, default=4, help="동시 생성 개수 (기본 4)")
+    parser.add_argument("--format", default="docx", choices=list(EXPORT_FORMATS), help="출력 형식 (기본 docx)")
+    parser.add_argument("--export-workers", type=int, default=0, help="Word 렌더링 프로세스 수 (기본 0: 생성 스레드에서 저장)")
+    parser.add_argument("--output-dir", default="batch_output", help="결과 파일 저장 폴더")
+    parser.add_argument("--manifest", default=None, help="결과 manifest 경로 (기본: <output-dir>/results.jsonl)")
+    args = parser.parse_args()
+
+    if not load_env():
+        print("\n❌ 환경 변수 설정 후 다시 실행해주세요.")
+        return
+
+    try:
+        rows = load_topics(args.input)
+    except ValueError as e:
+        print(f"❌ 입력 파일 오류: {e}")
+        return
+    if not rows:
+        print("❌ 입력 파일에 학습 주제가 없습니다.")
+        return
+
+    output_dir = Path(args.output_dir)
+    manifest_path = Path(args.manifest) if args.manifest else output_dir / "results.jsonl"
+
+    print(f"📚 {len(rows)}개 주제를 {args.workers}개씩 동시에 생성합니다.")
+    results = run_batch(rows, output_dir, manifest_path, workers=max(1, args.workers), export_workers=args.export_workers, fmt=args.format)
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    print(f"\n완료: 성공 {succeeded}건, 실패 {len(results) - succeeded}건")
+    print(f"📄 결과 manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
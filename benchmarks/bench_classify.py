@@ -0,0 +1,98 @@
+"""
+키워드 분류 마이크로 벤치마크
+
+기존 이중 루프(keyword in topic) 방식과 KeywordIndex 의 호출당 비용을 비교합니다.
+측정 전에 영문 약어 키워드("AI", "PM")가 영단어 안에서 잘못 매칭되지 않는지 확인합니다.
+
+사용법:
+    python benchmarks/bench_classify.py [주제 수 (기본 10000)]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tool.categories import CATEGORIES
+from tool.keyword_index import KeywordIndex
+
+
+def legacy_classify(topic: str):
+    """기존 classify_category 의 키워드 분류 부분"""
+    topic_lower = topic.lower()
+    category_scores = {}
+    for category, info in CATEGORIES.items():
+        score = sum(1 for keyword in info["keywords"] if keyword in topic_lower)
+        if score > 0:
+            category_scores[category] = score
+    if category_scores:
+        return max(category_scores.items(), key=lambda x: x[1])[0]
+    return None
+
+
+# 영문 약어 키워드가 단어 일부로 매칭되면 안 되는 주제 → 키워드 분류 결과 None 이어야 함
+FALSE_POSITIVE_TOPICS = ["painting", "Thai cooking", "Spain travel", "email writing", "bpm 맞추기"]
+
+# 약어 키워드가 단어로 쓰인 주제 → (주제, 기대 카테고리)
+ACRONYM_TOPICS = [
+    ("AI 입문", "Career / Tech Skills"),
+    ("생성형 AI로 업무 자동화", "Career / Tech Skills"),
+    ("PM 커리어 준비", "Career / Tech Skills"),
+]
+
+
+def check_acronyms(index: KeywordIndex) -> bool:
+    ok = True
+    for topic in FALSE_POSITIVE_TOPICS:
+        category = index.classify(topic)
+        if category is not None:
+            print(f"❌ 잘못된 키워드 매칭: {topic!r} → {category} ({index.explain(topic)['matches']})")
+            ok = False
+    for topic, expected in ACRONYM_TOPICS:
+        category = index.classify(topic)
+        if category != expected:
+            print(f"❌ 약어 키워드 미매칭: {topic!r} → {category} (기대: {expected})")
+            ok = False
+    return ok
+
+
+def make_topics(n: int):
+    rng = random.Random(42)
+    keywords = [k for info in CATEGORIES.values() for k in info["keywords"]]
+    fillers = ["입문", "기초부터 실전까지", "python", "C언어", "기타 연주", "한 달 완성", "초보자를 위한", "심화 과정"]
+    topics = []
+    for _ in range(n):
+        parts = rng.sample(fillers, 2)
+        if rng.random() < 0.7:
+            parts.insert(rng.randrange(3), rng.choice(keywords))
+        topics.append(" ".join(parts))
+    return topics
+
+
+def bench(name: str, fn, topics):
+    started = time.perf_counter()
+    for topic in topics:
+        fn(topic)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<14} 총 {elapsed * 1000:8.2f} ms  |  호출당 {elapsed / len(topics) * 1e6:6.2f} µs")
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    topics = make_topics(n)
+
+    started = time.perf_counter()
+    index = KeywordIndex(CATEGORIES)
+    print(f"인덱스 컴파일: {(time.perf_counter() - started) * 1000:.2f} ms (1회)")
+    if not check_acronyms(index):
+        sys.exit(1)
+    print("약어 키워드 매칭 확인 ✅")
+    print(f"주제 {n}개 분류\n")
+
+    legacy = bench("legacy loop", legacy_classify, topics)
+    indexed = bench("KeywordIndex", index.classify, topics)
+    print(f"\n속도 비율: {legacy / indexed:.2f}x")
@@ -0,0 +1,116 @@
+"""
+생성 모드 지연 시간 벤치마크 (agent / retrieval / skeleton / structured)
+
+같은 주제를 Agent 모드, 검색 후 생성(retrieve-then-generate) 모드, 뼈대 후 병렬 확장(skeleton) 모드, 스키마 고정 구조화 출력(structured) 모드로 생성하고
+주제별 지연 시간, LLM 호출 수, 토큰 수, JSON 파싱 성공 여부를 비교합니다.
+실제 OpenAI / Tavily API 를 호출하므로 .env 에 API 키가 필요합니다.
+
+검색 캐시가 남아 있으면 나중에 실행한 모드가 유리하므로 주제마다 실행 순서를 번갈아 바꿉니다.
+--cold 를 주면 실행마다 검색 캐시를 비웁니다. (저장된 검색 캐시가 모두 삭제됨)
+
+사용법:
+    python benchmarks/bench_generation_modes.py [--topics 파이썬 축구 수채화] [--repeat 1] [--cold]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from main import load_env
+from tool.cached_search import search_cache
+from tool.category_agents import acreate_category_guide
+from tool.category_router import aclassify_category
+from tool.retrieval_guide import acreate_retrieval_guide
+from tool.skeleton_guide import acreate_skeleton_guide
+from tool.structured_guide import acreate_structured_guide
+from utils.json_parser import parse_learning_guide
+
+DEFAULT_TOPICS = ["파이썬 데이터 분석", "미적분", "축구 드리블", "수채화", "홈베이킹"]
+
+RUNNERS = {
+    "agent": acreate_category_guide,
+    "retrieval": acreate_retrieval_guide,
+    "skeleton": acreate_skeleton_guide,
+    "structured": acreate_structured_guide,
+}
+
+
+async def run_once(mode: str, category: str, topic: str) -> dict:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = await RUNNERS[mode](category, topic, "2026-01-05")
+    elapsed = time.perf_counter() - started
+
+    ok = "error" not in result and "error" not in parse_learning_guide(result.get("raw_output", ""))
+    usage = result.get("token_usage") or {}
+    return {
+        "mode": mode,
+        "topic": topic,
+        "elapsed": elapsed,
+        "ok": ok,
+        "llm_calls": usage.get("llm_calls", 0),
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+    }
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def run(topics, repeat: int, cold: bool):
+    records = []
+    for r in range(repeat):
+        for i, topic in enumerate(topics):
+            category = await aclassify_category(topic)
+            # 주제마다 실행 순서를 돌려 순서 효과를 줄임
+            modes = list(RUNNERS)
+            shift = (i + r) % len(modes)
+            order = modes[shift:] + modes[:shift]
+            for mode in order:
+                if cold:
+                    search_cache.clear()
+                record = await run_once(mode, category, topic)
+                records.append(record)
+                print(
+                    f"{mode:<10} {topic:<16} {record['elapsed']:6.1f}s  LLM {record['llm_calls']}회  "
+                    f"토큰 {record['prompt_tokens']:>6,}/{record['completion_tokens']:>5,}  {'✅' if record['ok'] else '❌'}"
+                )
+
+    print(f"\n{'모드':<10} {'평균':>7} {'p50':>7} {'p95':>7} {'최대':>7} {'LLM 호출':>8} {'입력 토큰':>9} {'성공':>5}")
+    for mode in RUNNERS:
+        rows = [rec for rec in records if rec["mode"] == mode]
+        times = [rec["elapsed"] for rec in rows]
+        print(
+            f"{mode:<10} {statistics.mean(times):6.1f}s {percentile(times, 0.5):6.1f}s "
+            f"{percentile(times, 0.95):6.1f}s {max(times):6.1f}s "
+            f"{statistics.mean(rec['llm_calls'] for rec in rows):8.1f} "
+            f"{statistics.mean(rec['prompt_tokens'] for rec in rows):9,.0f} "
+            f"{sum(rec['ok'] for rec in rows):>3}/{len(rows)}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성 모드별 지연 시간 비교")
+    parser.add_argument("--topics", nargs="+", default=DEFAULT_TOPICS, help="비교할 학습 주제")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수")
+    parser.add_argument("--cold", action="store_true", help="실행마다 검색 캐시 비우기")
+    args = parser.parse_args()
+
+    if not load_env():
+        print("\n❌ 환경 변수 설정 후 다시 실행해주세요.")
+        return
+    asyncio.run(run(args.topics, max(1, args.repeat), args.cold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+JSON 추출/복구 벤치마크 및 퍼징
+
+benchmarks/data/malformed_outputs.jsonl 의 잘못된 Agent 출력 코퍼스와
+무작위로 자르고 훼손한 출력에 대해 기존 추출기와 현재 extract_json_from_text 의
+성공률·처리 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_json_parser.py [퍼징 횟수 (기본 2000)]
+"""
+
+import contextlib
+import io
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.json_parser import extract_json_from_text
+
+CORPUS_PATH = Path(__file__).parent / "data" / "malformed_outputs.jsonl"
+
+
+def legacy_extract(text: str):
+    """이전 extract_json_from_text (탐욕적 정규식 + split 방식)"""
+    try:
+        if "```json" in text:
+            json_str = text.split("```json")[1].split("```")[0].strip()
+        elif "```" in text:
+            code_blocks = re.findall(r'```(?:json)?\s*\n(.*?)\n```', text, re.DOTALL)
+            json_str = code_blocks[0].strip() if code_blocks else text.split("```")[1].split("```")[0].strip()
+        else:
+            match = re.search(r'\{.*\}', text, re.DOTALL)
+            if not match:
+                return None
+            json_str = match.group(0)
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError:
+            cleaned = re.sub(r'//.*?$', '', json_str, flags=re.MULTILINE)
+            cleaned = re.sub(r'\n\s*\n', '\n', cleaned).strip()
+            return json.loads(cleaned)
+    except (json.JSONDecodeError, IndexError):
+        return None
+
+
+def is_success(parsed, expect_steps: int) -> bool:
+    if not isinstance(parsed, dict) or "topic" not in parsed:
+        return False
+    steps = parsed.get("steps", [])
+    complete = [s for s in steps if isinstance(s, dict) and s.get("title")]
+    return len(complete) >= expect_steps
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def fuzz_cases(base: str, n: int):
+    """유효한 출력을 무작위 위치에서 자르거나 쉼표를 지우거나 목록 기호를 끼워 넣음"""
+    rng = random.Random(7)
+    cases = []
+    for _ in range(n):
+        text = base
+        op = rng.choice(["truncate", "drop_comma", "bullet", "trailing_comma"])
+        if op == "truncate":
+            text = text[: rng.randrange(len(text) // 3, len(text))]
+        elif op == "drop_comma":
+            positions = [i for i, ch in enumerate(text) if ch == ","]
+            i = rng.choice(positions)
+            text = text[:i] + text[i + 1:]
+        elif op == "bullet":
+            positions = [m.start() for m in re.finditer(r'\n\s+"', text)]
+            i = rng.choice(positions) + 1
+            text = text[:i] + "• " + text[i:]
+        else:
+            positions = [m.start() for m in re.finditer(r'\n\s*[\]}]', text)]
+            i = rng.choice(positions)
+            text = text[:i] + "," + text[i:]
+        cases.append(text)
+    return cases
+
+
+def run(name: str, fn, texts, expects):
+    ok = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text, expect in zip(texts, expects):
+            if is_success(fn(text), expect):
+                ok += 1
+    elapsed = time.perf_counter() - started
+    print(f"  {name:<10} 성공 {ok:>5}/{len(texts):<5}  총 {elapsed * 1000:8.2f} ms  |  건당 {elapsed / len(texts) * 1e6:7.1f} µs")
+    return ok
+
+
+if __name__ == "__main__":
+    n_fuzz = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = load_corpus()
+
+    print("코퍼스 항목별 결과 (legacy / current)")
+    with contextlib.redirect_stdout(io.StringIO()) as buf:
+        rows = [
+            (c["kind"], is_success(legacy_extract(c["text"]), c["expect_steps"]),
+             is_success(extract_json_from_text(c["text"]), c["expect_steps"]))
+            for c in corpus
+        ]
+    for kind, old, new in rows:
+        print(f"  {kind:<36} {'✅' if old else '❌'} / {'✅' if new else '❌'}")
+
+    print(f"\n코퍼스 {len(corpus)}건")
+    texts = [c["text"] for c in corpus]
+    expects = [c["expect_steps"] for c in corpus]
+    run("legacy", legacy_extract, texts, expects)
+    run("current", extract_json_from_text, texts, expects)
+
+    base = next(c["text"] for c in corpus if c["kind"] == "valid")
+    fuzz = fuzz_cases(base, n_fuzz)
+    # 잘린 출력은 최소 1개 이상의 완성된 단계가 복구되면 성공으로 간주
+    fuzz_expects = [1 if len(t) < len(base) - 2 else 3 for t in fuzz]
+    print(f"\n퍼징 {n_fuzz}건")
+    run("legacy", legacy_extract, fuzz, fuzz_expects)
+    run("current", extract_json_from_text, fuzz, fuzz_expects)
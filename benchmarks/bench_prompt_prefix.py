@@ -0,0 +1,59 @@
+"""
+프롬프트 캐시 접두부 측정
+
+OpenAI 프롬프트 캐시는 1024 토큰 이상 동일한 접두부에만 적용됩니다.
+생성 모드별로 카테고리 시스템 메시지의 공통 접두부와 카테고리별 전체 시스템 메시지의
+토큰 수를 tiktoken(cl100k_base, gpt-4-turbo)으로 세어 기준과 비교합니다.
+
+- 공통 접두부 ≥ 1024: 카테고리가 달라도 캐시 적중
+- 전체 시스템 메시지 ≥ 1024: 같은 카테고리의 반복 요청끼리만 캐시 적중
+
+사용법:
+    python benchmarks/bench_prompt_prefix.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tool.category_agents import AGENT_TOOL_INSTRUCTIONS, CATEGORY_GUIDELINES, SHARED_INSTRUCTIONS, build_system_message
+from tool.result_compaction import _get_encoding, count_tokens
+from tool.retrieval_guide import RETRIEVAL_SOURCE_INSTRUCTIONS
+from tool.skeleton_guide import EXPANSION_INSTRUCTIONS, SKELETON_INSTRUCTIONS
+from tool.structured_guide import STRUCTURED_INSTRUCTIONS
+
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# 모드 → build_system_message 인자
+MODES = {
+    "agent": {"source_instructions": AGENT_TOOL_INSTRUCTIONS},
+    "retrieval": {"source_instructions": RETRIEVAL_SOURCE_INSTRUCTIONS},
+    "skeleton (뼈대)": {"instructions": SKELETON_INSTRUCTIONS},
+    "skeleton (확장)": {"instructions": EXPANSION_INSTRUCTIONS},
+    "structured": {"instructions": STRUCTURED_INSTRUCTIONS},
+}
+
+
+def mark(tokens: int) -> str:
+    return "✅" if tokens >= PROMPT_CACHE_MIN_TOKENS else "❌"
+
+
+if __name__ == "__main__":
+    if _get_encoding() is None:
+        print("❌ tiktoken 을 불러오지 못했습니다. (근사치로는 기준 비교가 의미 없음)")
+        sys.exit(1)
+
+    print(f"SHARED_INSTRUCTIONS: {count_tokens(SHARED_INSTRUCTIONS)} 토큰 (기준 {PROMPT_CACHE_MIN_TOKENS})\n")
+    for mode, kwargs in MODES.items():
+        messages = {
+            category: build_system_message(category, guidelines, **kwargs)
+            for category, guidelines in CATEGORY_GUIDELINES.items()
+        }
+        shared = count_tokens(os.path.commonprefix(list(messages.values())))
+        print(f"[{mode}] 카테고리 공통 접두부 {shared:5d} 토큰 {mark(shared)}")
+        for category, message in messages.items():
+            tokens = count_tokens(message)
+            print(f"    {category:<26} 전체 {tokens:5d} 토큰 {mark(tokens)}")
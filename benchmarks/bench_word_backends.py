@@ -0,0 +1,93 @@
+"""
+Word 렌더링 백엔드 벤치마크
+
+python-docx 백엔드와 OOXML 직접 작성 백엔드로 같은 학습 가이드 N개를 저장하고
+총 시간, 건당 시간, 최대 메모리(tracemalloc, 앞쪽 일부 가이드), 평균 파일 크기를 비교합니다.
+
+사용법:
+    python benchmarks/bench_word_backends.py [가이드 수 (기본 1000)] [단계 수 (기본 8)]
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.guide_model import CostItem, Guide, PriceSource
+from utils.word_generator import save_learning_guide_to_word
+
+# 최대 메모리 측정에 사용할 가이드 수
+MEMORY_SAMPLE = 20
+
+
+def make_guide(index: int, n_steps: int) -> Guide:
+    """실제 출력과 비슷한 크기의 합성 가이드"""
+    guide = Guide.from_raw({
+        "topic": f"파이썬 데이터 분석 {index}",
+        "category": "Career / Tech Skills",
+        "total_duration_days": n_steps * 7,
+        "start_date": "2026-01-05",
+        "end_date": "2026-03-01",
+        "reviews_summary": "입문자도 따라가기 쉽다는 후기가 많고, 실습 위주 구성이 도움이 되었다는 평가입니다. " * 3,
+        "steps": [
+            {
+                "step_number": s,
+                "title": f"{s}단계: pandas 와 시각화 실습",
+                "duration_days": 7,
+                "learning_content": [f"핵심 개념 {k}: DataFrame 인덱싱과 groupby 집계 연습" for k in range(5)],
+                "recommended_sites": [
+                    {"name": "pandas 공식 문서", "url": "https://pandas.pydata.org/docs/"},
+                    {"name": "점프 투 파이썬", "url": "https://wikidocs.net/book/1"},
+                    {"name": f"참고 블로그 {s}", "url": f"https://example.com/post/{index}/{s}"},
+                ],
+                "todos": [f"연습 문제 {k}번 풀기" for k in range(4)],
+            }
+            for s in range(1, n_steps + 1)
+        ],
+    })
+    guide.estimated_cost.add(CostItem("파이썬 데이터 분석 입문", 28000, type="books",
+                                      sources=[PriceSource("교보문고", "https://product.kyobobook.co.kr/", "")]))
+    guide.estimated_cost.add(CostItem("데이터 분석 온라인 강의", 99000, type="courses",
+                                      sources=[PriceSource("인프런", "https://www.inflearn.com/", "")]))
+    return guide
+
+
+def save_all(backend: str, guides, out_dir: Path) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, guide in enumerate(guides):
+            save_learning_guide_to_word(guide, str(out_dir / f"{backend}_{i:04d}.docx"), backend=backend)
+
+
+def run(backend: str, guides, out_dir: Path) -> None:
+    started = time.perf_counter()
+    save_all(backend, guides, out_dir)
+    elapsed = time.perf_counter() - started
+    sizes = [p.stat().st_size for p in out_dir.glob(f"{backend}_*.docx")]
+
+    # tracemalloc 은 실행 속도를 크게 떨어뜨리므로 메모리는 일부 가이드로 따로 측정
+    tracemalloc.start()
+    save_all(backend, guides[:MEMORY_SAMPLE], out_dir)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"  {backend:<12} 총 {elapsed:7.2f} s  |  건당 {elapsed / len(guides) * 1000:7.2f} ms"
+        f"  |  최대 메모리 {peak / 1024 / 1024:6.1f} MB  |  평균 크기 {sum(sizes) / len(sizes) / 1024:5.1f} KB"
+    )
+
+
+if __name__ == "__main__":
+    n_guides = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    guides = [make_guide(i, n_steps) for i in range(n_guides)]
+
+    print(f"가이드 {n_guides}개 (단계 {n_steps}개) 저장")
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("python-docx", "ooxml"):
+            run(backend, guides, Path(tmp))
@@ -0,0 +1,119 @@
+"""
+오프라인 분류기 평가
+
+학습 데이터(CATEGORIES + tool/data/seed_topics.jsonl)와 겹치지 않는
+benchmarks/data/eval_topics.jsonl 로 LocalClassifier 의 신뢰도 임계값별
+커버리지(LLM 없이 분류한 비율)와 정확도(그중 맞은 비율)를 측정합니다.
+
+키워드 인덱스가 먼저 분류한 주제는 분류기에 도달하지 않으므로 키워드 분류 결과도 함께 보고하고,
+임계값 표는 키워드로 분류되지 않아 분류기까지 온 주제만으로 계산합니다.
+LOCAL_CLASSIFIER_THRESHOLD 는 그 값 이상의 모든 임계값에서 목표 정확도를 만족하는 가장 낮은 임계값으로 정합니다.
+(평가 주제가 적어 임계값이 높을수록 분류 수가 줄고 정확도가 들쭉날쭉하므로 한 지점만 보지 않음)
+
+사용법:
+    python benchmarks/eval_classifier.py [목표 정확도 (기본 0.9)]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tool.categories import CATEGORIES
+from tool.keyword_index import KeywordIndex
+from tool.local_classifier import LocalClassifier, build_training_examples
+
+EVAL_TOPICS_PATH = Path(__file__).parent / "data" / "eval_topics.jsonl"
+
+THRESHOLDS = [round(0.05 * i, 2) for i in range(0, 19)]
+
+
+def load_eval_topics(path: Path = EVAL_TOPICS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [(record["topic"], record["category"]) for record in (json.loads(line) for line in f if line.strip())]
+
+
+def check_held_out(examples, eval_topics) -> bool:
+    """평가 주제가 학습 데이터에 들어 있지 않은지 확인"""
+    trained = {text.strip().lower() for text, _ in examples}
+    leaked = [topic for topic, _ in eval_topics if topic.strip().lower() in trained]
+    for topic in leaked:
+        print(f"❌ 평가 주제가 학습 데이터에 있습니다: {topic!r}")
+    return not leaked
+
+
+def sweep(predictions, thresholds=THRESHOLDS):
+    """
+    임계값별 (임계값, 커버리지, 정확도, 분류 수) 목록
+
+    Args:
+        predictions: (주제, 예측 카테고리, 신뢰도, 정답 카테고리) 목록
+    """
+    rows = []
+    for threshold in thresholds:
+        covered = [
+            (pred, label) for _, pred, confidence, label in predictions
+            if pred is not None and confidence >= threshold
+        ]
+        correct = sum(1 for pred, label in covered if pred == label)
+        coverage = len(covered) / len(predictions) if predictions else 0.0
+        accuracy = correct / len(covered) if covered else 1.0
+        rows.append((threshold, coverage, accuracy, len(covered)))
+    return rows
+
+
+def pick_threshold(rows, target_accuracy: float):
+    """그 이상의 모든 임계값에서 목표 정확도를 만족하는 가장 낮은 임계값 (없으면 None)"""
+    chosen = None
+    for threshold, coverage, accuracy, covered in reversed(rows):
+        if covered and accuracy < target_accuracy:
+            break
+        if covered:
+            chosen = threshold
+    return chosen
+
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 0.9
+
+    examples = build_training_examples(CATEGORIES)
+    eval_topics = load_eval_topics()
+    if not check_held_out(examples, eval_topics):
+        sys.exit(1)
+
+    index = KeywordIndex(CATEGORIES)
+    classifier = LocalClassifier(examples)
+
+    keyword_hits = 0
+    keyword_correct = 0
+    predictions = []
+    for topic, label in eval_topics:
+        category = index.classify(topic)
+        if category is not None:
+            keyword_hits += 1
+            keyword_correct += category == label
+            continue
+        predictions.append((topic, *classifier.predict(topic), label))
+
+    print(f"평가 주제 {len(eval_topics)}개 (학습 데이터와 겹치지 않음)")
+    if keyword_hits:
+        print(f"키워드 분류: {keyword_hits}개, 정확도 {keyword_correct / keyword_hits:.1%}")
+    print(f"분류기까지 온 주제: {len(predictions)}개\n")
+
+    rows = sweep(predictions)
+    print(f"{'임계값':>6}  {'커버리지':>8}  {'정확도':>7}  {'분류 수':>6}")
+    for threshold, coverage, accuracy, covered in rows:
+        print(f"{threshold:>6.2f}  {coverage:>8.1%}  {accuracy:>7.1%}  {covered:>6}")
+
+    chosen = pick_threshold(rows, target)
+    if chosen is None:
+        print(f"\n⚠️ 정확도 {target:.0%} 이상인 임계값이 없습니다.")
+    else:
+        print(f"\n권장 LOCAL_CLASSIFIER_THRESHOLD (정확도 {target:.0%} 이상): {chosen:.2f}")
+
+    print("\n오분류 (신뢰도 순):")
+    for topic, pred, confidence, label in sorted(predictions, key=lambda p: -p[2]):
+        if pred != label:
+            print(f"  {confidence:.2f}  {topic!r} → {pred} (정답: {label})")
@@ -5,21 +5,36 @@
 해당 카테고리의 Agent를 실행하여 학습 가이드를 생성합니다.
 """
 
+import argparse
+import asyncio
+import copy
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
+from typing import Optional
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from tool.category_router import route_to_category_agent
-from utils.json_parser import parse_learning_guide
-from utils.word_generator import save_learning_guide_to_word
+from tool.category_agents import PROMPT_VERSION
+from tool.category_router import aclassify_category, aroute_to_category_agent
+from tool.generation_modes import CATEGORY_GENERATION_MODES, get_generation_mode
+from utils.json_parser import parse_guide
+from utils.exporters import EXPORT_FORMATS, save_learning_guide
 from utils.date_validator import validate_and_fix_dates
-from utils.price_fetcher import enrich_estimated_cost
+from utils.price_fetcher import afetch_topic_prices, apply_prices
+from utils.async_runner import run_sync
+from utils.guide_cache import get_cached_guide, store_guide
+from utils.guide_model import Guide
+from utils.cache import normalize_cache_text
+from utils.single_flight import AsyncSingleFlight
+
+
+# 동일한 가이드 생성 요청 병합
+guide_flight = AsyncSingleFlight("learning_guide")
 
 
 def load_env():
@@ -46,13 +61,14 @@ def load_env():
     return True
 
 
-def create_learning_guide(topic: str, start_date: str = None) -> dict:
+async def acreate_learning_guide(topic: str, start_date: str = None, on_step=None) -> dict:
     """
-    학습 가이드 생성 메인 함수
+    학습 가이드 생성 메인 함수 (비동기)
     
     Args:
         topic: 학습 주제
         start_date: 시작 날짜 (YYYY-MM-DD 형식, None이면 오늘)
+        on_step: 단계가 완성될 때마다 호출할 콜백 (주면 스트리밍 모드로 실행)
     
     Returns:
         파싱된 학습 가이드 딕셔너리
@@ -64,23 +80,105 @@ def create_learning_guide(topic: str, start_date: str = None) -> dict:
     print(f"📚 '{topic}' 학습 가이드 생성 중...")
     print(f"{'='*60}\n")
     
-    # 카테고리 분류 및 Agent 실행
-    result = route_to_category_agent(topic, start_date)
+    # 같은 주제로 생성한 가이드가 있으면 카테고리 분류 없이 날짜만 다시 계산하고 가격은 새로 반영
+    # SQLite 조회는 이벤트 루프를 막지 않도록 스레드에서 실행
+    cached_guide = await asyncio.to_thread(_find_cached_guide, topic, start_date)
+    if cached_guide is not None:
+        print("⚡ 캐시된 학습 가이드를 사용합니다.")
+        items, price_infos = await afetch_topic_prices(topic, cached_guide.category)
+        return apply_prices(cached_guide, items, price_infos).to_dict()
+
+    # 카테고리 분류
+    category = await aclassify_category(topic)
+    print(f"📌 분류된 카테고리: {category}")
+
+    # 같은 주제·카테고리·시작 날짜로 진행 중인 생성이 있으면 그 결과를 함께 사용
+    # (스트리밍 콜백은 처음 요청한 호출에만 전달됩니다)
+    key = (normalize_cache_text(topic), category, start_date, PROMPT_VERSION)
+    guide = await guide_flight.do(key, lambda: _agenerate_learning_guide(topic, start_date, category, on_step))
+    # 병합된 호출끼리 결과를 공유하므로 호출자마다 복사본 반환
+    return copy.deepcopy(guide)
+
+
+def _find_cached_guide(topic: str, start_date: str) -> Optional[Guide]:
+    """
+    카테고리 분류 전에 주제만으로 캐시된 가이드 조회
+
+    캐시 키에 생성 모드가 들어 있으므로 설정된 생성 모드마다 한 번씩 조회합니다 (기본 설정에서는 1회).
+    저장 이후 그 카테고리의 생성 모드 설정이 바뀌었으면 사용하지 않습니다.
+    """
+    for mode in dict.fromkeys(CATEGORY_GENERATION_MODES.values()):
+        guide = get_cached_guide(topic, mode, start_date, PROMPT_VERSION)
+        if guide is not None and get_generation_mode(guide.category) == mode:
+            return guide
+    return None
+
+
+async def _agenerate_learning_guide(topic: str, start_date: str, category: str, on_step=None) -> dict:
+    """카테고리 Agent 실행 → 파싱 → 날짜 검증 → 가격 반영 → 캐시 저장"""
+    # 가격 조회는 주제와 카테고리만 필요하므로 Agent 실행과 동시에 미리 시작
+    price_task = asyncio.ensure_future(afetch_topic_prices(topic, category))
+
+    try:
+        # Agent 실행
+        result = await aroute_to_category_agent(topic, start_date, category=category, on_step=on_step)
+    except BaseException:
+        price_task.cancel()
+        raise
     
     # JSON 파싱
     if "raw_output" in result:
-        parsed_guide = parse_learning_guide(result["raw_output"])
-        if "error" not in parsed_guide:
-            parsed_guide["category"] = result.get("category", "Unknown")
-            # 날짜 검증 및 수정
-            parsed_guide = validate_and_fix_dates(parsed_guide)
-            # Tavily 기반 실제 비용 정보 주입
-            parsed_guide = enrich_estimated_cost(parsed_guide)
-        return parsed_guide
+        guide = await asyncio.to_thread(parse_guide, result["raw_output"])
+        if guide is None:
+            price_task.cancel()
+            return {
+                "error": "JSON 파싱 실패",
+                "raw_output": result["raw_output"],
+                "token_usage": result.get("token_usage"),
+            }
+
+        # 이후 단계는 검증된 Guide 모델로 처리
+        guide.category = result.get("category", "Unknown")
+        # 날짜 검증 및 수정
+        validate_and_fix_dates(guide)
+        # 미리 조회해 둔 Tavily 기반 실제 비용 정보 주입
+        items, price_infos = await price_task
+        apply_prices(guide, items, price_infos)
+
+        guide_dict = guide.to_dict()
+        if result.get("partial"):
+            # 일부 단계가 빠진 가이드는 캐시하지 않고 그대로 표시
+            guide_dict["partial"] = True
+        else:
+            await asyncio.to_thread(store_guide, topic, get_generation_mode(category), guide, PROMPT_VERSION)
+        # 토큰 사용량은 이번 생성에만 해당하므로 캐시에는 저장하지 않음
+        guide_dict["token_usage"] = result.get("token_usage")
+        return guide_dict
     
+    price_task.cancel()
     return result
 
 
+def create_learning_guide(topic: str, start_date: str = None, on_step=None) -> dict:
+    """
+    학습 가이드 생성 메인 함수 (acreate_learning_guide 의 동기 래퍼)
+    
+    Args:
+        topic: 학습 주제
+        start_date: 시작 날짜 (YYYY-MM-DD 형식, None이면 오늘)
+        on_step: 단계가 완성될 때마다 호출할 콜백 (주면 스트리밍 모드로 실행)
+    
+    Returns:
+        파싱된 학습 가이드 딕셔너리
+    """
+    return run_sync(acreate_learning_guide(topic, start_date, on_step=on_step))
+
+
+def print_streamed_step(step: dict):
+    """스트리밍 중 완성된 단계 요약 출력 (날짜는 최종 검증 후 확정)"""
+    print(f"  ✏️  {step.get('step_number', '?')}. {step.get('title', 'N/A')} ({step.get('duration_days', '?')}일)")
+
+
 def print_learning_guide_summary(guide: dict):
     """학습 가이드 요약 출력"""
     if "error" in guide:
@@ -107,6 +205,10 @@ def print_learning_guide_summary(guide: dict):
         cost = guide['estimated_cost']
         if isinstance(cost, dict):
             print(f"💰 총 예상 금액: {cost.get('total', 0):,}원")
+
+    usage = guide.get("token_usage")
+    if usage:
+        print(f"🔢 토큰: 입력 {usage['prompt_tokens']:,} (캐시 {usage['cached_tokens']:,}) / 출력 {usage['completion_tokens']:,}")
     
     steps = guide.get("steps", [])
     print(f"📌 총 {len(steps)}단계로 구성됩니다.\n")
@@ -119,6 +221,10 @@ def print_learning_guide_summary(guide: dict):
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="학습 가이드 Agent")
+    parser.add_argument("--format", default="docx", choices=list(EXPORT_FORMATS), help="저장 형식 (기본 docx)")
+    args = parser.parse_args()
+
     # 환경 변수 로드
     if not load_env():
         print("\n❌ 환경 변수 설정 후 다시 실행해주세요.")
@@ -141,21 +247,21 @@ def main():
     start_date_input = input("시작 날짜를 입력하세요 (YYYY-MM-DD, 엔터 시 오늘): ").strip()
     start_date = start_date_input if start_date_input else None
     
-    # 학습 가이드 생성
-    guide = create_learning_guide(topic, start_date)
+    # 학습 가이드 생성 (단계가 완성되는 대로 바로 출력)
+    guide = create_learning_guide(topic, start_date, on_step=print_streamed_step)
     
     # 요약 출력
     print_learning_guide_summary(guide)
     
-    # Word 파일 저장
+    # 파일 저장 (기본 Word)
     if "error" not in guide:
         print("\n" + "="*60)
-        word_file = save_learning_guide_to_word(guide)
-        if word_file:
-            print(f"\n📄 전체 내용은 워드 파일에서 확인하세요: {word_file}")
+        output_file = save_learning_guide(guide, fmt=args.format)
+        if output_file:
+            print(f"\n📄 전체 내용은 파일에서 확인하세요: {output_file}")
             print("="*60)
     else:
-        print("\n❌ Word 파일을 생성할 수 없습니다.")
+        print("\n❌ 파일을 생성할 수 없습니다.")
 
 
 if __name__ == "__main__":
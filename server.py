@@ -0,0 +1,329 @@
+"""
+학습 가이드 HTTP 서비스
+
+한 프로세스에서 Agent, HTTP 클라이언트, 캐시를 계속 재사용하면서
+HTTP 요청으로 학습 가이드를 생성합니다. (표준 라이브러리 http.server 기반)
+
+사용법:
+    python server.py --port 8000 --workers 4
+
+API:
+    POST /guides                      {"topic": "...", "start_date": "YYYY-MM-DD"} → 202 {"job_id", "status"}
+                                      동시 작업이 가득 차면 429 (Retry-After 헤더)
+    GET  /guides/<job_id>             작업 상태 (queued / running / done / error), 완료 시 가이드 포함
+    GET  /guides/<job_id>/download    ?format=docx|markdown|html|jsonl (기본 docx)
+    GET  /health                      작업 수, 요청 병합·캐시·검색 결과 압축·외부 API 서킷 상태 통계
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from main import acreate_learning_guide, guide_flight, load_env
+from tool.cached_search import get_search_cache_stats
+from tool.category_agents import warm_up_agents
+from tool.result_compaction import get_compaction_stats
+from tool.structured_guide import get_structured_output_stats
+from utils.async_runner import get_background_loop
+from utils.exporters import EXPORT_FORMATS, EXPORT_MEDIA_TYPES, build_guide_filename, write_learning_guide
+from utils.price_fetcher import get_price_cache_stats
+from utils.resilience import get_upstream_stats
+
+
+# 서비스 설정
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", 8000))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", 4))
+SERVICE_MAX_PENDING = int(os.getenv("SERVICE_MAX_PENDING", SERVICE_WORKERS * 4))
+SERVICE_JOB_TTL = float(os.getenv("SERVICE_JOB_TTL", 3600))
+
+MAX_REQUEST_BYTES = 64 * 1024
+RETRY_AFTER_SEC = 5
+
+
+@dataclass(slots=True)
+class Job:
+    job_id: str
+    topic: str
+    start_date: Optional[str]
+    status: str = "queued"
+    guide: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self, include_guide: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "job_id": self.job_id,
+            "topic": self.topic,
+            "start_date": self.start_date,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_guide and self.guide is not None:
+            data["guide"] = self.guide
+        return data
+
+
+class JobQueue:
+    """
+    제한된 동시성으로 가이드 생성 작업을 실행하는 작업 큐
+
+    - 생성은 공용 백그라운드 이벤트 루프에서 코루틴으로 실행되며, 동시에 workers 개까지만 진행됩니다.
+    - 대기 + 실행 중 작업이 max_pending 을 넘으면 새 작업을 받지 않습니다 (429).
+    - 끝난 작업은 job_ttl 이 지나면 목록에서 삭제됩니다.
+    """
+
+    def __init__(self, workers: int, max_pending: int, job_ttl: float):
+        self.workers = workers
+        self.max_pending = max(workers, max_pending)
+        self.job_ttl = job_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._loop = get_background_loop()
+        self._semaphore = asyncio.Semaphore(workers)
+
+    def submit(self, topic: str, start_date: Optional[str]) -> Optional[Job]:
+        """작업 등록 (가득 찼으면 None)"""
+        with self._lock:
+            self._evict_finished()
+            if self._pending >= self.max_pending:
+                return None
+            self._pending += 1
+            job = Job(uuid.uuid4().hex, topic, start_date)
+            self._jobs[job.job_id] = job
+        asyncio.run_coroutine_threadsafe(self._run(job), self._loop)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": running,
+                "jobs": len(self._jobs),
+            }
+
+    async def _run(self, job: Job) -> None:
+        try:
+            async with self._semaphore:
+                job.status = "running"
+                job.started_at = time.time()
+                guide = await acreate_learning_guide(job.topic, job.start_date)
+                if "error" in guide:
+                    job.error = guide.get("error") or "가이드 생성 실패"
+                    job.status = "error"
+                else:
+                    job.guide = guide
+                    job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+
+    def _evict_finished(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class GuideRequestHandler(BaseHTTPRequestHandler):
+    """학습 가이드 API 요청 처리"""
+
+    server_version = "LearningGuideService/1.0"
+    jobs: JobQueue = None  # serve() 에서 설정
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {
+                "status": "ok",
+                "jobs": self.jobs.stats(),
+                "coalescing": guide_flight.stats(),
+                "search_cache": get_search_cache_stats(),
+                "search_compaction": get_compaction_stats(),
+                "structured_output": get_structured_output_stats(),
+                "price_cache": get_price_cache_stats(),
+                "upstreams": get_upstream_stats(),
+            })
+            return
+
+        if len(parts) in (2, 3) and parts[0] == "guides":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "작업을 찾을 수 없습니다.")
+            elif len(parts) == 2:
+                self._send_json(HTTPStatus.OK, job.to_dict())
+            elif parts[2] == "download":
+                fmt = parse_qs(url.query).get("format", ["docx"])[0]
+                self._send_download(job, fmt)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "지원하지 않는 경로입니다.")
+            return
+
+        self._send_error(HTTPStatus.NOT_FOUND, "지원하지 않는 경로입니다.")
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/guides":
+            self._send_error(HTTPStatus.NOT_FOUND, "지원하지 않는 경로입니다.")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_REQUEST_BYTES:
+            self._send_error(HTTPStatus.BAD_REQUEST, "요청 본문이 비어 있거나 너무 큽니다.")
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._send_error(HTTPStatus.BAD_REQUEST, "요청 본문이 올바른 JSON이 아닙니다.")
+            return
+
+        if not isinstance(body, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "요청 본문은 JSON 객체여야 합니다.")
+            return
+        topic = str(body.get("topic") or "").strip()
+        if not topic:
+            self._send_error(HTTPStatus.BAD_REQUEST, "topic 을 입력해주세요.")
+            return
+        start_date = str(body.get("start_date") or "").strip() or None
+        if start_date is not None:
+            try:
+                datetime.strptime(start_date, "%Y-%m-%d")
+            except ValueError:
+                self._send_error(HTTPStatus.BAD_REQUEST, "start_date 는 YYYY-MM-DD 형식이어야 합니다.")
+                return
+
+        job = self.jobs.submit(topic, start_date)
+        if job is None:
+            self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "처리 중인 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(RETRY_AFTER_SEC)},
+            )
+            return
+        self._send_json(
+            HTTPStatus.ACCEPTED,
+            job.to_dict(include_guide=False),
+            headers={"Location": f"/guides/{job.job_id}"},
+        )
+
+    def _send_download(self, job: Job, fmt: str) -> None:
+        if fmt not in EXPORT_FORMATS:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"format 은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다.")
+            return
+        if job.status != "done":
+            self._send_error(HTTPStatus.CONFLICT, f"가이드가 아직 준비되지 않았습니다. (status: {job.status})")
+            return
+
+        # 헤더를 보내기 전에 메모리 버퍼에 먼저 렌더링 (실패하면 200 대신 500 응답, Content-Length 지정)
+        buffer = io.BytesIO()
+        try:
+            written = write_learning_guide(job.guide, buffer, fmt=fmt)
+        except Exception as e:
+            print(f"❌ 가이드 내보내기 실패 ({job.job_id}, {fmt}): {type(e).__name__}: {e}")
+            written = False
+        if not written:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "가이드 파일을 만들지 못했습니다.")
+            return
+
+        body = buffer.getvalue()
+        filename = build_guide_filename(job.guide, fmt)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", EXPORT_MEDIA_TYPES[fmt])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header(
+            "Content-Disposition",
+            f"attachment; filename=\"guide{EXPORT_FORMATS[fmt]}\"; filename*=UTF-8''{quote(filename)}",
+        )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {"error": message}, headers=headers)
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = SERVICE_WORKERS,
+          max_pending: int = SERVICE_MAX_PENDING) -> None:
+    """Agent 를 미리 만들어 두고 HTTP 서비스 시작"""
+    print("🔥 카테고리 Agent 준비 중...")
+    warm_up_agents()
+
+    GuideRequestHandler.jobs = JobQueue(workers, max_pending, SERVICE_JOB_TTL)
+    httpd = ThreadingHTTPServer((host, port), GuideRequestHandler)
+    httpd.daemon_threads = True
+    print(f"✅ 학습 가이드 서비스 시작: http://{host}:{port} (동시 생성 {workers}개, 최대 대기 {max_pending}개)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 서비스를 종료합니다.")
+    finally:
+        httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 가이드 HTTP 서비스")
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"바인드 주소 (기본 {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"포트 (기본 {SERVICE_PORT})")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="동시 생성 개수")
+    parser.add_argument("--max-pending", type=int, default=None, help="대기 포함 최대 작업 수 (초과 시 429)")
+    args = parser.parse_args()
+
+    if not load_env():
+        print("\n❌ 환경 변수 설정 후 다시 실행해주세요.")
+        return
+
+    workers = max(1, args.workers)
+    max_pending = args.max_pending or int(os.getenv("SERVICE_MAX_PENDING", workers * 4))
+    serve(args.host, args.port, workers, max_pending)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+tool.keyword_index 테스트
+
+KeywordIndex 가 기존 이중 루프 분류(benchmarks/bench_classify.py 의 legacy_classify)와
+같은 결과를 내는지 CATEGORIES 키워드로 만든 주제에서 비교합니다.
+
+기존 방식은 주제만 소문자로 바꾸고 키워드는 그대로 비교하므로 대문자 약어 키워드("AI", "PM")를
+매칭하지 못했습니다. 그 키워드가 들어간 주제는 비교에서 빼고 기대 카테고리로 따로 확인합니다.
+
+사용법:
+    python -m pytest tests/test_keyword_index.py -q
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.bench_classify import ACRONYM_TOPICS, FALSE_POSITIVE_TOPICS, legacy_classify, make_topics
+from tool.categories import CATEGORIES
+from tool.keyword_index import KeywordIndex
+
+KEYWORDS = [keyword for info in CATEGORIES.values() for keyword in info["keywords"]]
+
+# 기존 방식이 매칭하지 못한 키워드
+ACRONYM_KEYWORDS = [keyword for keyword in KEYWORDS if keyword != keyword.lower()]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return KeywordIndex(CATEGORIES)
+
+
+def _has_acronym(topic: str) -> bool:
+    return any(keyword in topic for keyword in ACRONYM_KEYWORDS)
+
+
+@pytest.mark.parametrize("keyword", [k for k in KEYWORDS if k not in ACRONYM_KEYWORDS])
+def test_single_keyword_matches_legacy(index, keyword):
+    assert index.classify(keyword) == legacy_classify(keyword)
+
+
+def test_generated_topics_match_legacy(index):
+    topics = [topic for topic in make_topics(5000) if not _has_acronym(topic)]
+    assert len(topics) > 4000
+
+    mismatches = [(topic, legacy_classify(topic), index.classify(topic)) for topic in topics]
+    mismatches = [m for m in mismatches if m[1] != m[2]]
+    assert mismatches == []
+
+
+def test_topics_without_keywords_are_unclassified(index):
+    for topic in ("python", "C언어 기타 연주", "초보자를 위한 한 달 완성", ""):
+        assert legacy_classify(topic) is None
+        assert index.classify(topic) is None
+
+
+@pytest.mark.parametrize("topic, expected", ACRONYM_TOPICS)
+def test_acronym_keywords(index, topic, expected):
+    assert index.classify(topic) == expected
+
+
+@pytest.mark.parametrize("topic", FALSE_POSITIVE_TOPICS)
+def test_acronym_not_matched_inside_words(index, topic):
+    assert index.classify(topic) is None
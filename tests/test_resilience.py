@@ -0,0 +1,408 @@
+"""
+utils.resilience 테스트
+
+로컬 가짜 HTTP 서버(ThreadingHTTPServer)에 정해 둔 응답을 차례로 돌려주게 하고,
+urllib 로 호출하여 Retry-After 준수, 재시도 jitter 범위, 서킷 브레이커 상태 전이,
+스트림 재시도 경로를 확인합니다. (네트워크, 외부 라이브러리 불필요)
+
+사용법:
+    python -m pytest tests/test_resilience.py -q
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import urllib.request
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.error import HTTPError
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils import resilience
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, Upstream
+
+
+# ---------------------------------------------------------------------------
+# 가짜 서버
+# ---------------------------------------------------------------------------
+
+class FakeUpstream:
+    """
+    정해 둔 응답을 요청 순서대로 돌려주는 로컬 HTTP 서버
+
+    응답은 (상태 코드, 헤더, 본문 조각 목록, 중간 끊김 여부) 이며, 다 쓰면 200 "ok" 를 돌려줍니다.
+    중간 끊김이면 Content-Length 보다 적게 보내고 연결을 닫습니다.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with upstream._lock:
+                    upstream.requests += 1
+                    response = upstream.responses.pop(0) if upstream.responses else (200, {}, [b"ok"], False)
+                status, headers, chunks, truncated = response
+                body = b"".join(chunks)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body) + (100 if truncated else 0)))
+                self.end_headers()
+                for chunk in chunks:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def respond(self, status, headers=None, chunks=(b"ok",), truncated=False):
+        self.responses.append((status, headers or {}, list(chunks), truncated))
+
+    def get(self) -> bytes:
+        with urllib.request.urlopen(self.url, timeout=5) as response:
+            return response.read()
+
+    def lines(self):
+        with urllib.request.urlopen(self.url, timeout=5) as response:
+            expected = int(response.headers["Content-Length"])
+            received = 0
+            for line in response:
+                received += len(line)
+                yield line
+        if received < expected:
+            raise ConnectionError("응답이 중간에 끊겼습니다.")
+
+    async def alines(self):
+        response = await asyncio.to_thread(urllib.request.urlopen, self.url, timeout=5)
+        expected = int(response.headers["Content-Length"])
+        received = 0
+        try:
+            while True:
+                line = await asyncio.to_thread(response.readline)
+                if not line:
+                    break
+                received += len(line)
+                yield line
+        finally:
+            response.close()
+        if received < expected:
+            raise ConnectionError("응답이 중간에 끊겼습니다.")
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    fake = FakeUpstream()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Upstream.call/stream 의 재시도 대기 시간을 기록하고 실제로는 기다리지 않음"""
+    recorded = []
+    fake_time = SimpleNamespace(monotonic=time.monotonic, time=time.time, sleep=recorded.append)
+    monkeypatch.setattr(resilience, "time", fake_time)
+    return recorded
+
+
+def make_upstream(max_attempts=3, base_delay=0.01, max_retry_after=30.0, failure_threshold=5, reset_timeout=30.0):
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=base_delay, max_retry_after=max_retry_after)
+    return Upstream("fake", policy, CircuitBreaker("fake", failure_threshold, reset_timeout))
+
+
+# ---------------------------------------------------------------------------
+# Retry-After
+# ---------------------------------------------------------------------------
+
+def test_retry_after_seconds_is_waited(server, sleeps):
+    upstream = make_upstream(base_delay=0.5)
+    server.respond(429, {"Retry-After": "2"})
+
+    assert upstream.call(server.get) == b"ok"
+    assert server.requests == 2
+    assert len(sleeps) == 1
+    assert 2.0 <= sleeps[0] <= 2.5
+
+
+def test_retry_after_ms_takes_precedence(server, sleeps):
+    upstream = make_upstream(base_delay=0.1)
+    server.respond(503, {"Retry-After": "20", "retry-after-ms": "300"})
+
+    assert upstream.call(server.get) == b"ok"
+    assert 0.3 <= sleeps[0] <= 0.4
+
+
+def test_retry_after_http_date(server, sleeps):
+    upstream = make_upstream(base_delay=0.1)
+    server.respond(429, {"Retry-After": formatdate(time.time() + 5, usegmt=True)})
+
+    assert upstream.call(server.get) == b"ok"
+    # HTTP 날짜는 초 단위라 최대 1초 일찍 끝날 수 있음
+    assert 3.9 <= sleeps[0] <= 5.1
+
+
+def test_retry_after_longer_than_limit_fails_without_waiting(server, sleeps):
+    upstream = make_upstream(max_retry_after=10.0)
+    server.respond(429, {"Retry-After": "60"})
+
+    with pytest.raises(HTTPError) as info:
+        upstream.call(server.get)
+    assert info.value.code == 429
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_non_transient_status_is_not_retried(server, sleeps):
+    upstream = make_upstream(failure_threshold=1)
+    server.respond(400)
+
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+    assert server.requests == 1
+    assert sleeps == []
+    # 요청 자체의 문제는 서킷 실패로 세지 않음
+    assert upstream.breaker.state == "closed"
+
+
+def test_gives_up_after_max_attempts(server, sleeps):
+    upstream = make_upstream(max_attempts=3)
+    for _ in range(5):
+        server.respond(502)
+
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+    assert server.requests == 3
+    assert len(sleeps) == 2
+    assert upstream.stats()["retries"] == 2
+    assert upstream.stats()["failures"] == 1
+
+
+# ---------------------------------------------------------------------------
+# jitter
+# ---------------------------------------------------------------------------
+
+def test_backoff_full_jitter_bounds():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, multiplier=2.0)
+    for attempt, cap in ((1, 0.5), (2, 1.0), (3, 2.0), (4, 3.0), (8, 3.0)):
+        delays = [policy.backoff(attempt) for _ in range(2000)]
+        assert all(0.0 <= delay <= cap for delay in delays)
+        # 상한까지 고르게 퍼짐 (모두 같은 값으로 몰리지 않음)
+        assert min(delays) < cap * 0.1
+        assert max(delays) > cap * 0.9
+
+
+def test_backoff_jitter_without_retry_after(server, sleeps):
+    upstream = make_upstream(max_attempts=4, base_delay=0.2)
+    for _ in range(3):
+        server.respond(503)
+
+    assert upstream.call(server.get) == b"ok"
+    assert len(sleeps) == 3
+    assert all(0.0 <= delay <= cap for delay, cap in zip(sleeps, (0.2, 0.4, 0.8)))
+
+
+def test_retry_after_jitter_bounds(server, sleeps):
+    upstream = make_upstream(max_attempts=2, base_delay=0.25)
+    for _ in range(50):
+        server.respond(429, {"Retry-After": "1"})
+        upstream.call(server.get)
+    assert all(1.0 <= delay <= 1.25 for delay in sleeps)
+    assert max(sleeps) - min(sleeps) > 0.1
+
+
+# ---------------------------------------------------------------------------
+# 서킷 브레이커
+# ---------------------------------------------------------------------------
+
+def test_breaker_opens_after_threshold_and_short_circuits(server, sleeps):
+    upstream = make_upstream(max_attempts=1, failure_threshold=2, reset_timeout=60.0)
+    server.respond(503)
+    server.respond(503)
+
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            upstream.call(server.get)
+    assert upstream.breaker.state == "open"
+
+    # 열려 있는 동안에는 서버에 요청하지 않음
+    with pytest.raises(CircuitOpenError) as info:
+        upstream.call(server.get)
+    assert server.requests == 2
+    assert 0 < info.value.retry_in <= 60.0
+    assert upstream.stats()["short_circuited"] == 1
+    assert upstream.stats()["opened"] == 1
+
+
+def test_breaker_opening_stops_retries(server, sleeps):
+    upstream = make_upstream(max_attempts=5, failure_threshold=2)
+    for _ in range(5):
+        server.respond(503)
+
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+    assert server.requests == 2
+    assert upstream.breaker.state == "open"
+
+
+def test_half_open_success_closes(server):
+    upstream = make_upstream(max_attempts=1, failure_threshold=1, reset_timeout=0.1)
+    server.respond(503)
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+    assert upstream.breaker.state == "open"
+
+    time.sleep(0.15)
+    assert upstream.call(server.get) == b"ok"
+    assert upstream.breaker.state == "closed"
+    assert upstream.breaker.failures == 0
+
+
+def test_half_open_failure_reopens(server):
+    upstream = make_upstream(max_attempts=3, failure_threshold=1, reset_timeout=0.1)
+    server.respond(503)
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+
+    time.sleep(0.15)
+    server.respond(503)
+    with pytest.raises(HTTPError):
+        upstream.call(server.get)
+    # 시험 호출이 실패하면 재시도하지 않고 다시 열림
+    assert server.requests == 2
+    assert upstream.breaker.state == "open"
+    assert upstream.stats()["opened"] == 2
+    with pytest.raises(CircuitOpenError):
+        upstream.call(server.get)
+
+
+def test_half_open_allows_single_trial():
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.1)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # 시험 호출이 끝나기 전 다른 호출은 바로 실패
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # 판단할 수 없는 결과로 끝나면 시험 자리만 돌려줌
+    breaker.release()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+# ---------------------------------------------------------------------------
+# 스트림
+# ---------------------------------------------------------------------------
+
+STREAM_CHUNKS = (b"data: 1\n", b"data: 2\n", b"data: 3\n")
+
+
+def test_stream_retries_before_first_chunk(server, sleeps):
+    upstream = make_upstream()
+    server.respond(503, {"Retry-After": "1"})
+    server.respond(200, chunks=STREAM_CHUNKS)
+
+    assert list(upstream.stream(server.lines)) == list(STREAM_CHUNKS)
+    assert server.requests == 2
+    assert 1.0 <= sleeps[0] <= 1.01
+    assert upstream.breaker.state == "closed"
+
+
+def test_stream_does_not_retry_after_first_chunk(server, sleeps):
+    upstream = make_upstream(failure_threshold=1)
+    server.respond(200, chunks=STREAM_CHUNKS, truncated=True)
+
+    received = []
+    # 끊김은 일시적 오류지만 이미 조각을 전달했으므로 재시도하지 않음
+    with pytest.raises(ConnectionError):
+        for line in upstream.stream(server.lines):
+            received.append(line)
+    assert received == list(STREAM_CHUNKS)
+    assert server.requests == 1
+    assert sleeps == []
+    # 첫 조각을 받았으면 upstream 은 응답한 것으로 봄
+    assert upstream.breaker.state == "closed"
+
+
+def test_stream_closed_early_releases_half_open_trial(server):
+    upstream = make_upstream(max_attempts=1, failure_threshold=1, reset_timeout=0.05)
+    server.respond(503)
+    with pytest.raises(HTTPError):
+        list(upstream.stream(server.lines))
+    time.sleep(0.1)
+
+    server.respond(200, chunks=STREAM_CHUNKS)
+    stream = upstream.stream(server.lines)
+    assert next(stream) == STREAM_CHUNKS[0]
+    stream.close()
+    # 시험 호출 자리가 남아 있지 않으므로 다음 호출이 가능
+    assert list(upstream.stream(server.lines)) == [b"ok"]
+
+
+def test_astream_retries_before_first_chunk(server):
+    upstream = make_upstream(base_delay=0.01)
+    server.respond(429, {"retry-after-ms": "50"})
+    server.respond(200, chunks=STREAM_CHUNKS)
+
+    async def collect():
+        return [line async for line in upstream.astream(server.alines)]
+
+    started = time.monotonic()
+    assert asyncio.run(collect()) == list(STREAM_CHUNKS)
+    assert time.monotonic() - started >= 0.05
+    assert server.requests == 2
+
+
+def test_astream_does_not_retry_after_first_chunk(server):
+    upstream = make_upstream()
+    server.respond(200, chunks=STREAM_CHUNKS, truncated=True)
+
+    async def collect(received):
+        async for line in upstream.astream(server.alines):
+            received.append(line)
+
+    received = []
+    with pytest.raises(ConnectionError):
+        asyncio.run(collect(received))
+    assert received == list(STREAM_CHUNKS)
+    assert server.requests == 1
+
+
+def test_acall_opens_breaker(server):
+    upstream = make_upstream(max_attempts=2, base_delay=0.01, failure_threshold=2, reset_timeout=60.0)
+    for _ in range(3):
+        server.respond(500)
+
+    async def get():
+        return await asyncio.to_thread(server.get)
+
+    with pytest.raises(HTTPError):
+        asyncio.run(upstream.acall(get))
+    assert server.requests == 2
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(upstream.acall(get))
+    assert server.requests == 2
@@ -0,0 +1,150 @@
+"""
+캐시가 적용된 Tavily 검색 Tool
+
+정규화된 검색어와 검색 파라미터의 해시를 키로 하여 검색 결과를 디스크에 저장합니다.
+인기 주제에서 반복되는 검색("파이썬 강의 후기" 등)은 네트워크 호출 없이 바로 반환됩니다.
+
+category 를 지정하면 Agent 에 넘기기 전에 결과를 카테고리 설정대로 압축합니다 (result_compaction).
+캐시에는 압축 전 결과를 저장하므로 압축 설정을 바꿔도 캐시를 비울 필요가 없습니다.
+
+캐시에 없는 검색은 utils.resilience 의 tavily upstream 정책(재시도 + 서킷 브레이커)으로 호출합니다.
+재시도 후에도 실패하면 기존과 같이 오류 문자열을 반환합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from langchain_community.tools.tavily_search import TavilySearchResults
+
+from utils.cache import SQLiteCache, normalize_cache_text
+from utils.resilience import CircuitOpenError, tavily_upstream
+
+from .result_compaction import SEARCH_COMPACTION_ENABLED, compact_for_prompt, get_compaction_config
+
+
+# 검색 캐시 설정
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", 24 * 3600))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 20000))
+
+search_cache = SQLiteCache("tavily_search", ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+
+# 캐시 키에 포함되는 TavilySearchResults 필드
+_KEY_FIELDS = (
+    "max_results",
+    "search_depth",
+    "include_domains",
+    "exclude_domains",
+    "include_answer",
+    "include_raw_content",
+    "include_images",
+)
+
+
+def _search_cache_key(tool: TavilySearchResults, query: str) -> str:
+    params: Dict[str, Any] = {field: getattr(tool, field, None) for field in _KEY_FIELDS}
+    params["query"] = normalize_cache_text(query)
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load(key: str):
+    cached = search_cache.get(key)
+    if cached is None:
+        return None
+    entry, _ = cached
+    if entry.get("is_tuple"):
+        return tuple(entry["result"])
+    return entry["result"]
+
+
+def _store(key: str, result) -> None:
+    # 오류 시 Tool은 문자열(repr(e))을 반환하므로 캐시하지 않음
+    content = result[0] if isinstance(result, tuple) else result
+    if isinstance(content, str):
+        return
+    is_tuple = isinstance(result, tuple)
+    try:
+        search_cache.set(key, {"is_tuple": is_tuple, "result": list(result) if is_tuple else result})
+    except (TypeError, ValueError) as e:
+        print(f"⚠️ 검색 결과 캐시 저장 실패: {e}")
+
+
+class SearchToolError(Exception):
+    """Tool 이 예외 대신 반환한 검색 오류 문자열 (재시도 판단용)"""
+
+    # 상태 코드를 알 수 없는 오류(연결 실패 등)는 일시적인 오류로 보고 재시도
+    transient = True
+
+    def __init__(self, result):
+        super().__init__(result[0] if isinstance(result, tuple) else result)
+        self.result = result
+
+
+def _raise_on_error(result):
+    content = result[0] if isinstance(result, tuple) else result
+    if isinstance(content, str):
+        raise SearchToolError(result)
+    return result
+
+
+class CachedTavilySearchResults(TavilySearchResults):
+    """TavilySearchResults 와 같은 형태의 결과를 반환하는 디스크 캐시 Tool"""
+
+    # 지정하면 결과를 이 카테고리의 압축 설정으로 줄인 JSON 문자열로 반환
+    category: Optional[str] = None
+
+    def _run(self, query: str, run_manager=None):
+        key = _search_cache_key(self, query)
+        result = _load(key)
+        if result is None:
+            search = super()._run
+            try:
+                result = tavily_upstream.call(lambda: _raise_on_error(search(query, run_manager=run_manager)))
+            except SearchToolError as e:
+                return e.result
+            except CircuitOpenError as e:
+                return self._error_result(e)
+            _store(key, result)
+        return self._compact(result)
+
+    async def _arun(self, query: str, run_manager=None):
+        key = _search_cache_key(self, query)
+        # SQLite 조회·저장은 이벤트 루프를 막지 않도록 스레드에서 실행
+        result = await asyncio.to_thread(_load, key)
+        if result is None:
+            search = super()._arun
+
+            async def attempt():
+                return _raise_on_error(await search(query, run_manager=run_manager))
+
+            try:
+                result = await tavily_upstream.acall(attempt)
+            except SearchToolError as e:
+                return e.result
+            except CircuitOpenError as e:
+                return self._error_result(e)
+            await asyncio.to_thread(_store, key, result)
+        return self._compact(result)
+
+    def _error_result(self, error: Exception):
+        # TavilySearchResults 가 오류 시 반환하는 형태와 같게
+        if getattr(self, "response_format", "content") == "content_and_artifact":
+            return repr(error), {}
+        return repr(error)
+
+    def _compact(self, result):
+        if self.category is None or not SEARCH_COMPACTION_ENABLED:
+            return result
+        content = result[0] if isinstance(result, tuple) else result
+        if not isinstance(content, list):
+            return result
+        compacted = compact_for_prompt(content, get_compaction_config(self.category))
+        return (compacted,) + tuple(result[1:]) if isinstance(result, tuple) else compacted
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """검색 캐시 hit/miss 통계 (TTL 튜닝용)"""
+    return search_cache.stats()
@@ -0,0 +1,32 @@
+"""
+학습 카테고리 정의
+
+LangChain 없이도 불러올 수 있도록 분류기(키워드 인덱스, 로컬 분류기)가 공유하는
+카테고리 데이터만 모아둔 모듈입니다.
+
+keywords 항목은 문자열 또는 (키워드, 가중치) 튜플로 지정할 수 있습니다 (기본 가중치 1.0).
+"""
+
+# 카테고리 정의
+CATEGORIES = {
+    "Academic / STEM": {
+        "keywords": ["수학", "과학", "물리", "화학", "생명", "사회과학", "언어학습", "학술", "이론", "교재"],
+        "description": "학술·STEM (수학, 과학, 물리, 화학, 생명, 사회과학, 언어학습)"
+    },
+    "Career / Tech Skills": {
+        "keywords": ["코딩", "프로그래밍", "데이터", "분석", "AI", "머신러닝", "웹", "개발", "보안", "디자인", "PM", "비즈니스", "기술"],
+        "description": "커리어·기술 (코딩, 데이터 분석, AI, 웹 개발, 보안, 디자인, PM, 비즈니스 스킬)"
+    },
+    "Sports / Physical Skills": {
+        "keywords": ["축구", "농구", "야구", "골프", "헬스", "달리기", "요가", "운동", "스포츠", "체육"],
+        "description": "스포츠·신체 기술 (축구, 농구, 야구, 골프, 헬스, 달리기, 요가 등)"
+    },
+    "Arts / Creative": {
+        "keywords": ["춤", "음악", "그림", "사진", "영상", "편집", "작곡", "연기", "예술", "창작", "디자인"],
+        "description": "예술·창작 (춤, 음악, 그림, 사진, 영상편집, 작곡, 연기 등)"
+    },
+    "Lifestyle / Hobby": {
+        "keywords": ["요리", "여행", "생산성", "글쓰기", "정리", "원예", "취미", "생활", "뜨개질", "리듬게임", "주식"],
+        "description": "취미·생활 (요리, 여행 준비, 생산성, 글쓰기, 정리, 원예 등)"
+    }
+}
@@ -7,46 +7,55 @@
 3. Sports / Physical Skills (스포츠·신체 기술)
 4. Arts / Creative (예술·창작)
 5. Lifestyle / Hobby (취미·생활)
+
+카테고리별 AgentExecutor는 프로세스 전체에서 한 번만 생성되어 재사용됩니다.
 """
 
 import os
+import threading
 from datetime import datetime
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import Any, Callable, Dict, Optional
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain import hub
+
+from utils.json_parser import StreamingStepParser
+
+from .cached_search import CachedTavilySearchResults
+from .resilient_llm import ResilientChatOpenAI
+from .token_usage import TokenUsageHandler
 
 
-# Tavily Tool 생성 (모든 카테고리에서 공통 사용)1
-def get_tavily_tool():
-    """Tavily 검색 Tool 생성"""
-    return TavilySearchResults(
+# 프롬프트 버전 (시스템 메시지나 출력 형식을 바꾸면 올려서 가이드 캐시를 무효화)
+PROMPT_VERSION = "3"
+
+
+# Tavily Tool 생성 (모든 카테고리에서 공통 사용)
+def get_tavily_tool(category_name: Optional[str] = None):
+    """Tavily 검색 Tool 생성 (디스크 캐시 적용, category_name 을 주면 결과를 카테고리 설정으로 압축)"""
+    return CachedTavilySearchResults(
         api_key=os.environ.get("TAVILY_API_KEY", ""),
-        max_results=10
+        max_results=10,
+        category=category_name
     )
 
 
 def get_base_llm():
-    """기본 LLM 생성"""
-    return ChatOpenAI(model="gpt-4-turbo", temperature=0)
-
+    """기본 LLM 생성 (스트리밍 응답에서도 토큰 사용량을 받도록 stream_usage 사용, 호출마다 재시도·서킷 브레이커 적용)"""
+    return ResilientChatOpenAI(model="gpt-4-turbo", temperature=0, stream_usage=True)
 
-def create_category_agent(category_name: str, category_guidelines: str) -> AgentExecutor:
-    """카테고리별 Agent 생성"""
-    llm = get_base_llm()
-    tools = [get_tavily_tool()]
-    
-    # LangChain hub에서 기본 프롬프트 가져오기
-    base_prompt = hub.pull("hwchase17/openai-functions-agent")
-    
-    # 시스템 메시지만 커스터마이징 - JSON 형식 설명을 단순화
-    system_message = f"""너는 {category_name} 전문 교육 설계자야.
 
-{category_guidelines}
+# 모든 카테고리·요청에 공통인 지시문
+# 시스템 메시지 맨 앞에 그대로 두어 카테고리와 요청이 달라도 같은 접두부가 되도록 함
+# (OpenAI 프롬프트 캐시는 1024 토큰 이상 동일한 접두부에만 적용되므로, 카테고리별 내용은 반드시 뒤에 붙일 것)
+#
+# 측정값 (tiktoken cl100k_base, benchmarks/bench_prompt_prefix.py):
+# - SHARED_INSTRUCTIONS 906 토큰, 카테고리 공통 접두부 agent 959 / retrieval 997 토큰 → 1024 미만이라 카테고리 간 캐시 적중은 없음
+# - 카테고리별 전체 시스템 메시지는 agent 1103~1133 / retrieval 1141~1171 토큰 → 같은 카테고리의 반복 요청끼리 캐시 적중
+# 의미 없는 문장으로 1024 토큰을 채우면 모든 요청의 입력 토큰이 늘어나므로 채우지 않음.
+# 지시문을 고치면 위 스크립트로 다시 측정할 것.
+SHARED_INSTRUCTIONS = """너는 단계별 학습 가이드를 만드는 교육 설계자야.
 
-사용자가 배우고 싶은 주제에 대해 단계별 학습 가이드를 작성해. Tavily 검색을 활용하여 최신 정보, 교재, 강의, 후기를 수집해. 교재/사이트는 가져온 언어 그대로 출력해도 되지만,  나머지 모든 내용(학습 내용, 투두리스트, 후기 요약 등)은 자연스럽고 명확한 한국어로 작성해야 한다. 특히 학습자 후기(reviews_summary)와 투두리스트는 한국어 표현으로 제공해. 
+사용자가 배우고 싶은 주제에 대해 단계별 학습 가이드를 작성해. 교재/사이트는 가져온 언어 그대로 출력해도 되지만,  나머지 모든 내용(학습 내용, 투두리스트, 후기 요약 등)은 자연스럽고 명확한 한국어로 작성해야 한다. 특히 학습자 후기(reviews_summary)와 투두리스트는 한국어 표현으로 제공해.
 
 중요:
 - 각 단계의 학습 내용 배열에는 최소 4개의 문장을 포함하고, “왜 이 단계가 중요한지, 어떤 전략으로 학습하면 좋은지, 실전에서 바로 써먹을 수 있는 꿀팁은 무엇인지”를 구체적으로 서술해. 
@@ -57,7 +66,7 @@ def create_category_agent(category_name: str, category_guidelines: str) -> Agent
 반드시 JSON 형식으로 출력해야 해. 다음 구조를 따라야 해 (단, 추천 교재 항목은 절대 포함하지 마):
 
 1. topic: 학습 주제명
-2. category: {category_name}
+2. category: 아래 [카테고리] 의 카테고리명
 3. total_duration_days: 총 학습 일수 (숫자)
 4. start_date: 시작일 (YYYY-MM-DD 형식)
 5. end_date: 종료일 (YYYY-MM-DD 형식)
@@ -76,24 +85,61 @@ learning_content는 절대로 문장을 글자 단위로 나누지 마라.
 절대로 bullet symbol 자체를 JSON에 넣지 마라.
 문장 앞에 dash(-), asterisk(*), middle dot(·), bullet(•) 등을 넣지 마라.
 그냥 순수 문자열만 넣어라.
+"""
 
+# 정보 수집 지시문 (생성 모드마다 다름)
+# 검색 도구가 없는 모드도 SHARED_INSTRUCTIONS 접두부를 공유할 수 있도록 공통 지시문과 분리
+AGENT_TOOL_INSTRUCTIONS = """[정보 수집]
+Tavily 검색 도구를 활용하여 최신 정보, 교재, 강의, 후기를 수집해.
 """
-    
-    # 기본 프롬프트의 메시지 구조를 가져와서 시스템 메시지만 교체
-    prompt = ChatPromptTemplate.from_messages([
+
+
+def build_system_message(
+    category_name: str,
+    category_guidelines: str,
+    instructions: str = SHARED_INSTRUCTIONS,
+    source_instructions: str = "",
+) -> str:
+    """카테고리별 시스템 메시지 생성 (공통 지시문 → 정보 수집 지시문 → 카테고리 정보 순서)"""
+    sources = f"{source_instructions}\n" if source_instructions else ""
+    return f"""{instructions}
+{sources}[카테고리]
+너는 {category_name} 전문 교육 설계자야.
+카테고리명: {category_name}
+{category_guidelines}"""
+
+
+def build_agent_prompt(system_message: str) -> ChatPromptTemplate:
+    """
+    Agent 프롬프트 생성
+
+    hwchase17/openai-functions-agent 와 같은 메시지 구조를 코드에 내장하여
+    실행 중에 LangChain hub를 호출하지 않습니다.
+    """
+    return ChatPromptTemplate.from_messages([
         ("system", system_message),
         MessagesPlaceholder(variable_name="chat_history", optional=True),
         ("human", "{input}"),
         MessagesPlaceholder(variable_name="agent_scratchpad"),
     ])
-    
+
+
+def create_category_agent(category_name: str, category_guidelines: str) -> AgentExecutor:
+    """카테고리별 Agent 생성"""
+    llm = get_base_llm()
+    tools = [get_tavily_tool(category_name)]
+
+    prompt = build_agent_prompt(
+        build_system_message(category_name, category_guidelines, source_instructions=AGENT_TOOL_INSTRUCTIONS)
+    )
+
     agent = create_openai_tools_agent(llm, tools, prompt)
     agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False)
-    
+
     return agent_executor
 
 
-# 1. Academic / STEM Agent
+# 1. Academic / STEM
 ACADEMIC_GUIDELINES = """
 학술·STEM 분야 학습 가이드:
 - 교재 기반 학습 중심
@@ -102,34 +148,8 @@ ACADEMIC_GUIDELINES = """
 - 단계별로 이론 학습 후 실습/문제 풀이 구성
 """
 
-def create_academic_guide(topic: str, start_date: str = None) -> Dict[str, Any]:
-    """Academic/STEM 학습 가이드 생성"""
-    if start_date is None:
-        start_date = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        agent = create_category_agent("Academic / STEM", ACADEMIC_GUIDELINES)
-        
-        query = f"'{topic}'를 배우고 싶어. 단계별 학습 가이드를 만들어줘. 시작 날짜는 {start_date}야. Tavily 검색을 사용해서 최신 교재, 강의, 후기 정보를 수집해."
-        
-        result = agent.invoke({"input": query})
-        output = result.get("output", "")
-        if not output:
-            return {
-                "error": "Agent가 출력을 생성하지 못했습니다.",
-                "category": "Academic / STEM",
-                "raw_output": ""
-            }
-        return {"raw_output": output, "category": "Academic / STEM"}
-    except Exception as e:
-        return {
-            "error": f"Agent 실행 중 오류 발생: {str(e)}",
-            "category": "Academic / STEM",
-            "raw_output": ""
-        }
-
 
-# 2. Career / Tech Skills Agent
+# 2. Career / Tech Skills
 CAREER_TECH_GUIDELINES = """
 커리어·기술 스킬 학습 가이드:
 - 프로젝트 기반 학습 중심
@@ -139,34 +159,8 @@ CAREER_TECH_GUIDELINES = """
 - 깃허브 레포지토리 추천 필수 (코딩 관련)
 """
 
-def create_career_tech_guide(topic: str, start_date: str = None) -> Dict[str, Any]:
-    """Career/Tech Skills 학습 가이드 생성"""
-    if start_date is None:
-        start_date = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        agent = create_category_agent("Career / Tech Skills", CAREER_TECH_GUIDELINES)
-        
-        query = f"'{topic}'를 배우고 싶어. 단계별 학습 가이드를 만들어줘. 시작 날짜는 {start_date}야. Tavily 검색을 사용해서 최신 교재, 강의, 후기 정보를 수집해."
-        
-        result = agent.invoke({"input": query})
-        output = result.get("output", "")
-        if not output:
-            return {
-                "error": "Agent가 출력을 생성하지 못했습니다.",
-                "category": "Career / Tech Skills",
-                "raw_output": ""
-            }
-        return {"raw_output": output, "category": "Career / Tech Skills"}
-    except Exception as e:
-        return {
-            "error": f"Agent 실행 중 오류 발생: {str(e)}",
-            "category": "Career / Tech Skills",
-            "raw_output": ""
-        }
-
 
-# 3. Sports / Physical Skills Agent
+# 3. Sports / Physical Skills
 SPORTS_GUIDELINES = """
 스포츠·신체 기술 학습 가이드:
 - 기술 단계별 훈련 중심
@@ -176,34 +170,8 @@ SPORTS_GUIDELINES = """
 - 각 단계마다 구체적인 훈련 방법과 영상 자료 추천
 """
 
-def create_sports_guide(topic: str, start_date: str = None) -> Dict[str, Any]:
-    """Sports/Physical Skills 학습 가이드 생성"""
-    if start_date is None:
-        start_date = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        agent = create_category_agent("Sports / Physical Skills", SPORTS_GUIDELINES)
-        
-        query = f"'{topic}'를 배우고 싶어. 단계별 학습 가이드를 만들어줘. 시작 날짜는 {start_date}야. Tavily 검색을 사용해서 최신 교재, 강의, 후기 정보를 수집해."
-        
-        result = agent.invoke({"input": query})
-        output = result.get("output", "")
-        if not output:
-            return {
-                "error": "Agent가 출력을 생성하지 못했습니다.",
-                "category": "Sports / Physical Skills",
-                "raw_output": ""
-            }
-        return {"raw_output": output, "category": "Sports / Physical Skills"}
-    except Exception as e:
-        return {
-            "error": f"Agent 실행 중 오류 발생: {str(e)}",
-            "category": "Sports / Physical Skills",
-            "raw_output": ""
-        }
 
-
-# 4. Arts / Creative Agent
+# 4. Arts / Creative
 ARTS_GUIDELINES = """
 예술·창작 학습 가이드:
 - 실습 기반 학습 중심
@@ -213,34 +181,8 @@ ARTS_GUIDELINES = """
 - 각 단계마다 완성할 작품 목표 설정
 """
 
-def create_arts_guide(topic: str, start_date: str = None) -> Dict[str, Any]:
-    """Arts/Creative 학습 가이드 생성"""
-    if start_date is None:
-        start_date = datetime.now().strftime('%Y-%m-%d')
-    
-    try:
-        agent = create_category_agent("Arts / Creative", ARTS_GUIDELINES)
-        
-        query = f"'{topic}'를 배우고 싶어. 단계별 학습 가이드를 만들어줘. 시작 날짜는 {start_date}야. Tavily 검색을 사용해서 최신 교재, 강의, 후기 정보를 수집해."
-        
-        result = agent.invoke({"input": query})
-        output = result.get("output", "")
-        if not output:
-            return {
-                "error": "Agent가 출력을 생성하지 못했습니다.",
-                "category": "Arts / Creative",
-                "raw_output": ""
-            }
-        return {"raw_output": output, "category": "Arts / Creative"}
-    except Exception as e:
-        return {
-            "error": f"Agent 실행 중 오류 발생: {str(e)}",
-            "category": "Arts / Creative",
-            "raw_output": ""
-        }
-
 
-# 5. Lifestyle / Hobby Agent
+# 5. Lifestyle / Hobby
 LIFESTYLE_GUIDELINES = """
 취미·생활 학습 가이드:
 - 루틴 관리 중심
@@ -250,29 +192,160 @@ LIFESTYLE_GUIDELINES = """
 - 실용적인 팁과 트릭 포함
 """
 
-def create_lifestyle_guide(topic: str, start_date: str = None) -> Dict[str, Any]:
-    """Lifestyle/Hobby 학습 가이드 생성"""
+
+# 카테고리명 → 가이드라인
+CATEGORY_GUIDELINES = {
+    "Academic / STEM": ACADEMIC_GUIDELINES,
+    "Career / Tech Skills": CAREER_TECH_GUIDELINES,
+    "Sports / Physical Skills": SPORTS_GUIDELINES,
+    "Arts / Creative": ARTS_GUIDELINES,
+    "Lifestyle / Hobby": LIFESTYLE_GUIDELINES,
+}
+
+
+# 카테고리별 AgentExecutor 레지스트리 (프로세스 전역)
+_AGENT_REGISTRY: Dict[str, AgentExecutor] = {}
+_AGENT_REGISTRY_LOCK = threading.Lock()
+
+
+def get_category_agent(category_name: str) -> AgentExecutor:
+    """
+    카테고리별 Agent를 레지스트리에서 가져오기 (없으면 한 번만 생성)
+
+    AgentExecutor는 호출 간 상태를 갖지 않으므로 여러 스레드에서 공유해도 안전합니다.
+
+    Args:
+        category_name: CATEGORY_GUIDELINES 의 카테고리명
+
+    Returns:
+        재사용 가능한 AgentExecutor
+    """
+    agent = _AGENT_REGISTRY.get(category_name)
+    if agent is not None:
+        return agent
+
+    with _AGENT_REGISTRY_LOCK:
+        agent = _AGENT_REGISTRY.get(category_name)
+        if agent is None:
+            agent = create_category_agent(category_name, CATEGORY_GUIDELINES[category_name])
+            _AGENT_REGISTRY[category_name] = agent
+    return agent
+
+
+def warm_up_agents() -> None:
+    """모든 카테고리 Agent를 미리 생성"""
+    for category_name in CATEGORY_GUIDELINES:
+        get_category_agent(category_name)
+
+
+def build_user_query(topic: str, start_date: str) -> str:
+    """Agent에 전달할 사용자 요청 문장 생성 (작성 지시는 시스템 메시지에 있으므로 주제와 시작일만 전달)"""
+    return f"학습 주제: {topic}\n시작 날짜: {start_date}"
+
+
+def _to_guide_result(category_name: str, result: Dict[str, Any], usage: TokenUsageHandler) -> Dict[str, Any]:
+    output = result.get("output", "")
+    if not output:
+        return {
+            "error": "Agent가 출력을 생성하지 못했습니다.",
+            "category": category_name,
+            "raw_output": "",
+            "token_usage": usage.to_dict()
+        }
+    return {"raw_output": output, "category": category_name, "token_usage": usage.to_dict()}
+
+
+def _to_error_result(category_name: str, e: Exception, usage: TokenUsageHandler) -> Dict[str, Any]:
+    return {
+        "error": f"Agent 실행 중 오류 발생: {str(e)}",
+        "category": category_name,
+        "raw_output": "",
+        "token_usage": usage.to_dict()
+    }
+
+
+def create_category_guide(category_name: str, topic: str, start_date: str = None) -> Dict[str, Any]:
+    """
+    카테고리별 학습 가이드 생성
+
+    Args:
+        category_name: 카테고리명
+        topic: 학습 주제
+        start_date: 시작 날짜 (YYYY-MM-DD 형식, None이면 오늘)
+
+    Returns:
+        raw_output, category, token_usage 를 포함한 딕셔너리 (실패 시 error 포함)
+        token_usage: {"prompt_tokens", "cached_tokens", "completion_tokens", "total_tokens", "llm_calls"}
+    """
     if start_date is None:
         start_date = datetime.now().strftime('%Y-%m-%d')
-    
+
+    usage = TokenUsageHandler()
     try:
-        agent = create_category_agent("Lifestyle / Hobby", LIFESTYLE_GUIDELINES)
-        
-        query = f"'{topic}'를 배우고 싶어. 단계별 학습 가이드를 만들어줘. 시작 날짜는 {start_date}야. Tavily 검색을 사용해서 최신 교재, 강의, 후기 정보를 수집해."
-        
-        result = agent.invoke({"input": query})
-        output = result.get("output", "")
-        if not output:
-            return {
-                "error": "Agent가 출력을 생성하지 못했습니다.",
-                "category": "Lifestyle / Hobby",
-                "raw_output": ""
-            }
-        return {"raw_output": output, "category": "Lifestyle / Hobby"}
+        agent = get_category_agent(category_name)
+        result = agent.invoke({"input": build_user_query(topic, start_date)}, config={"callbacks": [usage]})
+        return _to_guide_result(category_name, result, usage)
     except Exception as e:
-        return {
-            "error": f"Agent 실행 중 오류 발생: {str(e)}",
-            "category": "Lifestyle / Hobby",
-            "raw_output": ""
-        }
+        return _to_error_result(category_name, e, usage)
+
+
+async def acreate_category_guide(category_name: str, topic: str, start_date: str = None) -> Dict[str, Any]:
+    """create_category_guide 의 비동기 버전 (agent.ainvoke 사용)"""
+    if start_date is None:
+        start_date = datetime.now().strftime('%Y-%m-%d')
+
+    usage = TokenUsageHandler()
+    try:
+        agent = get_category_agent(category_name)
+        result = await agent.ainvoke({"input": build_user_query(topic, start_date)}, config={"callbacks": [usage]})
+        return _to_guide_result(category_name, result, usage)
+    except Exception as e:
+        return _to_error_result(category_name, e, usage)
+
 
+async def astream_category_guide(
+    category_name: str,
+    topic: str,
+    start_date: str = None,
+    on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    최종 답변을 토큰 단위로 받으며 학습 가이드 생성
+
+    Agent의 마지막 답변을 StreamingStepParser 에 흘려 넣어, steps[i] 가 완성될 때마다
+    on_step(step) 을 호출합니다. 반환값은 acreate_category_guide 와 같습니다.
+
+    도구 호출 전의 중간 답변에서 이미 단계를 전달했다면, 도구 호출 후의 답변을 새 파서로 받아
+    1단계부터 다시 on_step 을 호출합니다. 이때 그 전에 전달된 단계는 무효입니다
+    (호출 측은 step_number 가 1 로 돌아오면 이전 단계를 버리면 됩니다).
+    """
+    if start_date is None:
+        start_date = datetime.now().strftime('%Y-%m-%d')
+
+    parser = StreamingStepParser(on_step=on_step)
+    final_output = None
+    usage = TokenUsageHandler()
+
+    try:
+        agent = get_category_agent(category_name)
+        async for event in agent.astream_events(
+            {"input": build_user_query(topic, start_date)}, config={"callbacks": [usage]}, version="v2"
+        ):
+            kind = event["event"]
+            if kind == "on_tool_start":
+                # 도구 호출 전의 중간 답변은 최종 답변이 아니므로 버림
+                if parser.steps:
+                    print(f"⚠️ 앞서 전달한 {len(parser.steps)}개 단계는 무효입니다. 도구 호출 후 답변의 단계를 1단계부터 전달합니다.")
+                parser = StreamingStepParser(on_step=on_step)
+            elif kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if isinstance(content, str) and content:
+                    parser.feed(content)
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                output = event["data"].get("output")
+                if isinstance(output, dict):
+                    final_output = output.get("output")
+
+        return _to_guide_result(category_name, {"output": final_output or parser.text}, usage)
+    except Exception as e:
+        return _to_error_result(category_name, e, usage)
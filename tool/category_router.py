@@ -5,46 +5,66 @@
 """
 
 import os
-from typing import Dict, Any, Callable
-from langchain_openai import ChatOpenAI
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, Tuple
 from langchain.prompts import ChatPromptTemplate
-from langchain_community.tools.tavily_search import TavilySearchResults
-from .category_agents import (
-    create_academic_guide,
-    create_career_tech_guide,
-    create_sports_guide,
-    create_arts_guide,
-    create_lifestyle_guide
-)
-
-# 카테고리 정의
-CATEGORIES = {
-    "Academic / STEM": {
-        "keywords": ["수학", "과학", "물리", "화학", "생명", "사회과학", "언어학습", "학술", "이론", "교재"],
-        "description": "학술·STEM (수학, 과학, 물리, 화학, 생명, 사회과학, 언어학습)",
-        "function": create_academic_guide
-    },
-    "Career / Tech Skills": {
-        "keywords": ["코딩", "프로그래밍", "데이터", "분석", "AI", "머신러닝", "웹", "개발", "보안", "디자인", "PM", "비즈니스", "기술"],
-        "description": "커리어·기술 (코딩, 데이터 분석, AI, 웹 개발, 보안, 디자인, PM, 비즈니스 스킬)",
-        "function": create_career_tech_guide
-    },
-    "Sports / Physical Skills": {
-        "keywords": ["축구", "농구", "야구", "골프", "헬스", "달리기", "요가", "운동", "스포츠", "체육"],
-        "description": "스포츠·신체 기술 (축구, 농구, 야구, 골프, 헬스, 달리기, 요가 등)",
-        "function": create_sports_guide
-    },
-    "Arts / Creative": {
-        "keywords": ["춤", "음악", "그림", "사진", "영상", "편집", "작곡", "연기", "예술", "창작", "디자인"],
-        "description": "예술·창작 (춤, 음악, 그림, 사진, 영상편집, 작곡, 연기 등)",
-        "function": create_arts_guide
-    },
-    "Lifestyle / Hobby": {
-        "keywords": ["요리", "여행", "생산성", "글쓰기", "정리", "원예", "취미", "생활", "뜨개질", "리듬게임", "주식"],
-        "description": "취미·생활 (요리, 여행 준비, 생산성, 글쓰기, 정리, 원예 등)",
-        "function": create_lifestyle_guide
-    }
-}
+from .category_agents import acreate_category_guide, astream_category_guide, create_category_guide
+from .categories import CATEGORIES
+from .keyword_index import KeywordIndex
+from .generation_modes import get_generation_mode
+from .retrieval_guide import acreate_retrieval_guide, create_retrieval_guide
+from .skeleton_guide import acreate_skeleton_guide, create_skeleton_guide
+from .structured_guide import acreate_structured_guide, create_structured_guide
+from .local_classifier import LocalClassifier, build_training_examples
+from .resilient_llm import ResilientChatOpenAI
+
+# 키워드 인덱스 (모듈 로드 시 한 번만 컴파일)
+KEYWORD_INDEX = KeywordIndex(CATEGORIES)
+
+# 오프라인 분류기 (신뢰도가 이 값 이상이면 LLM 분류를 생략)
+# 기준값은 benchmarks/eval_classifier.py 의 평가 주제에서 정확도 90% 이상을 유지하는 가장 낮은 값
+# (커버리지 약 23%, 0.4 에서는 정확도가 약 70% 로 떨어짐)
+LOCAL_CLASSIFIER = LocalClassifier(build_training_examples(CATEGORIES))
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", 0.6))
+
+
+def classify_by_keywords(topic: str) -> Optional[str]:
+    """
+    키워드 기반 카테고리 분류
+
+    Args:
+        topic: 학습 주제
+
+    Returns:
+        분류된 카테고리명 또는 None (키워드 매칭 실패)
+    """
+    return KEYWORD_INDEX.classify(topic)
+
+
+def classify_locally(topic: str) -> Tuple[Optional[str], float]:
+    """
+    오프라인 분류기로 카테고리 분류
+
+    Returns:
+        (카테고리명, 신뢰도 0~1)
+    """
+    return LOCAL_CLASSIFIER.predict(topic)
+
+
+def _classify_offline(topic: str) -> Optional[str]:
+    category = classify_by_keywords(topic)
+    if category is not None:
+        return category
+
+    category, confidence = classify_locally(topic)
+    if category is not None and confidence >= LOCAL_CLASSIFIER_THRESHOLD:
+        return category
+    return None
+
+
+def explain_classification(topic: str) -> Dict[str, Any]:
+    """키워드 분류 근거 (매칭된 키워드, 카테고리별 점수) 반환 - 디버깅용"""
+    return KEYWORD_INDEX.explain(topic)
 
 
 def classify_category(topic: str) -> str:
@@ -57,26 +77,30 @@ def classify_category(topic: str) -> str:
     Returns:
         분류된 카테고리명
     """
-    topic_lower = topic.lower()
-    
-    # 키워드 기반 간단한 분류
-    category_scores = {}
-    for category, info in CATEGORIES.items():
-        score = sum(1 for keyword in info["keywords"] if keyword in topic_lower)
-        if score > 0:
-            category_scores[category] = score
-    
-    if category_scores:
-        # 가장 높은 점수의 카테고리 반환
-        return max(category_scores.items(), key=lambda x: x[1])[0]
+    # 키워드 → 오프라인 분류기 순서로 시도
+    category = _classify_offline(topic)
+    if category is not None:
+        return category
     
-    # LLM을 사용한 분류 (키워드 매칭 실패 시)
+    # LLM을 사용한 분류 (오프라인 분류 신뢰도가 낮을 때)
     return classify_with_llm(topic)
 
 
-def classify_with_llm(topic: str) -> str:
-    """LLM을 사용하여 카테고리 분류"""
-    llm = ChatOpenAI(model="gpt-4-turbo", temperature=0)
+async def aclassify_category(topic: str) -> str:
+    """classify_category 의 비동기 버전"""
+    category = _classify_offline(topic)
+    if category is not None:
+        return category
+    return await aclassify_with_llm(topic)
+
+
+@lru_cache(maxsize=1)
+def _get_classifier_llm() -> ResilientChatOpenAI:
+    return ResilientChatOpenAI(model="gpt-4-turbo", temperature=0)
+
+
+def _build_classification_chain(topic: str):
+    llm = _get_classifier_llm()
     
     categories_description = "\n".join([
         f"- {cat}: {info['description']}" 
@@ -94,9 +118,11 @@ def classify_with_llm(topic: str) -> str:
         ("human", f"학습 주제: {topic}")
     ])
     
-    chain = prompt | llm
-    result = chain.invoke({})
-    category = result.content.strip()
+    return prompt | llm
+
+
+def _resolve_llm_category(content: str) -> str:
+    category = content.strip()
     
     # 결과가 유효한 카테고리인지 확인
     if category in CATEGORIES:
@@ -106,32 +132,100 @@ def classify_with_llm(topic: str) -> str:
     return "Lifestyle / Hobby"
 
 
-def route_to_category_agent(topic: str, start_date: str = None) -> Dict[str, Any]:
+def _fallback_category(topic: str, error: Exception) -> str:
+    # LLM 호출이 실패하면(재시도 소진, 서킷 열림) 신뢰도와 관계없이 오프라인 분류 결과 사용
+    category, _ = classify_locally(topic)
+    category = category or "Lifestyle / Hobby"
+    print(f"⚠️ LLM 분류 실패 ({type(error).__name__}: {error}) → {category} 로 분류")
+    return category
+
+
+def classify_with_llm(topic: str) -> str:
+    """LLM을 사용하여 카테고리 분류 (실패 시 오프라인 분류 결과)"""
+    try:
+        result = _build_classification_chain(topic).invoke({})
+    except Exception as e:
+        return _fallback_category(topic, e)
+    return _resolve_llm_category(result.content)
+
+
+async def aclassify_with_llm(topic: str) -> str:
+    """classify_with_llm 의 비동기 버전"""
+    try:
+        result = await _build_classification_chain(topic).ainvoke({})
+    except Exception as e:
+        return _fallback_category(topic, e)
+    return _resolve_llm_category(result.content)
+
+
+def route_to_category_agent(topic: str, start_date: str = None, category: str = None, mode: str = None) -> Dict[str, Any]:
     """
     주제를 카테고리로 분류하고 해당 Agent로 라우팅
     
     Args:
         topic: 학습 주제
         start_date: 시작 날짜 (YYYY-MM-DD 형식, None이면 오늘)
+        category: 이미 분류된 카테고리 (None이면 새로 분류)
+        mode: "agent", "retrieval", "skeleton", "structured" (None이면 카테고리별 기본 모드)
     
     Returns:
-        학습 가이드 결과 (raw_output, category 포함)
+        학습 가이드 결과 (raw_output, category, token_usage 포함)
     """
     # 카테고리 분류
-    category = classify_category(topic)
-    print(f"📌 분류된 카테고리: {category}")
+    if category is None:
+        category = classify_category(topic)
+        print(f"📌 분류된 카테고리: {category}")
     
-    # 해당 카테고리의 Agent 함수 호출
-    agent_function = CATEGORIES[category]["function"]
-    result = agent_function(topic, start_date)
+    mode = get_generation_mode(category, mode)
+    if mode == "retrieval":
+        return create_retrieval_guide(category, topic, start_date)
+    if mode == "skeleton":
+        return create_skeleton_guide(category, topic, start_date)
+    if mode == "structured":
+        return create_structured_guide(category, topic, start_date)
+
+    # 해당 카테고리의 Agent 실행 (레지스트리에 캐시된 Agent 재사용)
+    result = create_category_guide(category, topic, start_date)
     
     return result
 
 
+async def aroute_to_category_agent(
+    topic: str,
+    start_date: str = None,
+    category: str = None,
+    on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
+    mode: str = None,
+) -> Dict[str, Any]:
+    """
+    route_to_category_agent 의 비동기 버전
+
+    on_step 을 주면 스트리밍 모드로 실행하여 단계가 완성될 때마다 콜백을 호출합니다.
+    """
+    if category is None:
+        category = await aclassify_category(topic)
+        print(f"📌 분류된 카테고리: {category}")
+    
+    mode = get_generation_mode(category, mode)
+    if mode == "retrieval":
+        return await acreate_retrieval_guide(category, topic, start_date, on_step=on_step)
+    if mode == "skeleton":
+        return await acreate_skeleton_guide(category, topic, start_date, on_step=on_step)
+    if mode == "structured":
+        return await acreate_structured_guide(category, topic, start_date, on_step=on_step)
+    if on_step is not None:
+        return await astream_category_guide(category, topic, start_date, on_step=on_step)
+    return await acreate_category_guide(category, topic, start_date)
+
+
 # 카테고리별 Agent 함수들을 export
 __all__ = [
     "classify_category",
+    "aclassify_category",
+    "classify_locally",
+    "explain_classification",
     "route_to_category_agent",
+    "aroute_to_category_agent",
     "CATEGORIES"
 ]
 
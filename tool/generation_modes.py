@@ -0,0 +1,67 @@
+"""
+생성 모드 선택
+
+카테고리마다 학습 가이드를 어떤 방식으로 생성할지 정합니다.
+LangChain 없이도 불러올 수 있도록 생성 모드별 구현과 분리된 모듈입니다.
+
+- agent: 카테고리 Agent (category_agents)
+- retrieval: 검색 후 LLM 1회 호출 (retrieval_guide)
+- skeleton: 뼈대 생성 후 단계별 병렬 확장 (skeleton_guide)
+- structured: 검색 후 스키마 고정 도구 호출 1회 (structured_guide)
+
+CATEGORY_GENERATION_MODES 의 기본값을 환경 변수로 바꿀 수 있습니다.
+    GENERATION_MODE=retrieval                                  # 모든 카테고리 (agent / retrieval / skeleton / structured)
+    GENERATION_MODE_OVERRIDES="Sports / Physical Skills=retrieval;Career / Tech Skills=retrieval"
+"""
+
+import os
+from typing import Dict, Optional
+
+from .categories import CATEGORIES
+
+
+GENERATION_MODES = ("agent", "retrieval", "skeleton", "structured")
+
+# 카테고리명 → 기본 생성 모드
+CATEGORY_GENERATION_MODES: Dict[str, str] = {category: "agent" for category in CATEGORIES}
+
+
+def _load_mode_overrides() -> None:
+    mode = os.getenv("GENERATION_MODE")
+    if mode:
+        if mode in GENERATION_MODES:
+            for category in CATEGORY_GENERATION_MODES:
+                CATEGORY_GENERATION_MODES[category] = mode
+        else:
+            print(f"⚠️ 알 수 없는 GENERATION_MODE 입니다: {mode}")
+
+    for pair in os.getenv("GENERATION_MODE_OVERRIDES", "").split(";"):
+        if not pair.strip():
+            continue
+        category, _, mode = pair.partition("=")
+        category, mode = category.strip(), mode.strip()
+        if category in CATEGORY_GENERATION_MODES and mode in GENERATION_MODES:
+            CATEGORY_GENERATION_MODES[category] = mode
+        else:
+            print(f"⚠️ GENERATION_MODE_OVERRIDES 항목을 무시합니다: {pair}")
+
+
+_load_mode_overrides()
+
+
+def get_generation_mode(category_name: str, mode: Optional[str] = None) -> str:
+    """
+    카테고리의 생성 모드 결정
+
+    Args:
+        category_name: 카테고리명
+        mode: 호출자가 지정한 모드 (None이면 CATEGORY_GENERATION_MODES)
+
+    Returns:
+        GENERATION_MODES 중 하나
+    """
+    if mode is not None:
+        if mode not in GENERATION_MODES:
+            raise ValueError(f"지원하지 않는 생성 모드입니다: {mode} (가능: {', '.join(GENERATION_MODES)})")
+        return mode
+    return CATEGORY_GENERATION_MODES.get(category_name, "agent")
@@ -0,0 +1,102 @@
+"""
+카테고리 키워드 인덱스
+
+CATEGORIES 의 모든 키워드를 하나의 정규식으로 한 번만 컴파일하여
+주제 문자열을 한 번만 훑어 카테고리 점수를 계산합니다.
+
+- 긴 키워드가 우선 매칭됩니다 (예: "사회과학" 안의 "과학"은 따로 세지 않음).
+- 영문·숫자로 시작하거나 끝나는 키워드는 영단어 안에서 매칭되지 않습니다
+  (예: "AI" 는 "painting", "Thai" 안에서 매칭되지 않고 "AI로", "AI 입문" 에서는 매칭).
+- 같은 키워드는 여러 번 나와도 한 번만 점수에 반영됩니다.
+- 여러 카테고리에 속한 키워드("디자인" 등)는 가중치를 카테고리 수로 나누어 배분합니다.
+- 동점이면 CATEGORIES 에 정의된 순서가 앞선 카테고리를 선택합니다.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _ascii_alnum(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def keyword_pattern(keyword: str) -> str:
+    """키워드 정규식 (영문·숫자 끝에는 영단어 경계 적용, 한글 조사는 허용)"""
+    pattern = re.escape(keyword)
+    if _ascii_alnum(keyword[0]):
+        pattern = r"(?<![a-z0-9])" + pattern
+    if _ascii_alnum(keyword[-1]):
+        pattern += r"(?![a-z0-9])"
+    return pattern
+
+
+class KeywordIndex:
+    """CATEGORIES 로부터 만든 키워드 → (카테고리, 가중치) 인덱스"""
+
+    def __init__(self, categories: Dict[str, Dict[str, Any]]):
+        self.category_order = {name: i for i, name in enumerate(categories)}
+
+        owners: Dict[str, List[Tuple[str, float]]] = {}
+        for category, info in categories.items():
+            for entry in info.get("keywords", []):
+                keyword, weight = entry if isinstance(entry, (tuple, list)) else (entry, 1.0)
+                keyword = keyword.lower()
+                if keyword:
+                    owners.setdefault(keyword, []).append((category, float(weight)))
+
+        # 여러 카테고리에 속한 키워드는 가중치를 나누어 한 번만 점수에 반영
+        self.keywords: Dict[str, List[Tuple[str, float]]] = {
+            keyword: [(category, weight / len(entries)) for category, weight in entries]
+            for keyword, entries in owners.items()
+        }
+
+        ordered = sorted(self.keywords, key=lambda k: (-len(k), k))
+        self.pattern = re.compile("|".join(keyword_pattern(k) for k in ordered)) if ordered else None
+
+    def _match(self, topic: str) -> List[re.Match]:
+        if self.pattern is None:
+            return []
+        return list(self.pattern.finditer(topic.lower()))
+
+    def _score(self, keywords) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for keyword in keywords:
+            for category, weight in self.keywords[keyword]:
+                scores[category] = scores.get(category, 0.0) + weight
+        return scores
+
+    def _best(self, scores: Dict[str, float]) -> Optional[str]:
+        if not scores:
+            return None
+        return min(scores, key=lambda c: (-scores[c], self.category_order.get(c, len(self.category_order))))
+
+    def classify(self, topic: str) -> Optional[str]:
+        """
+        키워드 점수가 가장 높은 카테고리 반환
+
+        Args:
+            topic: 학습 주제
+
+        Returns:
+            카테고리명 또는 None (매칭된 키워드 없음)
+        """
+        matched = {m.group(0) for m in self._match(topic)}
+        return self._best(self._score(matched))
+
+    def explain(self, topic: str) -> Dict[str, Any]:
+        """분류 근거 (매칭 위치, 키워드별 기여, 카테고리 점수, 선택 결과)"""
+        matches = self._match(topic)
+        seen = []
+        for m in matches:
+            if m.group(0) not in seen:
+                seen.append(m.group(0))
+        scores = self._score(seen)
+        return {
+            "topic": topic,
+            "matches": [
+                {"keyword": m.group(0), "span": m.span(), "categories": dict(self.keywords[m.group(0)])}
+                for m in matches
+            ],
+            "scores": dict(sorted(scores.items(), key=lambda kv: (-kv[1], self.category_order.get(kv[0], 0)))),
+            "category": self._best(scores),
+        }
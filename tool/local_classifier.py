@@ -0,0 +1,133 @@
+"""
+오프라인 카테고리 분류기
+
+문자 n-gram TF-IDF 와 최근접 중심(nearest centroid) 방식의 가벼운 분류기입니다.
+CATEGORIES 의 설명·키워드와 tool/data/seed_topics.jsonl 의 라벨된 주제로 학습하며,
+신뢰도가 낮은 주제만 LLM 분류로 넘기도록 (카테고리, 신뢰도)를 반환합니다.
+"""
+
+import json
+import math
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+SEED_TOPICS_PATH = Path(__file__).parent / "data" / "seed_topics.jsonl"
+
+NGRAM_RANGE = (1, 3)
+
+# 1위 유사도가 이 값보다 낮으면 신뢰도를 비례해서 낮춤 (학습 데이터와 거의 겹치지 않는 주제)
+SIMILARITY_FLOOR = 0.1
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text).lower()
+    return " ".join(text.split())
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Dict[str, int]:
+    """공백으로 감싼 문자열의 문자 n-gram 빈도"""
+    padded = f" {_normalize(text)} "
+    counts: Dict[str, int] = {}
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def _l2_normalize(vec: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    if norm == 0:
+        return vec
+    return {k: v / norm for k, v in vec.items()}
+
+
+def _dot(a: Dict[str, float], b: Dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class LocalClassifier:
+    """문자 n-gram TF-IDF + 최근접 중심 분류기"""
+
+    def __init__(self, examples: Iterable[Tuple[str, str]]):
+        examples = [(text, label) for text, label in examples if text and label]
+        self.labels: List[str] = list(dict.fromkeys(label for _, label in examples))
+
+        docs = [(char_ngrams(text), label) for text, label in examples]
+        df: Dict[str, int] = {}
+        for grams, _ in docs:
+            for gram in grams:
+                df[gram] = df.get(gram, 0) + 1
+        n_docs = len(docs)
+        self.idf = {gram: math.log((1 + n_docs) / (1 + count)) + 1.0 for gram, count in df.items()}
+
+        sums: Dict[str, Dict[str, float]] = {label: {} for label in self.labels}
+        for grams, label in docs:
+            centroid = sums[label]
+            for gram, weight in self._vectorize(grams).items():
+                centroid[gram] = centroid.get(gram, 0.0) + weight
+        self.centroids = {label: _l2_normalize(vec) for label, vec in sums.items()}
+
+    def _vectorize(self, grams: Dict[str, int]) -> Dict[str, float]:
+        vec = {
+            gram: (1.0 + math.log(count)) * self.idf[gram]
+            for gram, count in grams.items()
+            if gram in self.idf
+        }
+        return _l2_normalize(vec)
+
+    def scores(self, topic: str) -> Dict[str, float]:
+        """카테고리별 코사인 유사도"""
+        vec = self._vectorize(char_ngrams(topic))
+        return {label: _dot(vec, centroid) for label, centroid in self.centroids.items()}
+
+    def predict(self, topic: str) -> Tuple[Optional[str], float]:
+        """
+        주제 분류
+
+        Args:
+            topic: 학습 주제
+
+        Returns:
+            (카테고리명, 신뢰도 0~1). 신뢰도는 1위와 2위 유사도 차이의 비율에
+            1위 유사도가 SIMILARITY_FLOOR 미만일 때의 감쇠를 곱한 값이며,
+            학습 데이터와 겹치는 n-gram 이 없으면 (None, 0.0)
+        """
+        scores = self.scores(topic)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self.labels.index(kv[0])))
+        if not ranked or ranked[0][1] <= 0:
+            return None, 0.0
+        best, top = ranked[0]
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        return best, (top - second) / top * min(1.0, top / SIMILARITY_FLOOR)
+
+
+def load_seed_topics(path: Path = SEED_TOPICS_PATH) -> List[Tuple[str, str]]:
+    """라벨된 시드 주제 (topic, category) 목록"""
+    if not path.exists():
+        return []
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((record["topic"], record["category"]))
+    return examples
+
+
+def build_training_examples(categories: Dict[str, Dict], seed_path: Path = SEED_TOPICS_PATH) -> List[Tuple[str, str]]:
+    """CATEGORIES 의 설명·키워드 + 시드 주제로 학습 데이터 구성"""
+    examples: List[Tuple[str, str]] = []
+    for category, info in categories.items():
+        examples.append((info.get("description", ""), category))
+        for entry in info.get("keywords", []):
+            keyword = entry[0] if isinstance(entry, (tuple, list)) else entry
+            examples.append((keyword, category))
+    examples.extend((topic, category) for topic, category in load_seed_topics(seed_path) if category in categories)
+    return examples
@@ -0,0 +1,33 @@
+"""
+재시도·서킷 브레이커가 적용된 ChatOpenAI
+
+LLM 호출 하나하나를 utils.resilience 의 openai upstream 으로 감쌉니다.
+Agent 실행 중간의 LLM 호출이 실패해도 Agent 전체가 아니라 그 호출만 다시 시도합니다.
+재시도는 이 계층에서만 하도록 OpenAI SDK 자체 재시도(max_retries)는 끕니다.
+"""
+
+from langchain_openai import ChatOpenAI
+
+from utils.resilience import openai_upstream
+
+
+class ResilientChatOpenAI(ChatOpenAI):
+    """openai upstream 정책(재시도 + Retry-After + 서킷 브레이커)으로 호출하는 ChatOpenAI"""
+
+    max_retries: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return openai_upstream.call(super()._generate, messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._agenerate
+        return await openai_upstream.acall(lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        stream = super()._stream
+        yield from openai_upstream.stream(lambda: stream(messages, stop=stop, run_manager=run_manager, **kwargs))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        stream = super()._astream
+        async for chunk in openai_upstream.astream(lambda: stream(messages, stop=stop, run_manager=run_manager, **kwargs)):
+            yield chunk
@@ -0,0 +1,262 @@
+"""
+검색 결과 압축
+
+Tavily 검색 결과가 Agent 의 scratchpad 에 그대로 쌓이면 반복마다 프롬프트가 커집니다.
+검색 Tool 과 LLM 사이에서 결과를 줄여 프롬프트 토큰을 절약합니다.
+
+1. 같은 URL 제거 (http/https, www., #fragment, 끝의 / 차이 무시)
+2. 도메인별 최대 결과 수 제한
+3. 결과당 본문 길이 제한
+4. 거의 같은 본문 제거 (잘린 본문의 문자 shingle + MinHash 로 추정한 Jaccard 유사도)
+5. 프롬프트에 필요한 필드(title, url, content)만 유지
+
+카테고리별 설정은 CATEGORY_COMPACTION 에 있으며, SEARCH_COMPACTION=0 이면 압축하지 않습니다.
+절약한 토큰 수는 get_compaction_stats() 로 확인할 수 있습니다.
+"""
+
+import json
+import os
+import random
+import threading
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.cache import normalize_cache_text
+
+
+SEARCH_COMPACTION_ENABLED = os.getenv("SEARCH_COMPACTION", "1") != "0"
+
+
+@dataclass(frozen=True, slots=True)
+class CompactionConfig:
+    max_results: int = 5           # 압축 후 남길 최대 결과 수
+    max_chars: int = 500           # 결과당 본문 최대 글자 수
+    max_per_domain: int = 2        # 같은 도메인에서 남길 최대 결과 수
+    near_duplicate: float = 0.7    # 이 값 이상 유사하면 거의 같은 본문으로 보고 제거
+    shingle_size: int = 5          # 문자 shingle 길이
+    num_perm: int = 64             # MinHash 해시 함수 수
+    fields: Tuple[str, ...] = ("title", "url", "content")
+
+
+DEFAULT_COMPACTION = CompactionConfig()
+
+# 카테고리명 → 압축 설정 (없으면 DEFAULT_COMPACTION)
+CATEGORY_COMPACTION: Dict[str, CompactionConfig] = {
+    # 개념 설명이 긴 자료가 많음
+    "Academic / STEM": CompactionConfig(max_chars=600),
+    # github.com 레포지토리 여러 개를 함께 추천
+    "Career / Tech Skills": CompactionConfig(max_per_domain=3),
+    # youtube.com 훈련 영상 여러 개를 함께 추천
+    "Sports / Physical Skills": CompactionConfig(max_per_domain=3),
+    "Arts / Creative": DEFAULT_COMPACTION,
+    "Lifestyle / Hobby": CompactionConfig(max_chars=400),
+}
+
+
+def get_compaction_config(category_name: Optional[str]) -> CompactionConfig:
+    return CATEGORY_COMPACTION.get(category_name, DEFAULT_COMPACTION)
+
+
+# ---------------------------------------------------------------------------
+# URL / 도메인
+# ---------------------------------------------------------------------------
+
+def url_key(url: str) -> str:
+    """같은 문서 판별용 URL 키"""
+    key = normalize_cache_text(url.split("#", 1)[0]).rstrip("/")
+    for prefix in ("https://", "http://", "www."):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    return key
+
+
+def url_domain(url: str) -> str:
+    host = urlsplit(url if "://" in url else f"//{url}").hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+# ---------------------------------------------------------------------------
+# MinHash
+# ---------------------------------------------------------------------------
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int) -> Tuple[Tuple[int, int], ...]:
+    # 실행마다 같은 서명이 나오도록 고정 시드 사용
+    rng = random.Random(1)
+    return tuple((rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm))
+
+
+def _shingles(text: str, size: int) -> List[int]:
+    text = normalize_cache_text(text)
+    if len(text) <= size:
+        return [zlib.crc32(text.encode("utf-8"))] if text else []
+    return list({zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)})
+
+
+def minhash_signature(text: str, shingle_size: int = 5, num_perm: int = 64) -> Optional[Tuple[int, ...]]:
+    """문자 shingle 의 MinHash 서명 (빈 문자열이면 None)"""
+    hashes = _shingles(text, shingle_size)
+    if not hashes:
+        return None
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _permutations(num_perm)
+    )
+
+
+def estimate_similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """두 MinHash 서명으로 추정한 Jaccard 유사도"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+# ---------------------------------------------------------------------------
+# 토큰 수
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    # tiktoken 은 langchain-openai 와 함께 설치됨. 없으면 근사치 사용
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """프롬프트 토큰 수 (tiktoken 이 없으면 UTF-8 바이트 수 / 4 근사)"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+# ---------------------------------------------------------------------------
+# 압축
+# ---------------------------------------------------------------------------
+
+_stats = {"calls": 0, "results_in": 0, "results_out": 0, "tokens_before": 0, "tokens_after": 0}
+_stats_lock = threading.Lock()
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    # 단어 중간에서 자르지 않도록 마지막 공백까지 (너무 많이 줄면 그대로)
+    space = cut.rfind(" ")
+    if space >= max_chars * 0.8:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def compact_results(results: Iterable[Any], config: CompactionConfig = DEFAULT_COMPACTION) -> List[Dict[str, Any]]:
+    """
+    검색 결과 목록 압축 (입력 순서 = 관련도 순서를 유지하며 앞의 결과를 우선)
+
+    Args:
+        results: Tavily 검색 결과 딕셔너리 목록
+        config: 압축 설정
+
+    Returns:
+        config.fields 만 남긴 결과 목록 (최대 config.max_results 개)
+    """
+    seen_urls = set()
+    domain_counts: Dict[str, int] = {}
+    signatures: List[Tuple[int, ...]] = []
+    compacted: List[Dict[str, Any]] = []
+
+    for result in results:
+        if len(compacted) >= config.max_results:
+            break
+        if not isinstance(result, dict):
+            continue
+
+        url = str(result.get("url") or "").strip()
+        key = url_key(url)
+        if not key or key in seen_urls:
+            continue
+        domain = url_domain(url)
+        if domain_counts.get(domain, 0) >= config.max_per_domain:
+            continue
+
+        # 프롬프트에 들어가는 잘린 본문으로 비교 (긴 본문 전체를 해시하지 않음)
+        content = _truncate(" ".join(str(result.get("content") or "").split()), config.max_chars)
+        signature = minhash_signature(content, config.shingle_size, config.num_perm)
+        if signature is not None and any(
+            estimate_similarity(signature, other) >= config.near_duplicate for other in signatures
+        ):
+            continue
+
+        seen_urls.add(key)
+        domain_counts[domain] = domain_counts.get(domain, 0) + 1
+        if signature is not None:
+            signatures.append(signature)
+
+        cleaned = {
+            "title": " ".join(str(result.get("title") or "").split()),
+            "url": url,
+            "content": content,
+        }
+        item = {}
+        for field in config.fields:
+            value = cleaned[field] if field in cleaned else result.get(field)
+            if value:
+                item[field] = value
+        compacted.append(item)
+
+    return compacted
+
+
+def _serialize(results: List[Any]) -> str:
+    # 프롬프트에 들어가는 형태 (한글을 이스케이프하지 않는 JSON)
+    return json.dumps(results, ensure_ascii=False)
+
+
+def _record(before: List[Any], after: List[Dict[str, Any]], after_text: Optional[str] = None) -> None:
+    """압축 전후 결과 수와 토큰 수 누적 (Agent 경로와 retrieval 경로 모두 같은 직렬화 형태로 측정)"""
+    tokens_before = count_tokens(_serialize(before))
+    tokens_after = count_tokens(after_text if after_text is not None else _serialize(after))
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["results_in"] += len(before)
+        _stats["results_out"] += len(after)
+        _stats["tokens_before"] += tokens_before
+        _stats["tokens_after"] += tokens_after
+
+
+def compact_for_prompt(results: List[Any], config: CompactionConfig = DEFAULT_COMPACTION) -> str:
+    """
+    Agent 에 전달할 검색 결과 문자열 생성 (압축 + 한글을 이스케이프하지 않는 JSON)
+
+    Tool 이 리스트를 반환하면 Agent 는 json.dumps() 로 문자열을 만들면서 한글을 \\uXXXX 로
+    이스케이프하므로, 미리 문자열로 만들어 토큰 수를 줄입니다.
+    절약한 토큰 수는 record_compaction() 과 같은 기준(이스케이프하지 않은 JSON)으로
+    get_compaction_stats() 에 누적됩니다. (이스케이프를 피해 줄어든 토큰은 포함하지 않음)
+    """
+    compacted = compact_results(results, config)
+    after = _serialize(compacted)
+    _record(results, compacted, after)
+    return after
+
+
+def record_compaction(before: List[Any], after: List[Dict[str, Any]]) -> None:
+    """compact_results() 를 직접 호출한 경우의 통계 기록"""
+    _record(before, after)
+
+
+def get_compaction_stats() -> Dict[str, Any]:
+    """검색 결과 압축 통계 (절약한 토큰 수 포함)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    stats["saved_ratio"] = round(stats["tokens_saved"] / stats["tokens_before"], 3) if stats["tokens_before"] else 0.0
+    stats["enabled"] = SEARCH_COMPACTION_ENABLED
+    return stats
@@ -0,0 +1,221 @@
+"""
+검색 후 생성 (retrieve-then-generate) 모드
+
+Agent 는 LLM 호출 → Tavily 검색 → LLM 호출을 차례로 반복하므로 왕복 횟수가 일정하지 않습니다.
+이 모드는 카테고리별로 정해진 검색어를 동시에 실행한 뒤, 압축(result_compaction)한 검색 결과로
+LLM 을 정확히 한 번만 호출합니다. (검색 1회 왕복 + LLM 1회 → 예측 가능한 지연 시간)
+
+- 시스템 메시지는 Agent 와 같은 build_system_message() 를 사용하므로 공통 지시문(SHARED_INSTRUCTIONS) 접두부를 공유합니다.
+  검색 도구 사용 지시는 공통 지시문에서 분리되어 있어, 이 모드는 대신 [검색 결과] 만 근거로 쓰라는 지시를 붙입니다.
+- 결과 딕셔너리 형태는 create_category_guide 와 같습니다 (raw_output, category, token_usage).
+- 카테고리별 생성 모드 선택은 generation_modes 모듈에 있습니다.
+"""
+
+import asyncio
+import os
+from dataclasses import replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.prompts import ChatPromptTemplate
+
+from utils.async_runner import run_sync
+from utils.json_parser import StreamingStepParser
+
+from .cached_search import CachedTavilySearchResults
+from .category_agents import (
+    CATEGORY_GUIDELINES,
+    _to_error_result,
+    _to_guide_result,
+    build_system_message,
+    build_user_query,
+    get_base_llm,
+)
+from .result_compaction import compact_results, get_compaction_config, record_compaction
+from .token_usage import TokenUsageHandler
+
+
+# 정보 수집 지시문 (Agent 의 검색 도구 지시 대신 사용)
+RETRIEVAL_SOURCE_INSTRUCTIONS = """[정보 수집]
+검색 도구는 사용할 수 없어. 사용자 메시지의 [검색 결과] 에 있는 교재, 강의, 사이트, 후기만 근거로 사용하고, 검색 결과에 없는 사이트나 URL 은 만들어내지 마.
+"""
+
+# 검색 설정
+RETRIEVAL_RESULTS_PER_QUERY = int(os.getenv("RETRIEVAL_RESULTS_PER_QUERY", 5))
+RETRIEVAL_MAX_RESULTS = int(os.getenv("RETRIEVAL_MAX_RESULTS", 20))  # 중복 제거 후 LLM 에 넘길 최대 결과 수
+RETRIEVAL_SEARCH_TIMEOUT = float(os.getenv("RETRIEVAL_SEARCH_TIMEOUT", 15.0))  # 검색 전체 제한 시간 (초)
+
+# 모든 카테고리 공통 검색어
+_COMMON_QUERIES = (
+    "{topic} 온라인 강의 추천",
+    "{topic} 추천 교재 책",
+    "{topic} 학습 후기",
+)
+
+# 카테고리명 → 검색어 템플릿 ({topic} 자리에 학습 주제)
+RETRIEVAL_QUERIES: Dict[str, Tuple[str, ...]] = {
+    "Academic / STEM": _COMMON_QUERIES + (
+        "{topic} 개념 정리 문제 풀이",
+    ),
+    "Career / Tech Skills": _COMMON_QUERIES + (
+        "{topic} github 레포지토리 추천",
+        "{topic} 실전 프로젝트 포트폴리오",
+    ),
+    "Sports / Physical Skills": _COMMON_QUERIES + (
+        "{topic} 초보 장비 추천",
+        "{topic} 기술 훈련 방법 영상",
+    ),
+    "Arts / Creative": _COMMON_QUERIES + (
+        "{topic} 연습 과제 작품 레퍼런스",
+    ),
+    "Lifestyle / Hobby": _COMMON_QUERIES + (
+        "{topic} 초보 루틴 팁",
+    ),
+}
+
+def build_search_queries(category_name: str, topic: str) -> List[str]:
+    """카테고리별 검색어 목록 생성"""
+    templates = RETRIEVAL_QUERIES.get(category_name, _COMMON_QUERIES)
+    return [template.format(topic=topic) for template in templates]
+
+
+@lru_cache(maxsize=1)
+def _get_search_tool() -> CachedTavilySearchResults:
+    return CachedTavilySearchResults(
+        api_key=os.environ.get("TAVILY_API_KEY", ""),
+        max_results=RETRIEVAL_RESULTS_PER_QUERY,
+    )
+
+
+async def _asearch(query: str) -> List[Dict[str, Any]]:
+    result = await _get_search_tool().ainvoke(query)
+    if isinstance(result, tuple):
+        result = result[0]
+    # 검색 실패 시 Tool 은 오류 문자열을 반환
+    if not isinstance(result, list):
+        print(f"⚠️ 검색 실패 ({query}): {result}")
+        return []
+    return [r for r in result if isinstance(r, dict)]
+
+
+async def asearch_topic(category_name: str, topic: str, timeout: float = RETRIEVAL_SEARCH_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    카테고리별 검색어를 동시에 실행하고 dedupe_results() 로 압축한 결과 반환
+
+    제한 시간 안에 끝나지 않은 검색은 기다리지 않고 버립니다.
+
+    Returns:
+        [{"title", "url", "content"}] (검색어 순서 → 결과 순서로 정렬)
+    """
+    tasks = [asyncio.ensure_future(_asearch(query)) for query in build_search_queries(category_name, topic)]
+    await asyncio.wait(tasks, timeout=timeout)
+
+    batches: List[List[Dict[str, Any]]] = []
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+            continue
+        try:
+            batches.append(task.result())
+        except Exception as e:
+            print(f"⚠️ 검색 실패: {e}")
+    return dedupe_results(batches, category_name)
+
+
+def merge_results(batches: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    검색어별 결과를 번갈아 합침
+
+    한 검색어의 결과가 앞자리를 모두 차지하지 않도록 각 검색어의 1위, 2위 ... 순서로 합칩니다.
+    """
+    merged: List[Dict[str, Any]] = []
+    for rank in range(max((len(batch) for batch in batches), default=0)):
+        merged.extend(batch[rank] for batch in batches if rank < len(batch))
+    return merged
+
+
+def dedupe_results(batches: List[List[Dict[str, Any]]], category_name: Optional[str] = None,
+                   max_results: int = RETRIEVAL_MAX_RESULTS) -> List[Dict[str, Any]]:
+    """
+    검색어별 결과를 합친 뒤 카테고리 압축 설정으로 URL·도메인·거의 같은 본문 중복 제거 및 길이 제한
+
+    결과 수 한도는 Agent 의 검색 1회 한도 대신 max_results 를 사용합니다.
+    """
+    merged = merge_results(batches)
+    config = replace(get_compaction_config(category_name), max_results=max_results)
+    compacted = compact_results(merged, config)
+    record_compaction(merged, compacted)
+    return compacted
+
+
+def format_search_results(results: List[Dict[str, Any]]) -> str:
+    """검색 결과를 프롬프트에 넣을 [검색 결과] 블록으로 변환"""
+    lines = ["[검색 결과]"]
+    if not results:
+        lines.append("(검색 결과 없음)")
+    for i, result in enumerate(results, 1):
+        title = f" {result['title']}" if result.get("title") else ""
+        lines.append(f"({i}){title}\nURL: {result['url']}\n{result.get('content', '')}")
+    lines.append("")
+    lines.append("추가 검색은 할 수 없어. 위 검색 결과에 있는 교재, 강의, 사이트, 후기만 근거로 사용해.")
+    return "\n".join(lines)
+
+
+def build_retrieval_query(topic: str, start_date: str, results: List[Dict[str, Any]]) -> str:
+    """검색 결과를 포함한 사용자 요청 문장 생성"""
+    return f"{build_user_query(topic, start_date)}\n\n{format_search_results(results)}"
+
+
+@lru_cache(maxsize=None)
+def _get_generation_chain(category_name: str):
+    """카테고리별 단일 호출 체인 (LLM 클라이언트 재사용)"""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", build_system_message(
+            category_name, CATEGORY_GUIDELINES[category_name], source_instructions=RETRIEVAL_SOURCE_INSTRUCTIONS
+        )),
+        ("human", "{input}"),
+    ])
+    return prompt | get_base_llm()
+
+
+async def acreate_retrieval_guide(
+    category_name: str,
+    topic: str,
+    start_date: str = None,
+    on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    검색 → LLM 1회 호출로 학습 가이드 생성
+
+    on_step 을 주면 답변을 토큰 단위로 받아 단계가 완성될 때마다 콜백을 호출합니다.
+
+    Returns:
+        raw_output, category, token_usage 를 포함한 딕셔너리 (실패 시 error 포함)
+    """
+    if start_date is None:
+        start_date = datetime.now().strftime('%Y-%m-%d')
+
+    usage = TokenUsageHandler()
+    try:
+        results = await asearch_topic(category_name, topic)
+        chain = _get_generation_chain(category_name)
+        inputs = {"input": build_retrieval_query(topic, start_date, results)}
+        config = {"callbacks": [usage]}
+
+        if on_step is None:
+            message = await chain.ainvoke(inputs, config=config)
+            return _to_guide_result(category_name, {"output": message.content}, usage)
+
+        parser = StreamingStepParser(on_step=on_step)
+        async for chunk in chain.astream(inputs, config=config):
+            if isinstance(chunk.content, str) and chunk.content:
+                parser.feed(chunk.content)
+        return _to_guide_result(category_name, {"output": parser.text}, usage)
+    except Exception as e:
+        return _to_error_result(category_name, e, usage)
+
+
+def create_retrieval_guide(category_name: str, topic: str, start_date: str = None) -> Dict[str, Any]:
+    """acreate_retrieval_guide 의 동기 버전"""
+    return run_sync(acreate_retrieval_guide(category_name, topic, start_date))
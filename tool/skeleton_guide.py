@@ -0,0 +1,255 @@
+"""
+뼈대 생성 후 단계별 병렬 확장 (map-reduce) 모드
+
+한 번의 긴 답변으로 모든 단계의 학습 내용·투두리스트·추천 사이트를 쓰면 출력 토큰 생성 시간이
+지연 시간의 대부분을 차지합니다. 이 모드는 출력을 나누어 동시에 생성합니다.
+
+1. 검색: retrieval 모드와 같은 카테고리별 검색어를 동시에 실행 (asearch_topic)
+2. 뼈대: 단계 제목·기간·목표와 후기 요약만 담은 짧은 JSON 을 LLM 1회로 생성
+3. 확장: 단계마다 learning_content, recommended_sites, todos 를 별도의 LLM 호출로 동시에 생성
+4. 병합: 뼈대와 확장 결과를 합쳐 validate_and_fix_dates() 로 날짜 정리
+
+출력 시간은 대략 (뼈대 + 가장 긴 단계 하나) 로 줄어듭니다.
+결과 딕셔너리 형태는 create_category_guide 와 같습니다 (raw_output 은 병합된 가이드 JSON).
+"""
+
+import asyncio
+import dataclasses
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.prompts import ChatPromptTemplate
+
+from utils.async_runner import run_sync
+from utils.date_validator import validate_and_fix_dates
+from utils.guide_model import Guide, Step
+from utils.json_parser import extract_json_from_text
+
+from .category_agents import (
+    CATEGORY_GUIDELINES,
+    _to_error_result,
+    _to_guide_result,
+    build_system_message,
+    get_base_llm,
+)
+from .retrieval_guide import asearch_topic, format_search_results
+from .token_usage import TokenUsageHandler
+
+
+SKELETON_MAX_STEPS = 6
+SKELETON_TIMEOUT = float(os.getenv("SKELETON_TIMEOUT", 120.0))  # 뼈대 생성 제한 시간 (초)
+EXPANSION_TIMEOUT = float(os.getenv("EXPANSION_TIMEOUT", 120.0))  # 단계 하나 확장 제한 시간 (초)
+EXPANSION_MAX_ATTEMPTS = int(os.getenv("EXPANSION_MAX_ATTEMPTS", 2))  # 단계 하나 확장 최대 시도 횟수
+
+# 확장 결과로 단계에 채우는 필드
+EXPANSION_FIELDS = ("learning_content", "recommended_sites", "todos")
+
+
+# 뼈대 생성 지시문 (카테고리 공통, 시스템 메시지 맨 앞에 고정)
+SKELETON_INSTRUCTIONS = """너는 단계별 학습 가이드의 뼈대를 설계하는 교육 설계자야.
+
+사용자가 준 학습 주제와 검색 결과를 바탕으로 학습 단계 구성만 먼저 정해. 각 단계의 자세한 내용은 나중에 따로 작성하므로 지금은 쓰지 마.
+모든 내용은 자연스럽고 명확한 한국어로 작성해.
+
+출력 형식:
+반드시 JSON 형식으로 출력해야 해. 다음 구조를 따라야 해:
+
+1. topic: 학습 주제명
+2. category: 아래 [카테고리] 의 카테고리명
+3. total_duration_days: 총 학습 일수 (숫자)
+4. start_date: 시작일 (YYYY-MM-DD 형식)
+5. end_date: 종료일 (YYYY-MM-DD 형식)
+6. reviews_summary: 검색 결과의 학습자 후기 요약 (2-3문단)
+7. steps: 단계 배열, 각 단계는 step_number, title, duration_days, focus 만 포함. focus 는 그 단계에서 달성할 목표를 한 문장으로 쓴다.
+
+각 단계는 3~6단계로 구성하고, 앞 단계가 다음 단계의 기초가 되도록 순서를 정해.
+
+중요: JSON 형식만 출력하고, 추가 설명이나 텍스트는 포함하지 마.
+"""
+
+# 단계 확장 지시문 (카테고리 공통, 시스템 메시지 맨 앞에 고정)
+EXPANSION_INSTRUCTIONS = """너는 학습 가이드의 한 단계를 자세히 작성하는 교육 설계자야.
+
+전체 단계 구성과 검색 결과가 주어지고, 그중 [작성할 단계] 하나만 작성해. 다른 단계와 내용이 겹치지 않게 해.
+교재/사이트 이름은 가져온 언어 그대로 출력해도 되지만, 나머지 모든 내용은 자연스럽고 명확한 한국어로 작성해야 한다.
+
+중요:
+- learning_content 에는 최소 4개의 문장을 포함하고, “왜 이 단계가 중요한지, 어떤 전략으로 학습하면 좋은지, 실전에서 바로 써먹을 수 있는 꿀팁은 무엇인지”를 구체적으로 서술해.
+- 팁을 적을 때는 실제 상황을 가정해서 조언해(예: “주 3회 30분씩 OO 연습을 녹화해서 자세를 교정하라”).
+- todos 는 최소 5개 이상, 각 항목마다 구체적인 행동과 체크 가능한 기준(예: “~ 연습 3회 반복”, “~ 작성 후 리뷰”)을 포함해 작성해.
+- recommended_sites 는 검색 결과에 있는 사이트만 2~4개, 각 항목은 name 과 url 을 가진 객체로 작성해.
+
+출력 형식:
+반드시 learning_content, recommended_sites, todos 세 키만 가진 JSON 객체로 출력해. 추천 교재 항목은 절대 포함하지 마.
+
+리스트 내부 요소는 "완전한 문장 형태"만 포함하고, 각 요소는 하나의 문장만 포함한다.
+문장 앞에 dash(-), asterisk(*), middle dot(·), bullet(•) 등을 넣지 마라.
+JSON 형식만 출력하고, 추가 설명이나 텍스트는 포함하지 마.
+"""
+
+
+@lru_cache(maxsize=None)
+def _get_chain(category_name: str, stage: str):
+    """카테고리·단계(skeleton / expansion)별 체인 (LLM 클라이언트 재사용)"""
+    instructions = SKELETON_INSTRUCTIONS if stage == "skeleton" else EXPANSION_INSTRUCTIONS
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", build_system_message(category_name, CATEGORY_GUIDELINES[category_name], instructions)),
+        ("human", "{input}"),
+    ])
+    return prompt | get_base_llm()
+
+
+def _parse_skeleton(text: str, topic: str, category_name: str, start_date: str) -> Optional[Tuple[Guide, List[str]]]:
+    """
+    뼈대 JSON 을 Guide 로 정리 (단계가 없으면 None)
+
+    Guide 모델에는 단계 목표(focus) 필드가 없으므로 단계 순서대로 따로 반환합니다.
+    """
+    data = extract_json_from_text(text)
+    if not isinstance(data, dict):
+        return None
+    steps = [s for s in data.get("steps") or [] if isinstance(s, dict)][:SKELETON_MAX_STEPS]
+    if not steps:
+        return None
+
+    skeleton = Guide.from_raw({**data, "steps": steps, "topic": data.get("topic") or topic})
+    skeleton.category = category_name
+    skeleton.start_date = start_date
+    focuses = [str(step.get("focus") or "") for step in steps]
+    # 단계별 확장 요청에 날짜를 함께 알려주기 위해 미리 배치
+    return validate_and_fix_dates(skeleton), focuses
+
+
+def build_skeleton_query(topic: str, start_date: str, sources: str) -> str:
+    return f"학습 주제: {topic}\n시작 날짜: {start_date}\n\n{sources}"
+
+
+def build_expansion_query(skeleton: Guide, focuses: List[str], index: int, sources: str) -> str:
+    """
+    단계 확장 요청 문장 생성
+
+    같은 가이드의 확장 요청끼리 앞부분(단계 구성 + 검색 결과)이 같도록 작성할 단계는 맨 뒤에 둡니다.
+    """
+    outline = "\n".join(
+        f"{s.step_number}. {s.title} ({s.duration_days}일) - {focus}" for s, focus in zip(skeleton.steps, focuses)
+    )
+    step = skeleton.steps[index]
+    return (
+        f"학습 주제: {skeleton.topic}\n\n"
+        f"[전체 단계 구성]\n{outline}\n\n"
+        f"{sources}\n\n"
+        f"[작성할 단계]\n"
+        f"{step.step_number}단계: {step.title} ({step.duration_days}일, {step.start_date} ~ {step.end_date})\n"
+        f"목표: {focuses[index]}"
+    )
+
+
+async def _aexpand_step(
+    category_name: str,
+    skeleton: Guide,
+    focuses: List[str],
+    index: int,
+    sources: str,
+    config: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    단계 하나 확장
+
+    시간 초과·호출 실패·파싱 실패는 EXPANSION_MAX_ATTEMPTS 번까지 다시 시도합니다.
+    (LLM 호출 자체의 일시적 오류는 ResilientChatOpenAI 가 먼저 재시도합니다)
+
+    Returns:
+        확장 필드 딕셔너리 또는 None (모든 시도 실패 → 해당 단계는 뼈대만 유지)
+    """
+    chain = _get_chain(category_name, "expansion")
+    step = skeleton.steps[index]
+    query = build_expansion_query(skeleton, focuses, index, sources)
+    for attempt in range(1, EXPANSION_MAX_ATTEMPTS + 1):
+        try:
+            message = await asyncio.wait_for(chain.ainvoke({"input": query}, config=config), timeout=EXPANSION_TIMEOUT)
+        except Exception as e:
+            print(f"⚠️ {step.step_number}단계 확장 실패 ({attempt}/{EXPANSION_MAX_ATTEMPTS}): {type(e).__name__}: {e}")
+            continue
+
+        data = extract_json_from_text(message.content if isinstance(message.content, str) else "")
+        if isinstance(data, dict):
+            return {field: data[field] for field in EXPANSION_FIELDS if isinstance(data.get(field), list)}
+        print(f"⚠️ {step.step_number}단계 확장 결과를 파싱하지 못했습니다. ({attempt}/{EXPANSION_MAX_ATTEMPTS})")
+    return None
+
+
+def _merge_step(step: Step, expansion: Dict[str, Any]) -> Step:
+    """뼈대 단계에 확장 결과를 채운 단계 (확장 필드는 Step.from_raw 로 검증)"""
+    return Step.from_raw({**step.to_dict(), **expansion}, step.step_number)
+
+
+def merge_expansions(skeleton: Guide, expansions: List[Optional[Dict[str, Any]]]) -> Guide:
+    """뼈대와 단계별 확장 결과를 합쳐 날짜를 다시 정리한 Guide 반환 (실패한 단계는 뼈대만 유지)"""
+    steps = [_merge_step(step, expansion or {}) for step, expansion in zip(skeleton.steps, expansions)]
+    return validate_and_fix_dates(dataclasses.replace(skeleton, steps=steps))
+
+
+async def acreate_skeleton_guide(
+    category_name: str,
+    topic: str,
+    start_date: str = None,
+    on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    뼈대 생성 → 단계별 병렬 확장 → 병합으로 학습 가이드 생성
+
+    on_step 을 주면 단계 확장이 끝나는 순서대로 완성된 단계를 콜백으로 전달합니다.
+    콜백에서 난 예외는 경고만 출력하고 나머지 단계 확장은 계속합니다.
+
+    다시 시도해도 확장하지 못한 단계가 있으면 그 단계는 뼈대만 남기고 결과에 partial=True 를 붙입니다.
+    partial 결과는 가이드 캐시에 저장되지 않습니다.
+
+    Returns:
+        raw_output, category, token_usage 를 포함한 딕셔너리 (실패 시 error 포함)
+    """
+    if start_date is None:
+        start_date = datetime.now().strftime('%Y-%m-%d')
+
+    usage = TokenUsageHandler()
+    config = {"callbacks": [usage]}
+    try:
+        sources = format_search_results(await asearch_topic(category_name, topic))
+
+        message = await asyncio.wait_for(
+            _get_chain(category_name, "skeleton").ainvoke(
+                {"input": build_skeleton_query(topic, start_date, sources)}, config=config
+            ),
+            timeout=SKELETON_TIMEOUT,
+        )
+        parsed = _parse_skeleton(message.content, topic, category_name, start_date)
+        if parsed is None:
+            raise ValueError("학습 가이드 뼈대를 만들지 못했습니다.")
+        skeleton, focuses = parsed
+
+        async def expand(index: int) -> Optional[Dict[str, Any]]:
+            expansion = await _aexpand_step(category_name, skeleton, focuses, index, sources, config)
+            if on_step is not None:
+                try:
+                    on_step(_merge_step(skeleton.steps[index], expansion or {}).to_dict())
+                except Exception as e:
+                    print(f"⚠️ 단계 콜백 실행 중 오류: {type(e).__name__}: {e}")
+            return expansion
+
+        expansions = await asyncio.gather(*(expand(i) for i in range(len(skeleton.steps))))
+        guide = merge_expansions(skeleton, expansions)
+        result = _to_guide_result(category_name, {"output": json.dumps(guide.to_dict(), ensure_ascii=False)}, usage)
+        failed = [step.step_number for step, expansion in zip(skeleton.steps, expansions) if expansion is None]
+        if failed:
+            print(f"⚠️ {failed} 단계를 확장하지 못해 뼈대만 포함합니다. (캐시에 저장하지 않음)")
+            result["partial"] = True
+        return result
+    except Exception as e:
+        return _to_error_result(category_name, e, usage)
+
+
+def create_skeleton_guide(category_name: str, topic: str, start_date: str = None) -> Dict[str, Any]:
+    """acreate_skeleton_guide 의 동기 버전"""
+    return run_sync(acreate_skeleton_guide(category_name, topic, start_date))
@@ -0,0 +1,225 @@
+"""
+스키마 고정 구조화 출력 (structured output) 모드
+
+자유 형식 답변은 문장을 글자 단위로 나누거나 bullet 기호를 넣는 등 형식이 깨지는 경우가 있어,
+시스템 메시지에 금지 문구를 길게 넣고 파싱 후에도 목록을 다시 이어 붙여야 했습니다.
+이 모드는 가이드 JSON 스키마를 OpenAI 도구 호출(tool calling)로 강제하여 항상 타입이 맞는 JSON 을 받습니다.
+
+- 검색은 retrieval 모드와 같습니다 (카테고리별 검색어 동시 실행 + 압축, LLM 1회 호출).
+- 도구 호출이 실패하거나 결과가 없으면 자유 형식 답변 + parse_learning_guide 경로로 한 번 더 생성합니다.
+  (잘리거나 깨진 도구 호출 인자는 parse_learning_guide 의 복구에 맡깁니다)
+- STRUCTURED_OUTPUT_STRICT=1 이면 OpenAI strict 모드로 스키마를 강제합니다
+  (gpt-4o-2024-08-06 이후 모델 필요, gpt-4-turbo 는 일반 도구 호출).
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from langchain.prompts import ChatPromptTemplate
+
+from utils.async_runner import run_sync
+from utils.json_parser import StreamingStepParser
+
+from .category_agents import (
+    CATEGORY_GUIDELINES,
+    _to_error_result,
+    _to_guide_result,
+    build_system_message,
+    get_base_llm,
+)
+from .retrieval_guide import _get_generation_chain, asearch_topic, build_retrieval_query
+from .token_usage import TokenUsageHandler
+
+
+STRUCTURED_OUTPUT_STRICT = os.getenv("STRUCTURED_OUTPUT_STRICT", "0") == "1"
+
+GUIDE_TOOL_NAME = "learning_guide"
+
+
+def _string_list(description: str) -> Dict[str, Any]:
+    return {"type": "array", "description": description, "items": {"type": "string"}}
+
+
+# 학습 가이드 JSON 스키마 (strict 모드 조건: 모든 속성 required, additionalProperties false)
+GUIDE_SCHEMA: Dict[str, Any] = {
+    "title": GUIDE_TOOL_NAME,
+    "description": "단계별 학습 가이드를 제출한다.",
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string", "description": "학습 주제명"},
+        "category": {"type": "string", "description": "카테고리명"},
+        "total_duration_days": {"type": "integer", "description": "총 학습 일수"},
+        "start_date": {"type": "string", "description": "시작일 (YYYY-MM-DD)"},
+        "end_date": {"type": "string", "description": "종료일 (YYYY-MM-DD)"},
+        "reviews_summary": {"type": "string", "description": "학습자 후기 요약 (한국어 2-3문단)"},
+        "steps": {
+            "type": "array",
+            "description": "학습 단계 (3~6개, 날짜는 연속)",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "step_number": {"type": "integer"},
+                    "title": {"type": "string", "description": "단계 제목"},
+                    "duration_days": {"type": "integer", "description": "단계 학습 일수"},
+                    "start_date": {"type": "string", "description": "YYYY-MM-DD"},
+                    "end_date": {"type": "string", "description": "YYYY-MM-DD"},
+                    "learning_content": _string_list(
+                        "학습 내용. 4개 이상의 완전한 한국어 문장 (왜 중요한지, 학습 전략, 실전 팁)"
+                    ),
+                    "recommended_sites": {
+                        "type": "array",
+                        "description": "검색 결과에 있는 추천 사이트 2~4개",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "url": {"type": "string"},
+                            },
+                            "required": ["name", "url"],
+                            "additionalProperties": False,
+                        },
+                    },
+                    "todos": _string_list("투두리스트. 5개 이상, 구체적인 행동과 체크 가능한 기준 포함"),
+                },
+                "required": [
+                    "step_number", "title", "duration_days", "start_date", "end_date",
+                    "learning_content", "recommended_sites", "todos",
+                ],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["topic", "category", "total_duration_days", "start_date", "end_date", "reviews_summary", "steps"],
+    "additionalProperties": False,
+}
+
+# 구조화 출력용 공통 지시문 (형식은 스키마가 강제하므로 내용 지시만 포함)
+STRUCTURED_INSTRUCTIONS = """너는 단계별 학습 가이드를 만드는 교육 설계자야.
+
+사용자가 배우고 싶은 주제와 검색 결과를 바탕으로 학습 가이드를 작성하고, 반드시 learning_guide 도구로 제출해.
+교재/사이트 이름은 가져온 언어 그대로 써도 되지만, 나머지 모든 내용(학습 내용, 투두리스트, 후기 요약 등)은 자연스럽고 명확한 한국어로 작성해야 한다.
+
+중요:
+- 각 단계의 learning_content 에는 “왜 이 단계가 중요한지, 어떤 전략으로 학습하면 좋은지, 실전에서 바로 써먹을 수 있는 꿀팁은 무엇인지”를 구체적으로 서술해.
+- 팁을 적을 때는 실제 상황을 가정해서 조언해(예: “주 3회 30분씩 OO 연습을 녹화해서 자세를 교정하라”).
+- 투두리스트 각 항목에는 구체적인 행동과 체크 가능한 기준(예: “~ 연습 3회 반복”, “~ 작성 후 리뷰”)을 포함해.
+- 각 단계는 3~6단계로 구성하고, 날짜는 시작 날짜부터 연속적으로 계산해.
+"""
+
+# 구조화 출력 성공 / 자유 형식 대체 횟수
+_stats = {"structured": 0, "fallback": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_structured_output_stats() -> Dict[str, Any]:
+    """구조화 출력 성공 / 자유 형식 대체 횟수"""
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["structured"] + stats["fallback"]
+    stats["fallback_ratio"] = round(stats["fallback"] / total, 3) if total else 0.0
+    return stats
+
+
+@lru_cache(maxsize=None)
+def _get_structured_chain(category_name: str):
+    """카테고리별 구조화 출력 체인 (learning_guide 도구 호출 강제)"""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", build_system_message(category_name, CATEGORY_GUIDELINES[category_name], STRUCTURED_INSTRUCTIONS)),
+        ("human", "{input}"),
+    ])
+    options = {"strict": True} if STRUCTURED_OUTPUT_STRICT else {}
+    llm = get_base_llm().bind_tools([GUIDE_SCHEMA], tool_choice=GUIDE_TOOL_NAME, **options)
+    return prompt | llm
+
+
+def _tool_arguments(message) -> Optional[str]:
+    """도구 호출 인자를 JSON 문자열로 반환 (인자가 깨졌으면 원본 문자열, 호출이 없으면 None)"""
+    for call in getattr(message, "tool_calls", None) or []:
+        if call.get("name") == GUIDE_TOOL_NAME and isinstance(call.get("args"), dict) and call["args"].get("steps"):
+            return json.dumps(call["args"], ensure_ascii=False)
+    # 잘리거나 깨진 인자는 parse_learning_guide 의 복구에 맡김
+    for call in getattr(message, "invalid_tool_calls", None) or []:
+        if call.get("name") == GUIDE_TOOL_NAME and call.get("args"):
+            return call["args"]
+    return None
+
+
+async def acreate_structured_guide(
+    category_name: str,
+    topic: str,
+    start_date: str = None,
+    on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    검색 → 스키마 고정 도구 호출 1회로 학습 가이드 생성
+
+    on_step 을 주면 도구 호출 인자를 토큰 단위로 받아 단계가 완성될 때마다 콜백을 호출합니다.
+    구조화 출력이 중간에 실패해 자유 형식으로 다시 생성하면, 다시 생성한 답변도 새 파서로 스트리밍하여
+    1단계부터 다시 on_step 을 호출합니다. 이때 그 전에 전달된 단계는 무효이며 반환되는 가이드와 다를 수 있습니다
+    (호출 측은 step_number 가 1 로 돌아오면 이전 단계를 버리면 됩니다).
+
+    Returns:
+        raw_output(가이드 JSON), category, token_usage 를 포함한 딕셔너리 (실패 시 error 포함)
+    """
+    if start_date is None:
+        start_date = datetime.now().strftime('%Y-%m-%d')
+
+    usage = TokenUsageHandler()
+    config = {"callbacks": [usage]}
+    try:
+        results = await asearch_topic(category_name, topic)
+        inputs = {"input": build_retrieval_query(topic, start_date, results)}
+
+        output = None
+        streamed = 0
+        try:
+            chain = _get_structured_chain(category_name)
+            if on_step is None:
+                message = await chain.ainvoke(inputs, config=config)
+            else:
+                parser = StreamingStepParser(on_step=on_step)
+                message = None
+                async for chunk in chain.astream(inputs, config=config):
+                    for call_chunk in chunk.tool_call_chunks:
+                        if call_chunk.get("args"):
+                            streamed += len(parser.feed(call_chunk["args"]))
+                    message = chunk if message is None else message + chunk
+            output = _tool_arguments(message)
+        except Exception as e:
+            print(f"⚠️ 구조화 출력 실패: {type(e).__name__}: {e}")
+
+        if output is not None:
+            _count("structured")
+            return _to_guide_result(category_name, {"output": output}, usage)
+
+        # 자유 형식 답변 + parse_learning_guide 경로로 대체
+        _count("fallback")
+        print("⚠️ 구조화 출력을 받지 못해 일반 출력으로 다시 생성합니다.")
+        fallback_chain = _get_generation_chain(category_name)
+        if on_step is None:
+            message = await fallback_chain.ainvoke(inputs, config=config)
+            return _to_guide_result(category_name, {"output": message.content}, usage)
+
+        if streamed:
+            print(f"⚠️ 앞서 전달한 {streamed}개 단계는 무효입니다. 다시 생성한 단계를 1단계부터 전달합니다.")
+        parser = StreamingStepParser(on_step=on_step)
+        async for chunk in fallback_chain.astream(inputs, config=config):
+            if isinstance(chunk.content, str) and chunk.content:
+                parser.feed(chunk.content)
+        return _to_guide_result(category_name, {"output": parser.text}, usage)
+    except Exception as e:
+        return _to_error_result(category_name, e, usage)
+
+
+def create_structured_guide(category_name: str, topic: str, start_date: str = None) -> Dict[str, Any]:
+    """acreate_structured_guide 의 동기 버전"""
+    return run_sync(acreate_structured_guide(category_name, topic, start_date))
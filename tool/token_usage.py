@@ -0,0 +1,64 @@
+"""
+요청별 토큰 사용량 집계
+
+LangChain 콜백으로 한 번의 Agent 실행 동안 호출된 모든 LLM 응답의 토큰 수를 합산합니다.
+provider 프롬프트 캐시에서 읽은 토큰(cached)을 따로 집계하여 캐시 적중 정도를 확인할 수 있습니다.
+"""
+
+import threading
+from typing import Any, Dict
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """LLM 호출마다 prompt / cached / completion 토큰 수를 누적하는 콜백"""
+
+    def __init__(self):
+        super().__init__()
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.llm_calls = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        prompt, cached, completion = _usage_from_result(response)
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt
+            self.cached_tokens += cached
+            self.completion_tokens += completion
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "llm_calls": self.llm_calls,
+        }
+
+
+def _usage_from_result(response: LLMResult):
+    """
+    응답에서 (prompt, cached, completion) 토큰 수 추출
+
+    스트리밍 응답도 포함하기 위해 메시지의 usage_metadata 를 우선 사용하고,
+    없으면 llm_output 의 OpenAI token_usage 를 사용합니다.
+    """
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                details = usage.get("input_token_details") or {}
+                return usage.get("input_tokens", 0), details.get("cache_read", 0) or 0, usage.get("output_tokens", 0)
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0) or 0,
+        details.get("cached_tokens", 0) or 0,
+        token_usage.get("completion_tokens", 0) or 0,
+    )
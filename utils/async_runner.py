@@ -0,0 +1,48 @@
+"""
+비동기 실행 유틸리티
+
+동기 코드에서 코루틴을 실행하기 위한 백그라운드 이벤트 루프입니다.
+호출마다 asyncio.run() 으로 새 루프를 만들면 재사용되는 비동기 HTTP 클라이언트가
+닫힌 루프에 묶이므로, 프로세스 전체에서 하나의 루프를 공유합니다.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 이벤트 루프 (없으면 데몬 스레드에서 시작)"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="async-runner", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """
+    코루틴을 백그라운드 루프에서 실행하고 결과를 기다림
+
+    Args:
+        coro: 실행할 코루틴
+
+    Returns:
+        코루틴의 반환값
+    """
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("백그라운드 루프 안에서는 run_sync 대신 await 를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -0,0 +1,140 @@
+"""
+디스크 캐시 유틸리티
+
+SQLite 기반의 영구 캐시입니다. TTL, LRU 방식의 크기 제한,
+stale-while-revalidate 를 위한 만료 항목 구분과 hit/miss 통계를 제공합니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+# 캐시 파일 기본 위치 (GUIDE_CACHE_DIR 환경변수로 변경 가능)
+DEFAULT_CACHE_DIR = Path(os.getenv("GUIDE_CACHE_DIR", Path(__file__).parent.parent / ".cache"))
+
+
+def normalize_cache_text(text: str) -> str:
+    """캐시 키용 문자열 정규화 (유니코드 NFC, 소문자, 공백 정리)"""
+    text = unicodedata.normalize("NFC", str(text))
+    return " ".join(text.lower().split())
+
+
+class SQLiteCache:
+    """
+    SQLite 기반 TTL 캐시
+
+    - ttl 이 지난 항목은 stale 로 표시되어 반환됩니다 (호출 측에서 백그라운드 갱신).
+    - ttl + stale_ttl 이 지난 항목은 miss 로 처리됩니다.
+    - max_entries 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_entries: int = 10000,
+        stale_ttl: float = 0,
+        cache_dir: Optional[Path] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.path = Path(cache_dir or DEFAULT_CACHE_DIR) / f"{name}.sqlite3"
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        캐시 조회
+
+        Returns:
+            (값, stale 여부) 또는 None (miss)
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            age = now - created_at
+            if age > self.ttl + self.stale_ttl:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            stale = age > self.ttl
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+        return json.loads(value), stale
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (크기 초과 시 LRU 삭제)"""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """hit/miss 통계"""
+        lookups = self.hits + self.stale_hits + self.misses
+        with self._lock:
+            size = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "size": size,
+        }
@@ -5,10 +5,11 @@
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any
 
+from .guide_model import Guide
 
-def validate_and_fix_dates(guide: Dict[str, Any]) -> Dict[str, Any]:
+
+def validate_and_fix_dates(guide: Guide) -> Guide:
     """
     학습 가이드의 날짜가 논리적으로 맞는지 검증하고 수정
     
@@ -17,65 +18,38 @@ def validate_and_fix_dates(guide: Dict[str, Any]) -> Dict[str, Any]:
     2. 단계들이 연속적인지 (이전 단계 종료일 다음날 = 다음 단계 시작일)
     3. 총 학습 일수가 단계별 일수의 합과 일치하는지
     
+    duration_days 는 Guide.from_raw() 에서 이미 검증(1일 이상)되었으므로 단계 날짜만 다시 배치합니다.
+    
     Args:
-        guide: 학습 가이드 딕셔너리
+        guide: 학습 가이드
     
     Returns:
-        날짜가 수정된 학습 가이드 딕셔너리
+        날짜가 수정된 같은 Guide 객체
     """
-    if "error" in guide or "steps" not in guide:
-        return guide
-    
-    steps = guide.get("steps", [])
-    if not steps:
+    if not guide.steps:
         return guide
-    
-    # 첫 번째 단계의 시작일을 가이드의 시작일로 설정
-    start_date_str = guide.get("start_date") or steps[0].get("start_date")
-    
-    if not start_date_str:
-        # 시작일이 없으면 오늘 날짜 사용
-        start_date = datetime.now()
-        start_date_str = start_date.strftime("%Y-%m-%d")
-    
+
+    # 첫 번째 단계의 시작일을 가이드의 시작일로 설정 (없거나 형식이 잘못되었으면 오늘)
     try:
-        start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+        start_date = datetime.strptime(guide.start_date or guide.steps[0].start_date, "%Y-%m-%d")
     except (ValueError, TypeError):
-        # 날짜 형식이 잘못되었으면 오늘 날짜 사용
         start_date = datetime.now()
-        start_date_str = start_date.strftime("%Y-%m-%d")
-    
-    # 각 단계의 날짜를 검증하고 수정
+    guide.start_date = start_date.strftime("%Y-%m-%d")
+
     current_date = start_date
     total_days = 0
-    
-    for i, step in enumerate(steps, 1):
-        # 시작일 설정
-        step_start = current_date
-        
-        # 기간 일수 가져오기 (기본값 7일)
-        duration = step.get("duration_days", 7)
-        if not isinstance(duration, (int, float)) or duration < 1:
-            duration = 7
-        
+    for i, step in enumerate(guide.steps, 1):
         # 종료일 계산 (시작일 + 기간 - 1일, 당일 포함)
-        step_end = step_start + timedelta(days=int(duration) - 1)
-        
-        # 단계 정보 업데이트
-        step["start_date"] = step_start.strftime("%Y-%m-%d")
-        step["end_date"] = step_end.strftime("%Y-%m-%d")
-        step["duration_days"] = int(duration)
-        step["step_number"] = i
-        
+        step_end = current_date + timedelta(days=step.duration_days - 1)
+        step.start_date = current_date.strftime("%Y-%m-%d")
+        step.end_date = step_end.strftime("%Y-%m-%d")
+        step.step_number = i
         # 다음 단계 시작일 (현재 단계 종료일 다음날)
         current_date = step_end + timedelta(days=1)
-        total_days += int(duration)
-    
-    # 가이드 날짜 정보 업데이트
-    guide["start_date"] = start_date_str
-    guide["end_date"] = steps[-1]["end_date"]
-    guide["total_duration_days"] = total_days
-    
+        total_days += step.duration_days
+
+    guide.end_date = guide.steps[-1].end_date
+    guide.total_duration_days = total_days
     return guide
 
 
@@ -0,0 +1,335 @@
+"""
+경량 내보내기 (Markdown, HTML, JSONL)
+
+Word 외의 출력 형식을 스트리밍 방식으로 작성합니다. 문서 전체를 메모리에 만들지 않고
+guide_layout 의 Block 을 하나씩 텍스트 스트림에 기록하며, python-docx 를 불러오지 않습니다.
+
+- markdown: 카드 제목은 ##, 목록은 -, 하이퍼링크는 [이름](URL)
+- html:     Word 카드형 디자인과 같은 색·크기의 단독 HTML 파일
+- jsonl:    검색 인덱스용. 첫 줄은 가이드 정보, 이후 한 줄에 단계 하나
+"""
+
+import io
+import json
+from datetime import datetime
+from html import escape as html_escape
+from typing import IO, Any, Dict, Iterable, Optional, TextIO
+
+from .guide_layout import Run, iter_guide_blocks
+from .guide_model import Guide, as_guide
+
+
+# 형식 이름 → 파일 확장자
+EXPORT_FORMATS: Dict[str, str] = {
+    "docx": ".docx",
+    "markdown": ".md",
+    "html": ".html",
+    "jsonl": ".jsonl",
+}
+
+# 형식 이름 → HTTP Content-Type
+EXPORT_MEDIA_TYPES: Dict[str, str] = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "markdown": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+def build_guide_filename(guide, fmt: str = "docx") -> str:
+    """기본 파일명: {주제}_학습가이드_{타임스탬프}{확장자}"""
+    topic = guide.topic if isinstance(guide, Guide) else guide.get("topic", "학습가이드")
+    topic = topic.replace(" ", "_")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{topic}_학습가이드_{timestamp}{EXPORT_FORMATS[fmt]}"
+
+
+def _safe_url(url: str) -> Optional[str]:
+    # 웹 뷰·Markdown 뷰어에 그대로 노출되므로 http(s)/mailto 링크만 허용
+    if url.strip().lower().startswith(("http://", "https://", "mailto:")):
+        return url.strip()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Markdown
+# ---------------------------------------------------------------------------
+
+_MD_ESCAPE = str.maketrans({ch: "\\" + ch for ch in "\\`*_[]<>"})
+
+
+def _md_runs(runs: Iterable[Run]) -> str:
+    parts = []
+    for run in runs:
+        text = run.text.translate(_MD_ESCAPE)
+        url = _safe_url(run.url) if run.url else None
+        if url:
+            parts.append(f"[{text}](<{url.replace('>', '%3E')}>)")
+        elif run.bold and text.strip():
+            # 앞뒤 공백이 ** 안에 있으면 강조로 인식되지 않음
+            lead = text[: len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()):]
+            parts.append(f"{lead}**{text.strip()}**{trail}")
+        else:
+            parts.append(text)
+    return "".join(parts).strip()
+
+
+def write_markdown(guide: Guide, stream: TextIO) -> None:
+    """학습 가이드를 Markdown 으로 스트림에 기록"""
+    in_list = False
+    for block in iter_guide_blocks(guide):
+        if not block.runs:
+            continue
+
+        is_list = block.style in ("List Bullet", "List Bullet 2")
+        if in_list and not is_list:
+            stream.write("\n")
+        in_list = is_list
+
+        kind, text = block.kind, _md_runs(block.runs)
+        if kind == "title":
+            stream.write(f"# {text}\n\n")
+        elif kind == "subtitle":
+            stream.write(f"*{text}*\n\n")
+        elif kind == "divider":
+            stream.write("---\n\n")
+        elif kind == "card_header":
+            stream.write(f"## {text}\n\n")
+        elif block.style == "Heading 2":
+            stream.write(f"### {text}\n\n")
+        elif block.style == "List Bullet":
+            stream.write(f"- {text}\n")
+        elif block.style == "List Bullet 2":
+            stream.write(f"  - {text.lstrip('• ')}\n")
+        else:
+            stream.write(f"{text}\n\n")
+
+
+# ---------------------------------------------------------------------------
+# HTML (카드형)
+# ---------------------------------------------------------------------------
+
+# word_generator / ooxml_writer 의 서식과 같은 값
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body {{ font-family: "Malgun Gothic", "맑은 고딕", sans-serif; font-size: 11pt; line-height: 1.5;
+       background: #f4f6f9; color: #222; margin: 0; padding: 24px; }}
+main {{ max-width: 760px; margin: 0 auto; }}
+.card {{ background: #fff; border-radius: 12px; box-shadow: 0 1px 4px rgba(0, 0, 0, .08);
+         padding: 16px 28px 20px; margin: 0 0 24px; }}
+.card > h2 {{ font-size: 20pt; color: #0066CC; margin: 0 0 6pt; padding-bottom: 10pt;
+              border-bottom: 2px solid #0066CC; }}
+.cover {{ text-align: center; }}
+.cover h1 {{ font-size: 32pt; color: #0050A0; margin: 12pt 0 4pt; }}
+.cover .subtitle {{ font-size: 18pt; color: #646464; margin: 0; }}
+h3 {{ font-size: 13pt; color: #4F81BD; margin: 10pt 0 0; }}
+p {{ margin: 0 0 6pt; }}
+ul {{ margin: 0 0 8pt; padding-left: 24px; }}
+ul ul {{ margin: 0; }}
+a {{ color: #0066CC; text-decoration: underline; }}
+</style>
+</head>
+<body>
+<main>
+"""
+_HTML_TAIL = "</main>\n</body>\n</html>\n"
+
+
+def _html_runs(runs: Iterable[Run]) -> str:
+    parts = []
+    for run in runs:
+        text = html_escape(run.text)
+        url = _safe_url(run.url) if run.url else None
+        if url:
+            parts.append(f'<a href="{html_escape(url)}" target="_blank" rel="noopener">{text}</a>')
+        elif run.bold:
+            parts.append(f"<strong>{text}</strong>")
+        else:
+            parts.append(text)
+    return "".join(parts)
+
+
+def write_html(guide: Guide, stream: TextIO) -> None:
+    """학습 가이드를 카드형 단독 HTML 로 스트림에 기록"""
+    stream.write(_HTML_HEAD.format(title=html_escape(guide.topic)))
+    in_card = False
+    list_depth = 0
+
+    def set_list_depth(depth: int) -> None:
+        nonlocal list_depth
+        while list_depth < depth:
+            stream.write("<ul>\n")
+            list_depth += 1
+        while list_depth > depth:
+            stream.write("</ul>\n")
+            list_depth -= 1
+
+    def open_card(css_class: str = "card") -> None:
+        nonlocal in_card
+        close_card()
+        stream.write(f'<section class="{css_class}">\n')
+        in_card = True
+
+    def close_card() -> None:
+        nonlocal in_card
+        set_list_depth(0)
+        if in_card:
+            stream.write("</section>\n")
+            in_card = False
+
+    for block in iter_guide_blocks(guide):
+        kind = block.kind
+        if kind == "divider":
+            close_card()
+            continue
+        if not block.runs:
+            continue
+
+        html = _html_runs(block.runs)
+        if kind == "title":
+            open_card("card cover")
+            stream.write(f"<h1>{html}</h1>\n")
+            continue
+        if kind == "card_header":
+            open_card()
+            stream.write(f"<h2>{html}</h2>\n")
+            continue
+
+        if not in_card:
+            open_card()
+        if kind == "subtitle":
+            stream.write(f'<p class="subtitle">{html}</p>\n')
+        elif block.style == "List Bullet":
+            set_list_depth(1)
+            stream.write(f"<li>{html}</li>\n")
+        elif block.style == "List Bullet 2":
+            set_list_depth(2)
+            stream.write(f"<li>{html}</li>\n")
+        else:
+            set_list_depth(0)
+            if block.style == "Heading 2":
+                stream.write(f"<h3>{html}</h3>\n")
+            else:
+                stream.write(f"<p>{html}</p>\n")
+
+    close_card()
+    stream.write(_HTML_TAIL)
+
+
+# ---------------------------------------------------------------------------
+# JSONL (검색 인덱스용)
+# ---------------------------------------------------------------------------
+
+def write_jsonl(guide: Guide, stream: TextIO) -> None:
+    """첫 줄에 가이드 정보, 이후 한 줄에 단계 하나씩 기록"""
+    header: Dict[str, Any] = {
+        "type": "guide",
+        "topic": guide.topic,
+        "category": guide.category,
+        "total_duration_days": guide.total_duration_days,
+        "start_date": guide.start_date,
+        "end_date": guide.end_date,
+        "reviews_summary": guide.reviews_summary,
+        "step_count": len(guide.steps),
+        "estimated_cost": guide.estimated_cost.to_dict(),
+    }
+    stream.write(json.dumps(header, ensure_ascii=False) + "\n")
+    for step in guide.steps:
+        record = {"type": "step", "topic": guide.topic, "category": guide.category}
+        record.update(step.to_dict())
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+TEXT_WRITERS = {
+    "markdown": write_markdown,
+    "html": write_html,
+    "jsonl": write_jsonl,
+}
+
+
+def write_learning_guide(guide, stream: IO[bytes], fmt: str = "docx") -> bool:
+    """
+    학습 가이드를 지정한 형식으로 호출자의 바이너리 스트림에 기록 (임시 파일 없음)
+
+    텍스트 형식은 UTF-8 로 인코딩해 기록하며, 기록 후 스트림을 닫지 않습니다.
+
+    Args:
+        guide: Guide 또는 가이드 딕셔너리
+        stream: 쓰기 가능한 바이너리 스트림
+        fmt: "docx", "markdown", "html", "jsonl"
+
+    Returns:
+        기록 여부 (가이드 생성 실패면 False)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+    if fmt == "docx":
+        # python-docx 는 Word 출력이 필요할 때만 불러옴
+        from .word_generator import write_learning_guide_to_stream
+        return write_learning_guide_to_stream(guide, stream)
+
+    guide = as_guide(guide)
+    if guide is None:
+        print("❌ 가이드가 생성되지 않아 파일을 만들 수 없습니다.")
+        return False
+
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8", newline="\n", write_through=True)
+    try:
+        TEXT_WRITERS[fmt](guide, text_stream)
+        text_stream.flush()
+    finally:
+        # 래퍼가 닫히면서 호출자의 스트림까지 닫지 않도록 분리
+        text_stream.detach()
+    return True
+
+
+def render_learning_guide(guide, fmt: str = "docx") -> Optional[bytes]:
+    """
+    학습 가이드를 지정한 형식의 바이트로 렌더링 (디스크를 거치지 않음)
+
+    Returns:
+        렌더링된 바이트 또는 None (가이드 생성 실패)
+    """
+    buffer = io.BytesIO()
+    if not write_learning_guide(guide, buffer, fmt=fmt):
+        return None
+    return buffer.getvalue()
+
+
+def save_learning_guide(guide, filename: Optional[str] = None, fmt: str = "docx") -> Optional[str]:
+    """
+    학습 가이드를 지정한 형식의 파일로 저장
+
+    Args:
+        guide: Guide 또는 가이드 딕셔너리
+        filename: 저장할 파일명 (None이면 build_guide_filename())
+        fmt: "docx", "markdown", "html", "jsonl"
+
+    Returns:
+        저장된 파일명 또는 None (가이드 생성 실패)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+    if fmt == "docx":
+        # python-docx 는 Word 출력이 필요할 때만 불러옴
+        from .word_generator import save_learning_guide_to_word
+        return save_learning_guide_to_word(guide, filename)
+
+    guide = as_guide(guide)
+    if guide is None:
+        print("❌ 가이드가 생성되지 않아 파일을 만들 수 없습니다.")
+        return None
+
+    if filename is None:
+        filename = build_guide_filename(guide, fmt)
+
+    with open(filename, "w", encoding="utf-8", newline="\n") as f:
+        TEXT_WRITERS[fmt](guide, f)
+    print(f"✅ {fmt} 파일이 저장되었습니다: {filename}")
+    return filename
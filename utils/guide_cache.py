@@ -0,0 +1,69 @@
+"""
+학습 가이드 캐시 유틸리티
+
+파싱된 학습 가이드를 날짜·가격 정보를 제외한 형태로 저장하고,
+같은 주제를 다시 요청하면 요청한 시작일에 맞춰 날짜를 재계산하여 반환합니다.
+
+- 키는 (정규화된 주제, 생성 모드, 프롬프트 버전) 이므로 카테고리 분류 전에 조회할 수 있습니다.
+- 가격은 가격 캐시(price_fetcher)의 TTL 을 따르도록 저장하지 않고, 호출자가 캐시 적중 시 다시 반영합니다.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from .cache import SQLiteCache, normalize_cache_text
+from .date_validator import validate_and_fix_dates
+from .guide_model import Guide
+
+
+# 가이드 캐시 설정
+GUIDE_CACHE_TTL = float(os.getenv("GUIDE_CACHE_TTL", 7 * 24 * 3600))
+GUIDE_CACHE_MAX_ENTRIES = int(os.getenv("GUIDE_CACHE_MAX_ENTRIES", 2000))
+
+guide_cache = SQLiteCache("guides", ttl=GUIDE_CACHE_TTL, max_entries=GUIDE_CACHE_MAX_ENTRIES)
+
+# 요청마다 달라지는 필드 (캐시에 저장하지 않음)
+_DATE_FIELDS = ("start_date", "end_date")
+_VOLATILE_FIELDS = _DATE_FIELDS + ("estimated_cost",)
+
+
+def guide_cache_key(topic: str, generation_mode: str, prompt_version: str) -> str:
+    """(정규화된 주제, 생성 모드, 프롬프트 버전) 캐시 키"""
+    return f"{normalize_cache_text(topic)}|{generation_mode}|{prompt_version}"
+
+
+def strip_volatile(guide: Guide) -> Dict[str, Any]:
+    """가이드를 날짜·가격 필드를 제외한 딕셔너리로 변환"""
+    stripped = {k: v for k, v in guide.to_dict().items() if k not in _VOLATILE_FIELDS}
+    stripped["steps"] = [
+        {k: v for k, v in step.items() if k not in _DATE_FIELDS}
+        for step in stripped["steps"]
+    ]
+    return stripped
+
+
+def get_cached_guide(topic: str, generation_mode: str, start_date: str, prompt_version: str) -> Optional[Guide]:
+    """
+    캐시된 가이드를 요청한 시작일 기준으로 재배치하여 반환
+
+    Args:
+        topic: 학습 주제
+        generation_mode: 가이드를 만든 생성 모드
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        prompt_version: Agent 프롬프트 버전
+
+    Returns:
+        날짜가 재계산되고 가격 정보가 비어 있는 학습 가이드 또는 None (캐시 없음)
+    """
+    cached = guide_cache.get(guide_cache_key(topic, generation_mode, prompt_version))
+    if cached is None:
+        return None
+
+    guide = Guide.from_dict(cached[0])
+    guide.start_date = start_date
+    return validate_and_fix_dates(guide)
+
+
+def store_guide(topic: str, generation_mode: str, guide: Guide, prompt_version: str) -> None:
+    """완성된 가이드를 날짜·가격 정보 없이 캐시에 저장"""
+    guide_cache.set(guide_cache_key(topic, generation_mode, prompt_version), strip_volatile(guide))
@@ -0,0 +1,193 @@
+"""
+학습 가이드 문서 레이아웃
+
+카드형 Word 문서의 문단 구성을 렌더링 방식과 무관한 Block 목록으로 정의합니다.
+python-docx 백엔드와 OOXML 직접 작성 백엔드가 같은 레이아웃을 공유하므로
+두 백엔드의 출력이 시각적으로 동일하게 유지됩니다.
+"""
+
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+from .guide_model import CostItem, Guide
+
+
+DIVIDER_TEXT = "━" * 35
+
+
+class Run(NamedTuple):
+    text: str
+    bold: bool = False
+    url: str = ""  # 값이 있으면 하이퍼링크
+
+
+class Block(NamedTuple):
+    """
+    문단 하나
+
+    kind:
+        title       - 표지 제목
+        subtitle    - 표지 부제(카테고리)
+        divider     - 가운데 정렬 구분선
+        card_header - 카드 제목 + 구분선
+        para        - 일반 문단 (style: None, "List Bullet", "List Bullet 2", "Heading 2")
+    """
+    kind: str
+    runs: Tuple[Run, ...] = ()
+    style: Optional[str] = None
+
+
+BLANK = Block("para")
+DIVIDER = Block("divider", (Run(DIVIDER_TEXT),))
+
+
+def text_block(text: str, style: Optional[str] = None) -> Block:
+    return Block("para", (Run(text),) if text else (), style)
+
+
+def clean_text(text: Any) -> str:
+    if not isinstance(text, str):
+        return str(text)
+    text = re.sub(r"\s*\n\s*", " ", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip()
+
+
+def normalize_learning_items(items: Any) -> List[str]:
+    if not isinstance(items, list):
+        return [clean_text(items)]
+
+    cleaned = []
+    for it in items:
+        if not isinstance(it, str):
+            continue
+        t = it.strip()
+        if t.startswith(("•", "-", "*")):
+            t = t[1:].strip()
+        cleaned.append(t)
+
+    if len(cleaned) > 1 and all(len(x) == 1 for x in cleaned):
+        full_text = "".join(cleaned)
+        sentences = re.split(r'(?<=[\.\?\!,])\s*', full_text)
+        return [s.strip() for s in sentences if s.strip()]
+
+    return cleaned
+
+
+def select_recommended_items(breakdown: List[CostItem], category: str) -> List[CostItem]:
+    if not breakdown:
+        return []
+    if category in ("Academic / STEM", "Career / Tech Skills"):
+        primary = [item for item in breakdown if item.type == "books"]
+        secondary = [item for item in breakdown if item.type != "books"]
+    else:
+        primary = [item for item in breakdown if item.type != "books"]
+        secondary = [item for item in breakdown if item.type == "books"]
+    return (primary + secondary)[:3]
+
+
+def iter_guide_blocks(guide: Guide) -> Iterator[Block]:
+    """
+    카드형 학습 가이드 문서의 문단을 순서대로 생성
+
+    Args:
+        guide: 학습 가이드
+
+    Yields:
+        Block
+    """
+    # 표지 카드
+    yield Block("title", (Run(f"📘 {guide.topic}"),))
+    yield Block("subtitle", (Run(guide.category),))
+    yield DIVIDER
+    yield BLANK
+
+    # 학습 개요 카드
+    yield Block("card_header", (Run("📅 학습 개요"),))
+    yield text_block(f"• 학습 기간: {guide.start_date or 'N/A'} ~ {guide.end_date or 'N/A'}")
+    yield text_block(f"• 총 학습 일수: {guide.total_duration_days}일")
+    yield DIVIDER
+    yield BLANK
+
+    # 비용 카드 + 추천 Item
+    cost = guide.estimated_cost
+    yield Block("card_header", (Run("💰 예상 비용 요약"),))
+    yield text_block(f"• 교재: {cost.books:,}원")
+    yield text_block(f"• 강의: {cost.courses:,}원")
+    yield text_block(f"• 장비/기타: {cost.equipment:,}원")
+    yield text_block(f"• 총합: {cost.total:,}원")
+    yield DIVIDER
+    yield BLANK
+    if cost.breakdown:
+        yield BLANK
+        yield text_block("세부 비용", "Heading 2")
+        for item in cost.breakdown:
+            yield Block(
+                "para",
+                (Run(f"{item.name}: ", bold=True), Run(f"{item.average_price:,}{item.currency}")),
+                "List Bullet",
+            )
+            if item.sources:
+                src = item.sources[0]
+                yield text_block(f"   • 출처: {src.title} ({src.url})", "List Bullet 2")
+
+        recommendations = select_recommended_items(cost.breakdown, guide.category)
+        if recommendations:
+            yield Block("card_header", (Run("✨ 추천 Item"),))
+            for idx, rec in enumerate(recommendations, 1):
+                yield Block(
+                    "para",
+                    (Run(f"{idx}. {rec.name or '추천 아이템'}", bold=True), Run(f" - 약 {rec.average_price:,}{rec.currency}")),
+                )
+                if rec.sources:
+                    src = rec.sources[0]
+                    yield Block("para", (Run("참고: "), Run(src.title, url=src.url)), "List Bullet 2")
+
+    yield BLANK
+
+    # Step 카드
+    for step in guide.steps:
+        yield BLANK
+        yield BLANK
+        yield BLANK
+        yield Block("card_header", (Run(f"🔵 Step {step.step_number}: {clean_text(step.title)}"),))
+        yield Block(
+            "para",
+            (
+                Run("📅 기간: ", bold=True),
+                Run(f"{step.start_date or 'N/A'} ~ {step.end_date or 'N/A'} ({step.duration_days}일)"),
+            ),
+        )
+
+        # 학습 내용
+        contents = normalize_learning_items(step.learning_content)
+        if contents:
+            yield text_block("📚 학습 내용")
+            for item in contents:
+                yield text_block(clean_text(item), "List Bullet")
+            yield BLANK
+
+        # 참고 사이트
+        if step.recommended_sites:
+            yield text_block("🌐 참고 자료")
+            for site in step.recommended_sites:
+                name = clean_text(site.name)
+                if site.url:
+                    yield Block("para", (Run("🔗 "), Run(name or site.url, url=site.url)))
+                else:
+                    yield Block("para", (Run("🔗 "), Run(name)))
+            yield BLANK
+
+        # 투두리스트
+        todos = normalize_learning_items(step.todos)
+        if todos:
+            yield text_block("📝 To-do List")
+            for todo in todos:
+                yield text_block(f"☐ {clean_text(todo)}")
+
+        yield BLANK
+
+    # 후기 카드
+    if guide.reviews_summary:
+        yield Block("card_header", (Run("📌 학습 후기 요약"),))
+        yield text_block(clean_text(guide.reviews_summary))
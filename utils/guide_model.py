@@ -0,0 +1,265 @@
+"""
+학습 가이드 데이터 모델
+
+파이프라인 단계 사이에서 주고받는 학습 가이드를 __slots__ 데이터클래스로 표현합니다.
+Guide.from_raw() 가 LLM 출력(JSON 딕셔너리)을 한 번만 검증·보정하므로,
+이후 단계에서는 .get()/setdefault() 로 키를 다시 확인할 필요가 없습니다.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+COST_TYPES = ("books", "courses", "equipment")
+
+
+def _as_int(value: Any, default: int) -> int:
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value.replace(",", "").strip()))
+        except ValueError:
+            return default
+    return default
+
+
+def _as_str(value: Any, default: str = "") -> str:
+    if value is None:
+        return default
+    return value if isinstance(value, str) else str(value)
+
+
+def _as_str_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        return [_as_str(value)]
+    return [_as_str(item) for item in value if item is not None]
+
+
+@dataclass(slots=True)
+class PriceSource:
+    title: str = ""
+    url: str = ""
+    snippet: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PriceSource":
+        return cls(_as_str(data.get("title")), _as_str(data.get("url")), _as_str(data.get("snippet")))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"title": self.title, "url": self.url, "snippet": self.snippet}
+
+
+@dataclass(slots=True)
+class CostItem:
+    """가격 조회 결과 한 품목 (estimated_cost.breakdown 의 요소)"""
+    name: str
+    average_price: int
+    currency: str = "KRW"
+    type: str = "equipment"
+    sources: List[PriceSource] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CostItem":
+        return cls(
+            name=_as_str(data.get("name")),
+            average_price=_as_int(data.get("average_price"), 0),
+            currency=_as_str(data.get("currency"), "KRW"),
+            type=_as_str(data.get("type"), "equipment"),
+            sources=[PriceSource.from_dict(s) for s in data.get("sources") or [] if isinstance(s, dict)],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "average_price": self.average_price,
+            "currency": self.currency,
+            "sources": [s.to_dict() for s in self.sources],
+            "type": self.type,
+        }
+
+
+@dataclass(slots=True)
+class CostBreakdown:
+    books: int = 0
+    courses: int = 0
+    equipment: int = 0
+    total: int = 0
+    breakdown: List[CostItem] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "CostBreakdown":
+        if not isinstance(data, dict):
+            return cls()
+        cost = cls(
+            books=_as_int(data.get("books"), 0),
+            courses=_as_int(data.get("courses"), 0),
+            equipment=_as_int(data.get("equipment"), 0),
+            breakdown=[CostItem.from_dict(item) for item in data.get("breakdown") or [] if isinstance(item, dict)],
+        )
+        cost.total = _as_int(data.get("total"), cost.books + cost.courses + cost.equipment)
+        return cost
+
+    def add(self, item: CostItem) -> None:
+        """품목 가격을 유형별 합계와 breakdown 에 반영"""
+        if item.type in COST_TYPES:
+            setattr(self, item.type, getattr(self, item.type) + item.average_price)
+        self.breakdown.append(item)
+        self.total = self.books + self.courses + self.equipment
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "books": self.books,
+            "courses": self.courses,
+            "equipment": self.equipment,
+            "total": self.total,
+        }
+        if self.breakdown:
+            data["breakdown"] = [item.to_dict() for item in self.breakdown]
+        return data
+
+
+@dataclass(slots=True)
+class RecommendedSite:
+    name: str = ""
+    url: str = ""
+
+    @classmethod
+    def from_raw(cls, data: Any) -> "RecommendedSite":
+        if isinstance(data, dict):
+            return cls(_as_str(data.get("name")), _as_str(data.get("url")))
+        return cls(_as_str(data), "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "url": self.url}
+
+
+@dataclass(slots=True)
+class Step:
+    step_number: int
+    title: str
+    duration_days: int = 7
+    start_date: str = ""
+    end_date: str = ""
+    learning_content: List[str] = field(default_factory=list)
+    recommended_sites: List[RecommendedSite] = field(default_factory=list)
+    todos: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any], index: int) -> "Step":
+        duration = _as_int(data.get("duration_days"), 7)
+        return cls(
+            step_number=_as_int(data.get("step_number"), index),
+            title=_as_str(data.get("title"), f"{index}단계") or f"{index}단계",
+            duration_days=duration if duration >= 1 else 7,
+            start_date=_as_str(data.get("start_date")),
+            end_date=_as_str(data.get("end_date")),
+            learning_content=_as_str_list(data.get("learning_content")),
+            recommended_sites=[RecommendedSite.from_raw(s) for s in data.get("recommended_sites") or []],
+            todos=_as_str_list(data.get("todos")),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Step":
+        return cls(
+            step_number=data["step_number"],
+            title=data["title"],
+            duration_days=data["duration_days"],
+            start_date=data.get("start_date", ""),
+            end_date=data.get("end_date", ""),
+            learning_content=data["learning_content"],
+            recommended_sites=[RecommendedSite(s["name"], s["url"]) for s in data["recommended_sites"]],
+            todos=data["todos"],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "step_number": self.step_number,
+            "title": self.title,
+            "duration_days": self.duration_days,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "learning_content": self.learning_content,
+            "recommended_sites": [s.to_dict() for s in self.recommended_sites],
+            "todos": self.todos,
+        }
+
+
+@dataclass(slots=True)
+class Guide:
+    topic: str
+    category: str = "Unknown"
+    total_duration_days: int = 0
+    start_date: str = ""
+    end_date: str = ""
+    reviews_summary: str = "후기 정보가 없습니다."
+    steps: List[Step] = field(default_factory=list)
+    estimated_cost: CostBreakdown = field(default_factory=CostBreakdown)
+
+    @classmethod
+    def from_raw(cls, data: Dict[str, Any]) -> "Guide":
+        """
+        LLM 출력 JSON 으로부터 검증·보정된 가이드 생성
+
+        누락되거나 타입이 맞지 않는 필드는 기본값으로 채웁니다.
+
+        Args:
+            data: extract_json_from_text() 결과 딕셔너리
+
+        Returns:
+            Guide
+        """
+        steps = [
+            Step.from_raw(step, i)
+            for i, step in enumerate((s for s in data.get("steps") or [] if isinstance(s, dict)), 1)
+        ]
+        return cls(
+            topic=_as_str(data.get("topic"), "학습 가이드") or "학습 가이드",
+            category=_as_str(data.get("category"), "Unknown"),
+            total_duration_days=_as_int(data.get("total_duration_days"), 30),
+            start_date=_as_str(data.get("start_date")) or datetime.now().strftime("%Y-%m-%d"),
+            end_date=_as_str(data.get("end_date")),
+            reviews_summary=_as_str(data.get("reviews_summary")) or "후기 정보가 없습니다.",
+            steps=steps,
+            estimated_cost=CostBreakdown.from_dict(data.get("estimated_cost")),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Guide":
+        """to_dict() 로 만든 딕셔너리로부터 빠르게 복원 (검증 생략)"""
+        return cls(
+            topic=data["topic"],
+            category=data["category"],
+            total_duration_days=data["total_duration_days"],
+            start_date=data.get("start_date", ""),
+            end_date=data.get("end_date", ""),
+            reviews_summary=data["reviews_summary"],
+            steps=[Step.from_dict(s) for s in data["steps"]],
+            estimated_cost=CostBreakdown.from_dict(data.get("estimated_cost")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "category": self.category,
+            "total_duration_days": self.total_duration_days,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "reviews_summary": self.reviews_summary,
+            "steps": [s.to_dict() for s in self.steps],
+            "estimated_cost": self.estimated_cost.to_dict(),
+        }
+
+
+def as_guide(guide: Any) -> Optional[Guide]:
+    """Guide 또는 가이드 딕셔너리를 Guide 로 변환 (에러 딕셔너리면 None)"""
+    if isinstance(guide, Guide):
+        return guide
+    if not isinstance(guide, dict) or "error" in guide:
+        return None
+    return Guide.from_raw(guide)
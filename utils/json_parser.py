@@ -6,126 +6,312 @@ LLM 출력에서 JSON을 추출하고 파싱하는 함수들
 
 import json
 import re
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .guide_model import Guide
 
-def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
+
+# JSON 밖에 섞여 나오는 목록 기호
+_BULLET_CHARS = set("•·▪●◦‣")
+
+# 잘린 JSON 복구 시 마지막 쉼표 기준으로 뒤를 잘라내며 재시도하는 횟수
+_MAX_TRUNCATE_RETRIES = 3
+
+# 객체 안에서 구조에 영향을 주는 문자
+_SCAN_TOKEN = re.compile(r'[{}"]')
+# 여는 따옴표 다음부터 닫는 따옴표까지 (이스케이프 포함)
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def scan_json_objects(text: str) -> List[Tuple[int, Optional[int]]]:
     """
-    텍스트에서 JSON을 추출
-    
+    문자열과 이스케이프를 고려하여 최상위 {...} 구간을 한 번의 순회로 찾기
+
+    문자를 하나씩 보지 않고 정규식으로 괄호·따옴표 위치와 문자열 끝으로 바로 건너뜁니다.
+
     Args:
         text: JSON이 포함된 텍스트
-    
+
     Returns:
-        파싱된 JSON 딕셔너리 또는 None
+        (시작, 끝) 구간 목록. 닫히지 않은 마지막 객체는 끝이 None
     """
-    # 마크다운 코드 블록에서 JSON 추출 시도
-    if "```json" in text:
-        json_str = text.split("```json")[1].split("```")[0].strip()
-    elif "```" in text:
-        # 코드 블록 찾기
-        code_blocks = re.findall(r'```(?:json)?\s*\n(.*?)\n```', text, re.DOTALL)
-        if code_blocks:
-            json_str = code_blocks[0].strip()
+    spans: List[Tuple[int, Optional[int]]] = []
+    depth = 0
+    start = 0
+    i = 0
+
+    while True:
+        if depth == 0:
+            # 객체 밖의 따옴표·설명 문장은 무시하고 다음 여는 괄호로 이동
+            i = text.find("{", i)
+            if i == -1:
+                break
+            start = i
+            depth = 1
+            i += 1
+            continue
+
+        match = _SCAN_TOKEN.search(text, i)
+        if match is None:
+            break
+        i = match.end()
+        ch = match.group()
+        if ch == '"':
+            end = _STRING_REST.match(text, i)
+            if end is None:
+                # 닫히지 않은 문자열 (잘린 출력)
+                break
+            i = end.end()
+        elif ch == "{":
+            depth += 1
         else:
-            json_str = text.split("```")[1].split("```")[0].strip()
-    else:
-        # JSON 부분만 찾기
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
+            depth -= 1
+            if depth == 0:
+                spans.append((start, i))
+
+    if depth > 0:
+        spans.append((start, None))
+    return spans
+
+
+def _next_significant(text: str, i: int) -> str:
+    n = len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return text[i] if i < n else ""
+
+
+def _is_complete_literal(token: str) -> bool:
+    if token in ("true", "false", "null"):
+        return True
+    try:
+        float(token)
+        return not token.endswith((".", "e", "E", "-", "+"))
+    except ValueError:
+        return False
+
+
+def repair_json_string(json_str: str) -> str:
+    """
+    흔한 LLM 출력 오류를 한 번의 순회로 복구
+
+    - 문자열 밖의 // 및 /* */ 주석 제거
+    - 문자열 밖의 목록 기호(•, ·)와 문자열 앞의 -, * 제거
+    - 닫는 괄호 앞의 쉼표 제거, 값 사이에 빠진 쉼표 추가
+    - 잘린 문자열·배열·객체를 닫음
+
+    Args:
+        json_str: 복구할 JSON 문자열
+
+    Returns:
+        복구된 JSON 문자열
+    """
+    out: List[str] = []
+    stack: List[List[Any]] = []  # [괄호 종류, 객체에서 ':' 이후인지]
+    in_string = False
+    string_is_key = False
+    pending_comma = False
+    last = ""  # 문자열 밖에서 마지막으로 출력한 의미 있는 문자
+    i = 0
+    n = len(json_str)
+
+    while i < n:
+        ch = json_str[i]
+
+        if ch.isspace():
+            match = _WHITESPACE.match(json_str, i)
+            out.append(match.group())
+            i = match.end()
+            continue
+
+        # 주석
+        if ch == "/" and json_str.startswith("//", i):
+            end = json_str.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if ch == "/" and json_str.startswith("/*", i):
+            end = json_str.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        # 목록 기호
+        if ch in _BULLET_CHARS or (ch in "-*" and _next_significant(json_str, i + 1) == '"'):
+            i += 1
+            continue
+
+        if ch == ",":
+            pending_comma = True
+            i += 1
+            continue
+
+        if ch in "}]":
+            pending_comma = False
+            if stack:
+                stack.pop()
+                out.append(ch)
+                last = ch
+            i += 1
+            continue
+
+        starts_value = ch in '"{[' or ch.isdigit() or ch in "-tfn"
+        if pending_comma or (starts_value and last in ('"', "}", "]", "v") and stack):
+            out.append(",")
+            last = ","
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = False
+        pending_comma = False
+
+        if ch == '"':
+            string_is_key = bool(stack) and stack[-1][0] == "{" and not stack[-1][1]
+            match = _STRING_REST.match(json_str, i + 1)
+            if match is None:
+                # 잘린 문자열: 끝까지 복사하고 미완성 이스케이프(끝의 홀수 개 역슬래시)는 버림
+                tail = json_str[i:]
+                if (len(tail) - len(tail.rstrip("\\"))) % 2:
+                    tail = tail[:-1]
+                out.append(tail)
+                in_string = True
+                break
+            # 문자열은 한 번에 복사
+            out.append(json_str[i:match.end()])
+            last = "k" if string_is_key else '"'
+            i = match.end()
+            continue
+        elif ch in "{[":
+            stack.append([ch, False])
+            out.append(ch)
+            last = ch
+        elif ch == ":":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = True
+            out.append(ch)
+            last = ch
         else:
-            return None
-    
+            # 숫자, true/false/null 등 리터럴
+            j = i
+            while j < n and not json_str[j].isspace() and json_str[j] not in ',:[]{}"':
+                j += 1
+            token = json_str[i:j]
+            # 출력 끝에서 잘린 리터럴(tru, 12. 등)은 버림
+            if j < n or _is_complete_literal(token):
+                out.append(token)
+                last = "v"
+            i = j
+            continue
+        i += 1
+
+    # 잘린 출력 마무리
+    if in_string:
+        out.append('"')
+        last = "k" if string_is_key else '"'
+    if last == "k":
+        out.append(": null")
+    elif last == ":":
+        out.append(" null")
+    elif last == ",":
+        while out and out[-1] != ",":
+            out.pop()
+        out.pop()
+    for bracket, _ in reversed(stack):
+        out.append("}" if bracket == "{" else "]")
+
+    return "".join(out).strip()
+
+
+def _loads(json_str: str) -> Optional[Any]:
     try:
-        # JSON 파싱 시도
-        parsed = json.loads(json_str)
-        return parsed
+        return json.loads(json_str, strict=False)
     except json.JSONDecodeError:
-        # 정리 후 재시도
-        json_str_cleaned = clean_json_string(json_str)
-        try:
-            parsed = json.loads(json_str_cleaned)
-            return parsed
-        except json.JSONDecodeError as e:
-            print(f"JSON 파싱 실패: {e}")
-            return None
+        return None
 
 
-def clean_json_string(json_str: str) -> str:
+def _parse_candidate(candidate: str, truncated: bool) -> Optional[Dict[str, Any]]:
+    parsed = _loads(candidate)
+    if isinstance(parsed, dict):
+        return parsed
+
+    parsed = _loads(repair_json_string(candidate))
+    if isinstance(parsed, dict):
+        return parsed
+
+    # 잘린 출력이면 마지막 쉼표 뒤의 불완전한 값을 버리고 재시도
+    if truncated:
+        for _ in range(_MAX_TRUNCATE_RETRIES):
+            cut = candidate.rfind(",")
+            if cut <= 0:
+                break
+            candidate = candidate[:cut]
+            parsed = _loads(repair_json_string(candidate))
+            if isinstance(parsed, dict):
+                return parsed
+    return None
+
+
+def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     """
-    JSON 문자열 정리 (주석 제거, 줄바꿈 정리 등)
+    텍스트에서 JSON을 추출
+    
+    코드 블록, 앞뒤 설명 문장과 상관없이 최상위 JSON 객체 후보를 한 번에 찾고,
+    큰 후보부터 파싱(실패 시 복구 후 재시도)하여 가장 큰 유효한 객체를 반환합니다.
+
+    JSON만 있거나 코드 블록 하나에 든 정상 출력은 json.loads 한 번으로 끝나 이전 정규식 방식과 속도가 같습니다.
+    깨진 출력은 구간 탐색과 복구(repair_json_string)를 거치므로 건당 수백 µs 로 이전 방식보다 수 배 느리지만,
+    이전 방식은 그런 출력을 파싱하지 못해 Agent 를 다시 실행해야 했으므로 속도보다 복구율을 택했습니다.
+    (benchmarks/bench_json_parser.py 로 측정)
     
     Args:
-        json_str: 정리할 JSON 문자열
+        text: JSON이 포함된 텍스트
     
     Returns:
-        정리된 JSON 문자열
+        파싱된 JSON 딕셔너리 또는 None
     """
-    # 주석 제거 (// 주석)
-    json_str = re.sub(r'//.*?$', '', json_str, flags=re.MULTILINE)
-    
-    # 여러 줄바꿈을 하나로
-    json_str = re.sub(r'\n\s*\n', '\n', json_str)
-    
-    return json_str.strip()
+    if not text:
+        return None
 
+    # 대부분의 정상 출력은 JSON만 있거나 코드 블록 하나에 들어 있으므로 구간 탐색 없이 바로 파싱 시도
+    stripped = text.strip()
+    if text.count("```") == 2:
+        block = text.split("```")[1]
+        if block.startswith("json"):
+            block = block[4:]
+        stripped = block.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        parsed = _loads(stripped)
+        if isinstance(parsed, dict):
+            return parsed
 
-def set_default_values(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    spans = scan_json_objects(text)
+    candidates = sorted(
+        spans,
+        key=lambda span: (span[1] if span[1] is not None else len(text)) - span[0],
+        reverse=True,
+    )
+    for start, end in candidates:
+        parsed = _parse_candidate(text[start:end], truncated=end is None)
+        if parsed is not None:
+            return parsed
+
+    print("JSON 파싱 실패: 유효한 JSON 객체를 찾지 못했습니다.")
+    return None
+
+
+def parse_guide(raw_output: str) -> Optional[Guide]:
     """
-    파싱된 JSON에 누락된 필드에 기본값 설정
-    
+    학습 가이드 출력을 파싱하여 검증·보정된 Guide 로 변환
+
+    누락되거나 타입이 맞지 않는 필드는 Guide.from_raw() 가 기본값으로 채웁니다.
+
     Args:
-        parsed: 파싱된 JSON 딕셔너리
-    
+        raw_output: Agent의 원본 출력
+
     Returns:
-        기본값이 설정된 딕셔너리
+        Guide 또는 None (JSON 파싱 실패)
     """
-    from datetime import datetime
-    
-    # 기본값 설정
-    parsed.setdefault("topic", "학습 가이드")
-    parsed.setdefault("category", "Unknown")
-    parsed.setdefault("total_duration_days", 30)
-    
-    # 날짜 기본값
-    if "start_date" not in parsed:
-        parsed["start_date"] = datetime.now().strftime("%Y-%m-%d")
-    
-    # steps 기본값
-    if "steps" not in parsed:
-        parsed["steps"] = []
-    
-    # 각 단계에 기본값 설정
-    for i, step in enumerate(parsed.get("steps", []), 1):
-        step.setdefault("step_number", i)
-        step.setdefault("title", f"{i}단계")
-        step.setdefault("duration_days", 7)
-        step.setdefault("learning_content", [])
-        step.setdefault("recommended_books", [])
-        step.setdefault("recommended_sites", [])
-        step.setdefault("todos", [])
-        step.setdefault("estimated_cost", 0)
-    
-    # 비용 정보 기본값
-    if "estimated_cost" not in parsed:
-        parsed["estimated_cost"] = {
-            "books": 0,
-            "courses": 0,
-            "equipment": 0,
-            "total": 0
-        }
-    elif isinstance(parsed.get("estimated_cost"), dict):
-        cost = parsed["estimated_cost"]
-        cost.setdefault("books", 0)
-        cost.setdefault("courses", 0)
-        cost.setdefault("equipment", 0)
-        cost.setdefault("total", cost.get("books", 0) + cost.get("courses", 0) + cost.get("equipment", 0))
-    
-    # 후기 기본값
-    parsed.setdefault("reviews_summary", "후기 정보가 없습니다.")
-    
-    return parsed
+    parsed = extract_json_from_text(raw_output)
+    if parsed is None:
+        return None
+    return Guide.from_raw(parsed)
 
 
 def parse_learning_guide(raw_output: str) -> Dict[str, Any]:
@@ -138,16 +324,105 @@ def parse_learning_guide(raw_output: str) -> Dict[str, Any]:
     Returns:
         파싱된 학습 가이드 또는 에러 정보가 포함된 딕셔너리
     """
-    parsed = extract_json_from_text(raw_output)
+    guide = parse_guide(raw_output)
     
-    if parsed is None:
+    if guide is None:
         return {
             "error": "JSON 파싱 실패",
             "raw_output": raw_output
         }
     
-    # 기본값 설정
-    parsed = set_default_values(parsed)
-    
-    return parsed
+    return guide.to_dict()
+
+
+class StreamingStepParser:
+    """
+    스트리밍되는 LLM 출력에서 steps 배열의 각 단계를 완성되는 즉시 추출하는 증분 파서
+
+    feed() 로 토큰을 넣으면 steps[i] 객체의 닫는 중괄호가 도착하는 순간
+    on_step(step) 콜백을 호출합니다. 코드 블록(```json)이나 앞뒤 설명 문장은 무시합니다.
+    """
+
+    def __init__(self, on_step: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.on_step = on_step
+        self.steps: List[Dict[str, Any]] = []
+        self._chunks: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._steps_depth: Optional[int] = None
+        self._step_chars: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 출력"""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        토큰(문자열 조각) 추가
 
+        Returns:
+            이번 조각에서 새로 완성된 단계 목록
+        """
+        self._chunks.append(chunk)
+        completed = []
+        for ch in chunk:
+            step = self._consume(ch)
+            if step is not None:
+                completed.append(step)
+        return completed
+
+    def _consume(self, ch: str) -> Optional[Dict[str, Any]]:
+        if self._step_chars is not None:
+            self._step_chars.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if len(self._stack) == 1:
+                    self._last_string = "".join(self._string_chars)
+            elif len(self._stack) == 1:
+                self._string_chars.append(ch)
+            return None
+
+        if ch == '"':
+            if self._stack:
+                self._in_string = True
+                self._string_chars = []
+        elif ch in "{[":
+            if not self._stack and ch == "[":
+                return None
+            self._stack.append(ch)
+            if ch == "[" and len(self._stack) == 2 and self._last_string == "steps":
+                self._steps_depth = 2
+            elif ch == "{" and self._steps_depth is not None and len(self._stack) == self._steps_depth + 1:
+                self._step_chars = ["{"]
+        elif ch in "}]" and self._stack:
+            self._stack.pop()
+            if ch == "}" and self._step_chars is not None and len(self._stack) == self._steps_depth:
+                return self._finish_step()
+            if ch == "]" and self._steps_depth is not None and len(self._stack) < self._steps_depth:
+                self._steps_depth = None
+        elif ch == "," and len(self._stack) == 1:
+            self._last_string = None
+        return None
+
+    def _finish_step(self) -> Optional[Dict[str, Any]]:
+        raw = "".join(self._step_chars)
+        self._step_chars = None
+        step = _loads(raw)
+        if not isinstance(step, dict):
+            step = _loads(repair_json_string(raw))
+        if not isinstance(step, dict):
+            return None
+        self.steps.append(step)
+        if self.on_step is not None:
+            self.on_step(step)
+        return step
@@ -0,0 +1,238 @@
+"""
+OOXML 직접 작성 Word 백엔드
+
+python-docx 객체 모델을 거치지 않고 guide_layout 의 Block 목록을 document.xml 문자열로
+변환해 zip 스트림에 바로 기록합니다.
+
+- 스타일·번호 매기기·설정 파트는 모듈 로딩 시 한 번 만들어 둔 상수를 그대로 씁니다.
+  (python-docx 기본 템플릿의 Normal / Heading 2 / List Bullet / List Bullet 2 와 같은 값)
+- 문단별 서식(pPr/rPr)도 미리 만든 문자열 조각을 재사용합니다.
+- 하이퍼링크 관계(rId)는 URL 단위로 한 번만 만들어집니다.
+"""
+
+import re
+import zipfile
+from typing import IO, Dict, Iterable, Union
+from xml.sax.saxutils import escape, quoteattr
+
+from .guide_layout import DIVIDER_TEXT, Block, iter_guide_blocks
+from .guide_model import Guide
+
+
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_HYPERLINK_REL = f"{_REL_TYPE}/hyperlink"
+
+CONTENT_TYPES_XML = (
+    _XML_DECL
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/numbering.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>'
+    '<Override PartName="/word/settings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+    "</Types>"
+)
+
+PACKAGE_RELS_XML = (
+    _XML_DECL
+    + f'<Relationships xmlns="{_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_TYPE}/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+# 문서 파트 관계: 고정 파트 뒤에 하이퍼링크가 rId4 부터 붙습니다.
+_DOCUMENT_RELS_HEAD = (
+    _XML_DECL
+    + f'<Relationships xmlns="{_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_TYPE}/styles" Target="styles.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_TYPE}/numbering" Target="numbering.xml"/>'
+    f'<Relationship Id="rId3" Type="{_REL_TYPE}/settings" Target="settings.xml"/>'
+)
+_FIRST_HYPERLINK_RID = 4
+
+# set_document_style() 와 같은 Normal 글꼴 (Malgun Gothic 11pt)
+STYLES_XML = (
+    _XML_DECL
+    + f'<w:styles xmlns:w="{_W_NS}">'
+    "<w:docDefaults>"
+    '<w:rPrDefault><w:rPr><w:rFonts w:ascii="Cambria" w:eastAsia="맑은 고딕" w:hAnsi="Cambria" w:cs="Times New Roman"/>'
+    '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US" w:eastAsia="en-US" w:bidi="ar-SA"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    "</w:docDefaults>"
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/>'
+    '<w:rPr><w:rFonts w:ascii="Malgun Gothic" w:hAnsi="Malgun Gothic"/><w:sz w:val="22"/></w:rPr></w:style>'
+    '<w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont">'
+    '<w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/><w:unhideWhenUsed/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/>'
+    '<w:next w:val="Normal"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/>'
+    '<w:pPr><w:keepNext/><w:keepLines/><w:spacing w:before="200" w:after="0"/><w:outlineLvl w:val="1"/></w:pPr>'
+    '<w:rPr><w:rFonts w:ascii="Calibri" w:eastAsia="맑은 고딕" w:hAnsi="Calibri" w:cs="Times New Roman"/>'
+    '<w:b/><w:bCs/><w:color w:val="4F81BD"/><w:sz w:val="26"/><w:szCs w:val="26"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/>'
+    '<w:uiPriority w:val="99"/><w:unhideWhenUsed/>'
+    '<w:pPr><w:numPr><w:numId w:val="1"/></w:numPr><w:contextualSpacing/></w:pPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="ListBullet2"><w:name w:val="List Bullet 2"/><w:basedOn w:val="Normal"/>'
+    '<w:uiPriority w:val="99"/><w:unhideWhenUsed/>'
+    '<w:pPr><w:numPr><w:numId w:val="2"/></w:numPr><w:contextualSpacing/></w:pPr></w:style>'
+    "</w:styles>"
+)
+
+
+def _bullet_level(abstract_id: int, style_id: str, indent: int) -> str:
+    return (
+        f'<w:abstractNum w:abstractNumId="{abstract_id}"><w:multiLevelType w:val="singleLevel"/>'
+        '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="bullet"/>'
+        f'<w:pStyle w:val="{style_id}"/><w:lvlText w:val="\uf0b7"/><w:lvlJc w:val="left"/>'
+        f'<w:pPr><w:tabs><w:tab w:val="num" w:pos="{indent}"/></w:tabs><w:ind w:left="{indent}" w:hanging="360"/></w:pPr>'
+        '<w:rPr><w:rFonts w:ascii="Symbol" w:hAnsi="Symbol" w:hint="default"/></w:rPr></w:lvl></w:abstractNum>'
+    )
+
+
+NUMBERING_XML = (
+    _XML_DECL
+    + f'<w:numbering xmlns:w="{_W_NS}">'
+    + _bullet_level(0, "ListBullet", 360)
+    + _bullet_level(1, "ListBullet2", 720)
+    + '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+    "</w:numbering>"
+)
+
+SETTINGS_XML = (
+    _XML_DECL
+    + f'<w:settings xmlns:w="{_W_NS}"><w:defaultTabStop w:val="720"/>'
+    '<w:characterSpacingControl w:val="doNotCompress"/>'
+    '<w:compat><w:useFELayout/><w:compatSetting w:name="compatibilityMode" '
+    'w:uri="http://schemas.microsoft.com/office/word" w:val="14"/></w:compat>'
+    "</w:settings>"
+)
+
+_DOCUMENT_HEAD = (_XML_DECL + f'<w:document xmlns:w="{_W_NS}" xmlns:r="{_R_NS}"><w:body>').encode("utf-8")
+_DOCUMENT_TAIL = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" w:header="720" w:footer="720" w:gutter="0"/>'
+    '<w:cols w:space="720"/><w:docGrid w:linePitch="360"/></w:sectPr>'
+    "</w:body></w:document>"
+).encode("utf-8")
+
+# 문단·run 서식 조각 (word_generator 의 python-docx 서식과 같은 값)
+_STYLE_PPR = {
+    None: "",
+    "Heading 2": '<w:pPr><w:pStyle w:val="Heading2"/></w:pPr>',
+    "List Bullet": '<w:pPr><w:pStyle w:val="ListBullet"/></w:pPr>',
+    "List Bullet 2": '<w:pPr><w:pStyle w:val="ListBullet2"/></w:pPr>',
+}
+_CENTER_PPR = '<w:pPr><w:jc w:val="center"/></w:pPr>'
+_TITLE_RPR = '<w:rPr><w:b/><w:color w:val="0050A0"/><w:sz w:val="64"/></w:rPr>'
+_SUBTITLE_RPR = '<w:rPr><w:color w:val="646464"/><w:sz w:val="36"/></w:rPr>'
+_CARD_PPR = '<w:pPr><w:spacing w:before="320" w:after="120"/></w:pPr>'
+_CARD_RPR = '<w:rPr><w:b/><w:color w:val="0066CC"/><w:sz w:val="40"/></w:rPr>'
+_CARD_DIVIDER_PPR = '<w:pPr><w:spacing w:after="280"/><w:jc w:val="center"/></w:pPr>'
+_BOLD_RPR = "<w:rPr><w:b/></w:rPr>"
+_LINK_RPR = '<w:rPr><w:color w:val="0066CC"/><w:u w:val="single"/></w:rPr>'
+
+# XML 1.0 에서 허용되지 않는 제어 문자
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _text_xml(text: str) -> str:
+    text = escape(_INVALID_XML_CHARS.sub("", text))
+    if "\n" in text or "\t" in text:
+        # python-docx 와 같이 줄바꿈·탭은 별도 요소로 변환
+        text = text.replace("\t", '</w:t><w:tab/><w:t xml:space="preserve">')
+        text = text.replace("\n", '</w:t><w:br/><w:t xml:space="preserve">')
+    return f'<w:t xml:space="preserve">{text}</w:t>'
+
+
+def _run_xml(text: str, rpr: str = "") -> str:
+    return f"<w:r>{rpr}{_text_xml(text)}</w:r>"
+
+
+class _HyperlinkRels:
+    """URL 별로 한 번만 관계(rId)를 만드는 레지스트리"""
+
+    __slots__ = ("ids",)
+
+    def __init__(self):
+        self.ids: Dict[str, str] = {}
+
+    def rid(self, url: str) -> str:
+        r_id = self.ids.get(url)
+        if r_id is None:
+            r_id = f"rId{_FIRST_HYPERLINK_RID + len(self.ids)}"
+            self.ids[url] = r_id
+        return r_id
+
+    def to_xml(self) -> str:
+        parts = [_DOCUMENT_RELS_HEAD]
+        for url, r_id in self.ids.items():
+            target = quoteattr(_INVALID_XML_CHARS.sub("", url))
+            parts.append(
+                f'<Relationship Id="{r_id}" Type="{_HYPERLINK_REL}" Target={target} TargetMode="External"/>'
+            )
+        parts.append("</Relationships>")
+        return "".join(parts)
+
+
+def _block_xml(block: Block, rels: _HyperlinkRels) -> str:
+    kind = block.kind
+    if kind == "card_header":
+        return (
+            f"<w:p>{_CARD_PPR}{_run_xml(block.runs[0].text, _CARD_RPR)}</w:p>"
+            f"<w:p>{_CARD_DIVIDER_PPR}{_run_xml(DIVIDER_TEXT)}</w:p>"
+        )
+    if kind == "title":
+        return f"<w:p>{_CENTER_PPR}{_run_xml(block.runs[0].text, _TITLE_RPR)}</w:p>"
+    if kind == "subtitle":
+        return f"<w:p>{_CENTER_PPR}{_run_xml(block.runs[0].text, _SUBTITLE_RPR)}</w:p>"
+    if kind == "divider":
+        return f"<w:p>{_CENTER_PPR}{_run_xml(block.runs[0].text)}</w:p>"
+
+    parts = ["<w:p>", _STYLE_PPR[block.style]]
+    for run in block.runs:
+        if run.url:
+            parts.append(f'<w:hyperlink r:id="{rels.rid(run.url)}">{_run_xml(run.text, _LINK_RPR)}</w:hyperlink>')
+        else:
+            parts.append(_run_xml(run.text, _BOLD_RPR if run.bold else ""))
+    parts.append("</w:p>")
+    return "".join(parts)
+
+
+def write_blocks(blocks: Iterable[Block], target: Union[str, IO[bytes]]) -> None:
+    """
+    Block 목록을 .docx 패키지로 기록
+
+    document.xml 은 문단 단위로 zip 스트림에 바로 쓰고, 하이퍼링크 관계 파트는
+    본문을 모두 쓴 뒤 마지막에 기록합니다.
+
+    Args:
+        blocks: iter_guide_blocks() 등으로 만든 Block 목록
+        target: 파일 경로 또는 쓰기 가능한 바이너리 스트림
+    """
+    rels = _HyperlinkRels()
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", PACKAGE_RELS_XML)
+        with zf.open("word/document.xml", "w") as doc:
+            doc.write(_DOCUMENT_HEAD)
+            for block in blocks:
+                doc.write(_block_xml(block, rels).encode("utf-8"))
+            doc.write(_DOCUMENT_TAIL)
+        zf.writestr("word/_rels/document.xml.rels", rels.to_xml())
+        zf.writestr("word/styles.xml", STYLES_XML)
+        zf.writestr("word/numbering.xml", NUMBERING_XML)
+        zf.writestr("word/settings.xml", SETTINGS_XML)
+
+
+def write_guide_docx(guide: Guide, target: Union[str, IO[bytes]]) -> None:
+    """학습 가이드를 카드형 .docx 로 기록 (python-docx 불필요)"""
+    write_blocks(iter_guide_blocks(guide), target)
@@ -3,14 +3,25 @@
 
 Tavily API를 사용해 학습 주제 및 카테고리에 맞는 대표 품목의 가격을 검색하고
 평균 비용을 계산합니다.
+Tavily 호출은 resilience 의 tavily upstream 정책(재시도 + 서킷 브레이커)을 따르며,
+재시도 후에도 실패한 품목은 가격 없음(None)으로 처리합니다.
 """
 
+import asyncio
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, TavilyClient
+
+from .cache import SQLiteCache, normalize_cache_text
+from .guide_model import CostItem, Guide
+from .resilience import tavily_upstream
+from .single_flight import AsyncSingleFlight, SingleFlight
 
 
 @dataclass
@@ -25,11 +36,69 @@ PRICE_PATTERN = re.compile(
 )
 
 
+# 가격 조회 동시 실행 설정
+PRICE_LOOKUP_MAX_WORKERS = 8
+PRICE_LOOKUP_TIMEOUT = 15.0  # 가이드 1건의 가격 조회 전체 제한 시간 (초, 대기열 대기 포함)
+PRICE_REFRESH_MAX_WORKERS = 2
+
+_price_executor = ThreadPoolExecutor(max_workers=PRICE_LOOKUP_MAX_WORKERS, thread_name_prefix="price-lookup")
+# 만료된 캐시 항목의 백그라운드 갱신은 요청 처리용 풀과 분리 (갱신이 요청 조회를 밀어내지 않도록)
+_refresh_executor = ThreadPoolExecutor(max_workers=PRICE_REFRESH_MAX_WORKERS, thread_name_prefix="price-refresh")
+
+# 가격 캐시 설정 (만료 후 PRICE_CACHE_STALE_TTL 동안은 기존 값을 바로 반환하고 백그라운드에서 갱신)
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", 3 * 24 * 3600))
+PRICE_CACHE_STALE_TTL = float(os.getenv("PRICE_CACHE_STALE_TTL", 30 * 24 * 3600))
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", 5000))
+
+price_cache = SQLiteCache(
+    "prices",
+    ttl=PRICE_CACHE_TTL,
+    max_entries=PRICE_CACHE_MAX_ENTRIES,
+    stale_ttl=PRICE_CACHE_STALE_TTL,
+)
+
+# 가격을 찾지 못한 품목은 짧은 시간 동안만 기억 (일시적인 검색 결과로 한 달 가까이 가격이 빠지지 않도록)
+# 조회 실패(예외)는 어느 캐시에도 저장하지 않음
+PRICE_NEGATIVE_TTL = float(os.getenv("PRICE_NEGATIVE_TTL", 10 * 60))
+price_miss_cache = SQLiteCache("prices_miss", ttl=PRICE_NEGATIVE_TTL, max_entries=PRICE_CACHE_MAX_ENTRIES)
+_refreshing_keys = set()
+_refreshing_lock = threading.Lock()
+
+# 캐시에 없는 같은 품목의 동시 조회 병합
+price_flight = SingleFlight("price_lookup")
+aprice_flight = AsyncSingleFlight("price_lookup_async")
+
+_tavily_clients: Dict[str, TavilyClient] = {}
+_async_tavily_clients: Dict[str, AsyncTavilyClient] = {}
+_tavily_clients_lock = threading.Lock()
+
+
 def _get_tavily_client() -> Optional[TavilyClient]:
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         return None
-    return TavilyClient(api_key=api_key)
+    client = _tavily_clients.get(api_key)
+    if client is None:
+        with _tavily_clients_lock:
+            client = _tavily_clients.get(api_key)
+            if client is None:
+                client = TavilyClient(api_key=api_key)
+                _tavily_clients[api_key] = client
+    return client
+
+
+def _get_async_tavily_client() -> Optional[AsyncTavilyClient]:
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        return None
+    client = _async_tavily_clients.get(api_key)
+    if client is None:
+        with _tavily_clients_lock:
+            client = _async_tavily_clients.get(api_key)
+            if client is None:
+                client = AsyncTavilyClient(api_key=api_key)
+                _async_tavily_clients[api_key] = client
+    return client
 
 
 def _parse_price(text: str) -> Optional[Dict]:
@@ -110,17 +179,28 @@ def infer_price_items(topic: str, category: str) -> List[PriceItem]:
     ]
 
 
-def get_average_price(item_name: str, num_results: int = 3) -> Optional[Dict]:
-    client = _get_tavily_client()
-    if client is None:
-        return None
-
-    response = client.search(
+def _search_average_price(client: TavilyClient, item_name: str, num_results: int) -> Optional[Dict]:
+    response = tavily_upstream.call(
+        client.search,
         query=f"{item_name} 가격",
         search_depth="basic",
         max_results=num_results,
     )
+    return _summarize_prices(item_name, response, num_results)
+
+
+async def _asearch_average_price(client: AsyncTavilyClient, item_name: str, num_results: int) -> Optional[Dict]:
+    response = await tavily_upstream.acall(
+        lambda: client.search(
+            query=f"{item_name} 가격",
+            search_depth="basic",
+            max_results=num_results,
+        )
+    )
+    return _summarize_prices(item_name, response, num_results)
 
+
+def _summarize_prices(item_name: str, response: Dict[str, Any], num_results: int) -> Optional[Dict]:
     prices: List[Dict[str, Any]] = []
 
     for result in response.get("results", []):
@@ -160,32 +240,197 @@ def get_average_price(item_name: str, num_results: int = 3) -> Optional[Dict]:
     }
 
 
-def enrich_estimated_cost(guide: Dict[str, Any]) -> Dict[str, Any]:
-    """가이드에 Tavily 기반 실제 비용 정보를 주입"""
-    topic = guide.get("topic", "")
-    category = guide.get("category", "Lifestyle / Hobby")
+def _price_cache_key(item_name: str, num_results: int) -> str:
+    return f"{normalize_cache_text(item_name)}|{num_results}"
 
-    items = infer_price_items(topic, category)
-    if not items:
-        return guide
 
-    cost_data = guide.get("estimated_cost") or {"books": 0, "courses": 0, "equipment": 0, "total": 0}
-    breakdown = []
+def _store_price(key: str, price_info: Optional[Dict]) -> None:
+    if price_info is None:
+        price_miss_cache.set(key, True)
+    else:
+        price_cache.set(key, price_info)
+
+
+def _refresh_price(key: str, client: TavilyClient, item_name: str, num_results: int) -> None:
+    try:
+        # 가격을 찾지 못하면 기존 값을 지우지 않고 유지
+        _store_price(key, _search_average_price(client, item_name, num_results))
+    except Exception as e:
+        print(f"⚠️ 가격 캐시 갱신 실패 ({item_name}): {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing_keys.discard(key)
+
+
+def _get_cached_price(key: str, item_name: str, num_results: int):
+    """캐시 조회 후 만료된 항목이면 백그라운드 갱신 예약. (hit 여부, 값) 반환"""
+    cached = price_cache.get(key)
+    # 이전 버전이 저장한 None 값은 가격 없음 캐시로 취급하지 않음
+    if cached is None or cached[0] is None:
+        if price_miss_cache.get(key) is not None:
+            return True, None
+        return False, None
+
+    value, stale = cached
+    client = _get_tavily_client()
+    if stale and client is not None and price_miss_cache.get(key) is None:
+        with _refreshing_lock:
+            should_refresh = key not in _refreshing_keys
+            _refreshing_keys.add(key)
+        if should_refresh:
+            _refresh_executor.submit(_refresh_price, key, client, item_name, num_results)
+    return True, value
+
+
+def _lookup_price(client: TavilyClient, key: str, item_name: str, num_results: int) -> Optional[Dict]:
+    price_info = _search_average_price(client, item_name, num_results)
+    _store_price(key, price_info)
+    return price_info
+
+
+async def _alookup_price(client: AsyncTavilyClient, key: str, item_name: str, num_results: int) -> Optional[Dict]:
+    price_info = await _asearch_average_price(client, item_name, num_results)
+    await asyncio.to_thread(_store_price, key, price_info)
+    return price_info
+
 
-    for item in items:
-        price_info = get_average_price(item.name)
-        if not price_info:
+def get_average_price(item_name: str, num_results: int = 3) -> Optional[Dict]:
+    """품목 평균 가격 조회 (디스크 캐시 우선, 만료된 항목은 즉시 반환 후 백그라운드 갱신, 조회 실패 시 None)"""
+    key = _price_cache_key(item_name, num_results)
+    hit, value = _get_cached_price(key, item_name, num_results)
+    if hit:
+        return value
+
+    client = _get_tavily_client()
+    if client is None:
+        return None
+
+    # 같은 품목을 동시에 조회하면 검색은 한 번만 실행
+    try:
+        return price_flight.do(key, lambda: _lookup_price(client, key, item_name, num_results))
+    except Exception as e:
+        print(f"⚠️ 가격 조회 실패 ({item_name}): {type(e).__name__}: {e}")
+        return None
+
+
+async def aget_average_price(item_name: str, num_results: int = 3) -> Optional[Dict]:
+    """get_average_price 의 비동기 버전 (AsyncTavilyClient 사용, 디스크 캐시 조회·저장은 스레드에서 실행)"""
+    key = _price_cache_key(item_name, num_results)
+    hit, value = await asyncio.to_thread(_get_cached_price, key, item_name, num_results)
+    if hit:
+        return value
+
+    client = _get_async_tavily_client()
+    if client is None:
+        return None
+
+    try:
+        return await aprice_flight.do(key, lambda: _alookup_price(client, key, item_name, num_results))
+    except Exception as e:
+        print(f"⚠️ 가격 조회 실패 ({item_name}): {type(e).__name__}: {e}")
+        return None
+
+
+def get_price_cache_stats() -> Dict[str, Any]:
+    """가격 캐시 hit/miss 통계 (병합된 동시 조회 수, 가격 없음 캐시 적중 수 포함)"""
+    stats = price_cache.stats()
+    stats["coalesced"] = price_flight.coalesced + aprice_flight.coalesced
+    stats["negative_hits"] = price_miss_cache.hits
+    return stats
+
+
+def fetch_prices(items: List[PriceItem], timeout: float = PRICE_LOOKUP_TIMEOUT) -> List[Optional[Dict]]:
+    """
+    여러 품목의 가격을 동시에 조회
+
+    가이드 1건의 모든 품목이 하나의 마감 시간(timeout)을 공유합니다.
+    마감 시간이 지나면 아직 시작하지 않은 조회는 취소하고, 취소되기 전에 대기열에서 꺼내진 조회도
+    시작하지 않고 None 을 반환합니다. (이미 실행 중인 조회는 결과를 버림)
+
+    Args:
+        items: 조회할 품목 목록
+        timeout: 전체 조회 제한 시간 (초, 풀 대기열에서 기다린 시간 포함)
+
+    Returns:
+        items 와 같은 순서의 가격 정보 목록 (실패/시간 초과 항목은 None)
+    """
+    deadline = time.monotonic() + timeout
+
+    def lookup(item_name: str) -> Optional[Dict]:
+        if time.monotonic() >= deadline:
+            return None
+        return get_average_price(item_name)
+
+    futures = [_price_executor.submit(lookup, item.name) for item in items]
+    wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+    results: List[Optional[Dict]] = []
+    for future in futures:
+        if not future.done():
+            future.cancel()
+            results.append(None)
+            continue
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"⚠️ 가격 조회 실패: {e}")
+            results.append(None)
+    return results
+
+
+async def afetch_prices(items: List[PriceItem], timeout: float = PRICE_LOOKUP_TIMEOUT) -> List[Optional[Dict]]:
+    """fetch_prices 의 비동기 버전"""
+    tasks = [asyncio.ensure_future(aget_average_price(item.name)) for item in items]
+    await asyncio.wait(tasks, timeout=timeout)
+
+    results: List[Optional[Dict]] = []
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+            results.append(None)
             continue
-        breakdown.append({**price_info, "type": item.cost_type})
-        cost_data[item.cost_type] = cost_data.get(item.cost_type, 0) + price_info["average_price"]
+        try:
+            results.append(task.result())
+        except Exception as e:
+            print(f"⚠️ 가격 조회 실패: {e}")
+            results.append(None)
+    return results
+
+
+def apply_prices(guide: Guide, items: List[PriceItem], price_infos: List[Optional[Dict]]) -> Guide:
+    """조회된 가격 정보를 가이드의 estimated_cost 에 합산"""
+    for item, price_info in zip(items, price_infos):
+        if price_info:
+            guide.estimated_cost.add(CostItem.from_dict({**price_info, "type": item.cost_type}))
+    return guide
+
 
-    if not breakdown:
-        guide["estimated_cost"] = cost_data
+def enrich_estimated_cost(guide: Guide, timeout: float = PRICE_LOOKUP_TIMEOUT) -> Guide:
+    """가이드에 Tavily 기반 실제 비용 정보를 주입"""
+    items = infer_price_items(guide.topic, guide.category)
+    if not items:
         return guide
+    return apply_prices(guide, items, fetch_prices(items, timeout=timeout))
 
-    cost_data["total"] = cost_data.get("books", 0) + cost_data.get("courses", 0) + cost_data.get("equipment", 0)
-    cost_data["breakdown"] = breakdown
-    guide["estimated_cost"] = cost_data
-    return guide
 
+async def afetch_topic_prices(
+    topic: str, category: str, timeout: float = PRICE_LOOKUP_TIMEOUT
+) -> Tuple[List[PriceItem], List[Optional[Dict]]]:
+    """
+    주제와 카테고리만으로 대표 품목 가격을 조회 (가이드 생성 전에 미리 시작 가능)
 
+    Returns:
+        (품목 목록, 같은 순서의 가격 정보 목록) - apply_prices() 에 그대로 전달
+    """
+    items = infer_price_items(topic, category)
+    if not items:
+        return items, []
+    return items, await afetch_prices(items, timeout=timeout)
+
+
+async def aenrich_estimated_cost(guide: Guide, timeout: float = PRICE_LOOKUP_TIMEOUT) -> Guide:
+    """enrich_estimated_cost 의 비동기 버전"""
+    items = infer_price_items(guide.topic, guide.category)
+    if not items:
+        return guide
+    return apply_prices(guide, items, await afetch_prices(items, timeout=timeout))
@@ -0,0 +1,372 @@
+"""
+외부 API 호출 보호 (재시도 + 서킷 브레이커)
+
+OpenAI, Tavily 같은 외부 API(upstream)마다 재시도 정책과 서킷 브레이커를 둡니다.
+
+- 일시적인 오류(연결 실패, 시간 초과, 408/409/425/429/5xx)만 재시도합니다. 400/401/403/404 등은 바로 실패합니다.
+- 재시도 간격은 지수 증가 + full jitter 이며, 429/503 응답의 Retry-After 헤더가 있으면 그 시간만큼 기다립니다.
+  Retry-After 가 max_retry_after 보다 길면 기다리지 않고 바로 실패합니다.
+- 연속 실패가 failure_threshold 에 도달하면 서킷이 열리고, reset_timeout 동안 호출은 네트워크 없이
+  CircuitOpenError 로 바로 실패합니다. 그 후 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다.
+
+외부 라이브러리에 의존하지 않으므로 어떤 HTTP 클라이언트 호출에도 감쌀 수 있습니다.
+(로컬 가짜 HTTP 서버로 시험할 때는 OPENAI_BASE_URL 로 요청 주소를 바꿀 수 있습니다)
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# 상태 코드 없이 실패하는 연결·시간 초과 예외 이름 (openai, httpx, requests 공통)
+_TRANSIENT_ERROR_NAMES = frozenset({
+    "APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout", "ReadTimeout",
+    "ReadError", "RemoteProtocolError", "PoolTimeout", "WriteTimeout", "ChunkedEncodingError",
+    "Timeout", "TimeoutException",
+})
+
+# 상태 코드 속성 없이 HTTP 상태를 뜻하는 예외 (tavily-python 은 429 응답에 이 예외를 발생)
+_STATUS_BY_ERROR_NAME = {"UsageLimitExceededError": 429}
+
+# requests.HTTPError 메시지 형식: "429 Client Error: Too Many Requests for url: ..."
+_STATUS_IN_MESSAGE = re.compile(r"\b([45]\d\d) (?:Client|Server) Error\b")
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않고 실패"""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"{upstream} 서킷이 열려 있습니다. {retry_in:.1f}초 후 다시 시도할 수 있습니다.")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    max_attempts: int = 3          # 첫 호출 포함 최대 시도 횟수
+    base_delay: float = 0.5        # 첫 재시도 최대 대기 (초)
+    max_delay: float = 10.0        # 재시도 대기 상한 (초)
+    multiplier: float = 2.0        # 재시도마다 대기 상한 증가 배수
+    max_retry_after: float = 30.0  # 이보다 긴 Retry-After 는 기다리지 않음 (초)
+
+    def backoff(self, attempt: int) -> float:
+        """attempt 번째 실패 후 대기 시간 (full jitter)"""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (openai, httpx, requests, urllib 예외 및 오류 메시지)"""
+    for attr in ("status_code", "code"):
+        status = getattr(error, attr, None)
+        if isinstance(status, int):
+            return status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status
+    match = _STATUS_IN_MESSAGE.search(str(error))
+    if match:
+        return int(match.group(1))
+    return _STATUS_BY_ERROR_NAME.get(type(error).__name__)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """예외의 HTTP 응답에서 Retry-After (초 단위 또는 HTTP 날짜, OpenAI 의 retry-after-ms) 추출"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return max(0.0, float(value) / 1000)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """재시도할 만한 일시적 오류인지"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # 원인을 알 수 없는 오류는 예외 쪽에서 판단 (transient 속성)
+    transient = getattr(error, "transient", None)
+    if transient is not None:
+        return bool(transient)
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """호출 가능 여부 확인 (열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            if self.state == "closed":
+                return
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == "open" and retry_in <= 0:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_running:
+                # 시험 호출은 한 번에 하나만
+                self._trial_running = True
+                return
+            raise CircuitOpenError(self.name, max(0.0, retry_in))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened_count += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """결과를 판단할 수 없는 호출(재시도 대상이 아닌 오류)이 끝났을 때 시험 호출 자리 반환"""
+        with self._lock:
+            self._trial_running = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "opened": self.opened_count}
+
+
+class Upstream:
+    """
+    외부 API 하나의 재시도 정책 + 서킷 브레이커
+
+    사용법:
+        result = tavily_upstream.call(client.search, query="...")
+        result = await openai_upstream.acall(lambda: llm.ainvoke(...))
+    """
+
+    def __init__(self, name: str, policy: RetryPolicy, breaker: CircuitBreaker):
+        self.name = name
+        self.policy = policy
+        self.breaker = breaker
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _before_attempt(self) -> None:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._count("short_circuited")
+            raise
+
+    def _after_error(self, error: BaseException, attempt: int) -> Optional[float]:
+        """실패 기록 후 재시도 대기 시간 반환 (재시도하지 않으면 None)"""
+        if not is_transient(error):
+            # 요청 자체의 문제(400, 401 등)는 upstream 장애로 보지 않음
+            self.breaker.release()
+            return None
+        self.breaker.record_failure()
+        # 이번 실패로 서킷이 열렸으면 원래 오류를 그대로 전달
+        if attempt >= self.policy.max_attempts or self.breaker.state == "open":
+            return None
+
+        delay = self.policy.backoff(attempt)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            if retry_after > self.policy.max_retry_after:
+                return None
+            # 같은 시각에 몰려 다시 호출하지 않도록 약간의 jitter 추가
+            delay = retry_after + random.uniform(0, self.policy.base_delay)
+        self._count("retries")
+        print(f"⚠️ {self.name} 호출 실패 ({type(error).__name__}: {error}) → {delay:.1f}초 후 재시도 ({attempt}/{self.policy.max_attempts - 1})")
+        return delay
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """동기 호출 (재시도 + 서킷 브레이커)"""
+        self._count("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_error(e, attempt)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """비동기 호출 (factory 는 시도마다 새 코루틴을 만드는 함수)"""
+        self._count("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            try:
+                result = await factory()
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                delay = self._after_error(e, attempt)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, factory: Callable[[], Iterator[T]]) -> Iterator[T]:
+        """
+        동기 스트림 호출
+
+        첫 조각을 받기 전의 실패만 재시도합니다. (이미 전달한 조각은 되돌릴 수 없으므로)
+        """
+        self._count("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            started = False
+            try:
+                for item in factory():
+                    if not started:
+                        started = True
+                        self.breaker.record_success()
+                    yield item
+            except GeneratorExit:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                delay = None if started else self._after_error(e, attempt)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                time.sleep(delay)
+                continue
+            if not started:
+                self.breaker.record_success()
+            return
+
+    async def astream(self, factory: Callable[[], AsyncIterator[T]]) -> AsyncIterator[T]:
+        """stream 의 비동기 버전"""
+        self._count("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._before_attempt()
+            started = False
+            try:
+                async for item in factory():
+                    if not started:
+                        started = True
+                        self.breaker.record_success()
+                    yield item
+            except (GeneratorExit, asyncio.CancelledError):
+                self.breaker.release()
+                raise
+            except Exception as e:
+                delay = None if started else self._after_error(e, attempt)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if not started:
+                self.breaker.record_success()
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+        }
+        stats.update(self.breaker.stats())
+        return stats
+
+
+def _policy_from_env(prefix: str, **defaults) -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=int(os.getenv(f"{prefix}_MAX_ATTEMPTS", defaults["max_attempts"])),
+        base_delay=float(os.getenv(f"{prefix}_BASE_DELAY", defaults["base_delay"])),
+        max_delay=float(os.getenv(f"{prefix}_MAX_DELAY", defaults["max_delay"])),
+        max_retry_after=float(os.getenv(f"{prefix}_MAX_RETRY_AFTER", defaults["max_retry_after"])),
+    )
+
+
+def _breaker_from_env(name: str, prefix: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv(f"{prefix}_BREAKER_THRESHOLD", 5)),
+        reset_timeout=float(os.getenv(f"{prefix}_BREAKER_RESET", 30.0)),
+    )
+
+
+# upstream 별 정책 (환경 변수 OPENAI_MAX_ATTEMPTS, TAVILY_BREAKER_THRESHOLD 등으로 변경)
+openai_upstream = Upstream(
+    "openai",
+    _policy_from_env("OPENAI", max_attempts=4, base_delay=1.0, max_delay=20.0, max_retry_after=30.0),
+    _breaker_from_env("openai", "OPENAI"),
+)
+tavily_upstream = Upstream(
+    "tavily",
+    _policy_from_env("TAVILY", max_attempts=3, base_delay=0.5, max_delay=8.0, max_retry_after=15.0),
+    _breaker_from_env("tavily", "TAVILY"),
+)
+
+UPSTREAMS: Dict[str, Upstream] = {upstream.name: upstream for upstream in (openai_upstream, tavily_upstream)}
+
+
+def get_upstream_stats() -> Dict[str, Dict[str, Any]]:
+    """upstream 별 호출·재시도·서킷 상태 통계"""
+    return {name: upstream.stats() for name, upstream in UPSTREAMS.items()}
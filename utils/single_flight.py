@@ -0,0 +1,105 @@
+"""
+Single-flight 요청 병합
+
+같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 진행 중인 작업의 결과를 함께 받습니다.
+인기 주제가 몰릴 때 같은 가이드 생성·가격 조회가 중복으로 실행되는 것을 막습니다.
+
+- 작업이 예외로 끝나면 기다리던 모든 호출에 같은 예외가 전달됩니다.
+- 결과는 캐시하지 않습니다. 작업이 끝나면 키가 비워지고 다음 호출은 새로 실행됩니다.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """스레드용 single-flight (동기 함수)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        key 로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 fn() 실행
+
+        Args:
+            key: 병합 기준 키
+            fn: 실행할 함수
+
+        Returns:
+            fn() 의 결과
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._futures)}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio 용 single-flight
+
+    작업은 별도 Task 로 실행되므로, 기다리던 호출 하나가 취소되어도
+    다른 호출이 기다리는 작업은 계속 진행됩니다.
+    다른 이벤트 루프에서 들어온 같은 키의 호출은 병합하지 않고 따로 실행합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key 로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 factory() 코루틴 실행
+
+        Args:
+            key: 병합 기준 키
+            factory: 실행할 코루틴을 만드는 함수
+
+        Returns:
+            factory() 코루틴의 결과 (병합된 호출끼리 같은 객체를 공유)
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        self.calls += 1
+        task = self._tasks.get(loop_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            self._tasks[loop_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(loop_key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
@@ -0,0 +1,203 @@
+"""
+Word 파일 병렬 내보내기
+
+.docx 렌더링은 GIL 을 잡는 CPU 작업이므로, 여러 가이드를 내보낼 때는
+ProcessPoolExecutor 로 프로세스마다 나누어 렌더링합니다.
+
+- 작업 프로세스에는 Guide.to_dict() 를 압축 JSON 문자열로 직렬화해 보냅니다.
+- 동시에 제출되는 작업 수(max_in_flight)를 제한하므로 입력이 제너레이터여도
+  메모리에 한꺼번에 올리지 않습니다.
+- 파일별 오류는 결과 레코드에 기록하고 나머지 파일은 계속 처리합니다.
+- 같은 경로에 저장하려는 작업은 작업 프로세스끼리 덮어쓰지 않도록 오류로 기록합니다.
+- fmt 로 Markdown/HTML/JSONL 형식도 같은 방식으로 내보낼 수 있습니다.
+
+사용법 (가이드 아카이브 재내보내기):
+    python -m utils.word_export guides.jsonl --output-dir exports --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .guide_model import Guide, as_guide
+from .exporters import EXPORT_FORMATS, build_guide_filename, save_learning_guide
+from .word_generator import WORD_BACKEND, WORD_BACKENDS, save_learning_guide_to_word
+
+
+def _serialize(guide: Guide) -> str:
+    return json.dumps(guide.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+
+def _export_worker(payload: str, filename: str, backend: str, fmt: str) -> str:
+    """작업 프로세스: 직렬화된 가이드를 복원해 파일로 저장"""
+    guide = Guide.from_dict(json.loads(payload))
+    with contextlib.redirect_stdout(io.StringIO()):
+        if fmt == "docx":
+            saved = save_learning_guide_to_word(guide, filename, backend=backend)
+        else:
+            saved = save_learning_guide(guide, filename, fmt=fmt)
+    if saved is None:
+        raise ValueError("가이드를 파일로 변환할 수 없습니다.")
+    return saved
+
+
+def submit_export(pool: ProcessPoolExecutor, filename: str, guide: Any, backend: str = WORD_BACKEND, fmt: str = "docx"):
+    """가이드(Guide 또는 딕셔너리) 하나의 저장 작업을 프로세스 풀에 제출 (Future 결과는 저장된 파일 경로)"""
+    guide = as_guide(guide)
+    if guide is None:
+        raise ValueError("가이드가 생성되지 않았습니다.")
+    return pool.submit(_export_worker, _serialize(guide), str(filename), backend, fmt)
+
+
+def _unique_name(name: str, used: set) -> str:
+    """이미 사용한 파일명이면 확장자 앞에 _2, _3 ... 을 붙인 이름 반환"""
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{stem}_{n}{ext}"
+    used.add(candidate)
+    return candidate
+
+
+def iter_export_to_word(
+    jobs: Iterable[Tuple[str, Any]],
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    backend: str = WORD_BACKEND,
+    fmt: str = "docx",
+) -> Iterator[Dict[str, Any]]:
+    """
+    (파일명, 가이드) 목록을 프로세스 풀에서 Word 파일로 저장하고 완료 순서대로 결과 반환
+
+    Args:
+        jobs: (저장할 파일 경로, Guide 또는 가이드 딕셔너리) 목록 (제너레이터 가능)
+        workers: 작업 프로세스 수 (None이면 CPU 수)
+        max_in_flight: 동시에 제출해 둘 최대 작업 수 (None이면 workers * 2)
+        backend: save_learning_guide_to_word() 의 backend
+        fmt: 출력 형식 (EXPORT_FORMATS 의 키, 기본 "docx")
+
+    Yields:
+        {"index", "topic", "status": "ok"|"error", "word_file" 또는 "error"}
+        index 는 jobs 에서의 순서입니다. 앞선 작업과 같은 경로에 저장하려는 작업은 "error" 입니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or workers * 2)
+    job_iter = enumerate(jobs)
+    pending = {}
+    targets = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        exhausted = False
+        while True:
+            # 제출 한도까지 작업 채우기 (변환 실패는 바로 반환)
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    index, (filename, raw) = next(job_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                guide = as_guide(raw)
+                if guide is None:
+                    yield {"index": index, "topic": None, "status": "error", "error": "가이드가 생성되지 않았습니다."}
+                    continue
+                target = os.path.abspath(filename)
+                if target in targets:
+                    yield {"index": index, "topic": guide.topic, "status": "error", "error": f"같은 파일명으로 이미 저장 중입니다: {filename}"}
+                    continue
+                targets.add(target)
+                future = submit_export(pool, filename, guide, backend, fmt)
+                pending[future] = {"index": index, "topic": guide.topic}
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = pending.pop(future)
+                try:
+                    record.update(status="ok", word_file=future.result())
+                except Exception as e:
+                    record.update(status="error", error=f"{type(e).__name__}: {e}")
+                yield record
+
+
+def export_guides_to_word(
+    guides: Iterable[Any],
+    output_dir: str = ".",
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    backend: str = WORD_BACKEND,
+    numbered: bool = False,
+    fmt: str = "docx",
+) -> List[Dict[str, Any]]:
+    """
+    여러 학습 가이드를 프로세스 풀에서 Word 파일로 저장
+
+    파일명은 build_guide_filename() 규칙을 따르며, numbered=True 이면
+    batch.py 와 같이 입력 순서 번호를 앞에 붙입니다 ({index:04d}_...).
+    같은 주제를 같은 초에 내보내 파일명이 겹치면 _2, _3 ... 을 붙입니다.
+
+    Args:
+        guides: Guide 또는 가이드 딕셔너리 목록 (제너레이터 가능)
+        output_dir: 저장 폴더
+        workers: 작업 프로세스 수 (None이면 CPU 수)
+        max_in_flight: 동시에 제출해 둘 최대 작업 수 (None이면 workers * 2)
+        backend: save_learning_guide_to_word() 의 backend
+        numbered: 파일명 앞에 입력 순서 번호 추가
+        fmt: 출력 형식 (EXPORT_FORMATS 의 키, 기본 "docx")
+
+    Returns:
+        입력 순서로 정렬된 파일별 결과 목록
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    used = set()
+
+    def jobs():
+        for index, raw in enumerate(guides):
+            guide = as_guide(raw)
+            name = build_guide_filename(guide, fmt) if guide is not None else ""
+            if numbered:
+                name = f"{index:04d}_{name}"
+            if guide is not None:
+                name = _unique_name(name, used)
+            yield str(out / name), guide if guide is not None else raw
+
+    results = list(iter_export_to_word(jobs(), workers=workers, max_in_flight=max_in_flight, backend=backend, fmt=fmt))
+    return sorted(results, key=lambda r: r["index"])
+
+
+def _read_guides(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 가이드 일괄 내보내기")
+    parser.add_argument("input", help="가이드 JSONL 파일 (한 줄에 가이드 딕셔너리 하나)")
+    parser.add_argument("--output-dir", default="word_export", help="Word 파일 저장 폴더")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--format", default="docx", choices=list(EXPORT_FORMATS), help="출력 형식")
+    parser.add_argument("--backend", default=WORD_BACKEND, choices=WORD_BACKENDS, help="Word 렌더링 백엔드")
+    args = parser.parse_args()
+
+    results = export_guides_to_word(
+        _read_guides(args.input), args.output_dir, workers=args.workers, backend=args.backend, numbered=True, fmt=args.format
+    )
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in failed:
+        print(f"❌ [{r['index']}] {r['topic']}: {r['error']}")
+    print(f"\n완료: 성공 {len(results) - len(failed)}건, 실패 {len(failed)}건 → {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()